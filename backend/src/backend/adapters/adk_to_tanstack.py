@@ -31,6 +31,44 @@ from .tanstack_stream import (
 from .tanstack_to_adk import build_function_response_content, build_user_content
 
 
+class TextAccumulator:
+    """Append-only text buffer with O(1) appends; joins lazily on demand."""
+
+    __slots__ = ("_parts", "_length", "_joined")
+
+    def __init__(self) -> None:
+        self._parts: list[str] = []
+        self._length = 0
+        self._joined: str | None = ""
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, text: str) -> None:
+        if not text:
+            return
+        self._parts.append(text)
+        self._length += len(text)
+        self._joined = None
+
+    def is_prefix_of(self, text: str) -> bool:
+        """Check ``text.startswith(accumulated)`` without joining."""
+        if len(text) < self._length:
+            return False
+        offset = 0
+        for part in self._parts:
+            if not text.startswith(part, offset):
+                return False
+            offset += len(part)
+        return True
+
+    def text(self) -> str:
+        if self._joined is None:
+            self._joined = "".join(self._parts)
+            self._parts = [self._joined]
+        return self._joined
+
+
 class TanStackAdkAdapter:
     def __init__(
         self,
@@ -40,17 +78,21 @@ class TanStackAdkAdapter:
         runner: Runner,
         run_store: RunStorePort,
         user_id: str,
+        delta_only: bool = False,
     ) -> None:
         self.run_id = run_id
         self.model = model
         self.runner = runner
         self.run_store = run_store
         self.user_id = user_id
-        self._text_accumulator = ""
+        # Omit the accumulated `content` from content chunks (client rebuilds it)
+        self.delta_only = delta_only
+        self._text = TextAccumulator()
         self._tool_call_index = 0
+        self._invocation_id: str | None = None
 
     async def run_from_user_text(self, text: str) -> AsyncIterator[object]:
-        self.run_store.get_or_create(self.run_id)
+        await self.run_store.get_or_create(self.run_id)
         await self._ensure_session()
         content = build_user_content(text)
         async for chunk in self._run_with_content(new_message=content):
@@ -59,7 +101,7 @@ class TanStackAdkAdapter:
     async def resume_from_continuation(
         self, payload: dict[str, Any]
     ) -> AsyncIterator[object]:
-        self.run_store.get_or_create(self.run_id)
+        await self.run_store.get_or_create(self.run_id)
         approvals = payload.get("approvals") or {}
         tool_results = payload.get("tool_results") or {}
 
@@ -68,7 +110,9 @@ class TanStackAdkAdapter:
         client_tool_chunks: list[ToolInputAvailableStreamChunk] = []
 
         for tool_call_id, approved in approvals.items():
-            pending = self.run_store.pop_pending_approval(self.run_id, tool_call_id)
+            pending = await self.run_store.pop_pending_approval(
+                self.run_id, tool_call_id
+            )
             if pending is None:
                 continue
             confirmation_id = pending.adk_confirmation_call_id
@@ -96,12 +140,14 @@ class TanStackAdkAdapter:
                         )
                     )
                 else:
-                    self.run_store.pop_pending_client_tool(
+                    await self.run_store.pop_pending_client_tool(
                         self.run_id, pending.tool_call_id
                     )
 
         for tool_call_id, result in tool_results.items():
-            pending = self.run_store.pop_pending_client_tool(self.run_id, tool_call_id)
+            pending = await self.run_store.pop_pending_client_tool(
+                self.run_id, tool_call_id
+            )
             if pending is None:
                 continue
             payload = result
@@ -133,8 +179,8 @@ class TanStackAdkAdapter:
             ):
                 yield chunk
 
-    def has_pending(self) -> bool:
-        return self.run_store.has_pending(self.run_id)
+    async def has_pending(self) -> bool:
+        return await self.run_store.has_pending(self.run_id)
 
     async def _ensure_session(self) -> None:
         session = await self.runner.session_service.get_session(
@@ -176,8 +222,10 @@ class TanStackAdkAdapter:
             )
 
     async def _event_to_chunks(self, event: Event) -> AsyncIterator[object]:
-        if event.invocation_id:
-            self.run_store.set_invocation_id(self.run_id, event.invocation_id)
+        # Every event carries the invocation id; only write it when it changes.
+        if event.invocation_id and event.invocation_id != self._invocation_id:
+            await self.run_store.set_invocation_id(self.run_id, event.invocation_id)
+            self._invocation_id = event.invocation_id
 
         content = event.content
         if not content or not content.parts:
@@ -186,19 +234,15 @@ class TanStackAdkAdapter:
         for part in content.parts:
             if part.text:
                 delta = part.text
-                if event.partial is False or event.partial is None:
-                    if delta.startswith(self._text_accumulator):
-                        delta = delta[len(self._text_accumulator) :]
-                        self._text_accumulator += delta
-                    else:
-                        self._text_accumulator += delta
-                else:
-                    self._text_accumulator += delta
+                # Final (non-partial) events repeat the full text streamed so far.
+                if not event.partial and self._text.is_prefix_of(delta):
+                    delta = delta[len(self._text) :]
+                self._text.append(delta)
                 yield ContentStreamChunk(
                     id=self.run_id,
                     model=self.model,
                     timestamp=now_ms(),
-                    content=self._text_accumulator,
+                    content=None if self.delta_only else self._text.text(),
                     delta=delta,
                     role="assistant",
                 )
@@ -227,7 +271,7 @@ class TanStackAdkAdapter:
         tool_input = function_call.args or {}
 
         if function_call.name in CLIENT_TOOL_NAMES:
-            self.run_store.add_pending_client_tool(
+            await self.run_store.add_pending_client_tool(
                 self.run_id,
                 PendingAction(
                     kind="client_tool",
@@ -265,7 +309,7 @@ class TanStackAdkAdapter:
         if not tool_call_id or not tool_name:
             return
 
-        self.run_store.add_pending_approval(
+        await self.run_store.add_pending_approval(
             self.run_id,
             PendingAction(
                 kind="approval",
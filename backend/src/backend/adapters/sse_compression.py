@@ -0,0 +1,132 @@
+"""
+Content-Encoding for SSE responses with a sync flush after every write.
+
+Each write is flushed to a byte boundary the client can decode at once, so
+compression does not hold back streamed chunks. gzip is always available;
+brotli (``brotli``) and zstd (``zstandard``) are offered only when their
+packages are installed.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import AsyncIterator
+from functools import cache
+from typing import Protocol
+
+# Server preference when the client accepts several with equal q.
+SUPPORTED_ENCODINGS = ("zstd", "br", "gzip")
+
+
+class SseCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compress ``data`` and flush so it can be decoded immediately."""
+        ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int = 6) -> None:
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int = 5) -> None:
+        import brotli
+
+        self._obj = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int = 3) -> None:
+        import zstandard
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+_COMPRESSORS: dict[str, type[SseCompressor]] = {
+    "gzip": _GzipCompressor,
+    "br": _BrotliCompressor,
+    "zstd": _ZstdCompressor,
+}
+
+
+@cache
+def available_encodings() -> tuple[str, ...]:
+    """Supported encodings whose packages are importable, in preference order."""
+    available = []
+    for encoding in SUPPORTED_ENCODINGS:
+        try:
+            _COMPRESSORS[encoding]()
+        except ImportError:
+            continue
+        available.append(encoding)
+    return tuple(available)
+
+
+def negotiate_encoding(
+    accept_encoding: str | None, available: tuple[str, ...]
+) -> str | None:
+    """
+    Pick the best encoding from an ``Accept-Encoding`` header, or None for
+    identity.
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+
+    best: str | None = None
+    best_q = 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def create_compressor(encoding: str) -> SseCompressor:
+    return _COMPRESSORS[encoding]()
+
+
+async def compress_frames(
+    frames: AsyncIterator[bytes], encoding: str
+) -> AsyncIterator[bytes]:
+    """Compress each write with a sync flush; finish the stream at the end."""
+    compressor = create_compressor(encoding)
+    async for frame in frames:
+        yield compressor.compress(frame)
+    yield compressor.finish()
@@ -0,0 +1,198 @@
+"""
+Turn a StreamChunk iterator into SSE writes, optionally coalescing frames.
+
+The source yields ``(event_id, chunk)`` pairs; chunks with an id are written
+with an SSE ``id:`` field so clients can resume with ``Last-Event-ID``.
+
+With a coalescing window, content frames are buffered until the window
+(counted from the first buffered frame) elapses or the byte budget is
+reached, so a fast model produces a few larger writes instead of one tiny
+write per token. Tool, approval, error and done chunks flush the buffer
+immediately so HITL round-trips are not delayed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+
+from .tanstack_stream import STREAM_CONSTANT_KEYS, StreamChunk, encode_chunk
+
+StreamEvent = tuple[int | None, StreamChunk]
+
+IMMEDIATE_FLUSH_TYPES = frozenset(
+    {
+        "tool_call",
+        "tool_result",
+        "tool-input-available",
+        "approval-requested",
+        "error",
+        "done",
+    }
+)
+
+# Chunks the producer may run ahead of a slow client.
+_QUEUE_SIZE = 256
+
+
+@dataclass
+class SseWriteStats:
+    """
+    Per-response write counters and, per chunk, the latency from leaving
+    the source to being written (what coalescing holds a chunk back).
+    """
+
+    chunks: int = 0
+    writes: int = 0
+    bytes_written: int = 0
+    chunk_latencies: list[float] = field(default_factory=list)
+    clock: Callable[[], float] = field(default=time.perf_counter, repr=False)
+
+    def record_write(self, size: int, enqueued_at: list[float]) -> None:
+        """Count one write carrying chunks read from the source at ``enqueued_at``."""
+        now = self.clock()
+        self.chunk_latencies.extend(now - t for t in enqueued_at)
+        self.writes += 1
+        self.bytes_written += size
+
+    def latency_percentile(self, q: float) -> float:
+        """Nearest-rank percentile of enqueue-to-write latency, in seconds."""
+        if not self.chunk_latencies:
+            return 0.0
+        ordered = sorted(self.chunk_latencies)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def summary(self) -> dict[str, float | int]:
+        return {
+            "chunks": self.chunks,
+            "writes": self.writes,
+            "bytes": self.bytes_written,
+            "latency_p50_ms": round(self.latency_percentile(50) * 1000, 3),
+            "latency_p99_ms": round(self.latency_percentile(99) * 1000, 3),
+        }
+
+
+class _End:
+    pass
+
+
+@dataclass
+class _SourceError:
+    exc: Exception
+
+
+async def sse_frames(
+    events: AsyncIterator[StreamEvent],
+    *,
+    window_seconds: float = 0.0,
+    max_bytes: int = 16384,
+    omit_constant_keys: bool = False,
+    stats: SseWriteStats | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Encode ``events`` as SSE frames.
+
+    ``window_seconds <= 0`` writes every frame as it is produced. Otherwise
+    the source is drained by a background task (so flushing on the deadline
+    does not depend on the next chunk arriving) and frames are coalesced.
+    With ``omit_constant_keys`` only the first frame carries ``id``/``model``.
+    """
+    stats = stats if stats is not None else SseWriteStats()
+    first = True
+
+    def encode(event_id: int | None, chunk: StreamChunk) -> bytes:
+        nonlocal first
+        if omit_constant_keys and not first:
+            return encode_chunk(chunk, exclude=STREAM_CONSTANT_KEYS, event_id=event_id)
+        first = False
+        return encode_chunk(chunk, event_id=event_id)
+
+    if window_seconds <= 0:
+        async for event_id, chunk in events:
+            enqueued_at = stats.clock()
+            frame = encode(event_id, chunk)
+            stats.chunks += 1
+            stats.record_write(len(frame), [enqueued_at])
+            yield frame
+        return
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[float, StreamEvent] | _End | _SourceError] = (
+        asyncio.Queue(maxsize=_QUEUE_SIZE)
+    )
+
+    async def produce() -> None:
+        try:
+            async for event in events:
+                await queue.put((stats.clock(), event))
+        except Exception as exc:
+            await queue.put(_SourceError(exc))
+            return
+        await queue.put(_End())
+
+    # The task copies the current context, so contextvars bound by the
+    # caller (and by ``events`` itself) stay visible to the source.
+    producer = loop.create_task(produce())
+    buffer: list[bytes] = []
+    buffered_at: list[float] = []
+    size = 0
+    deadline = 0.0
+
+    def flush() -> bytes:
+        nonlocal size
+        data = b"".join(buffer)
+        stats.record_write(len(data), buffered_at.copy())
+        buffer.clear()
+        buffered_at.clear()
+        size = 0
+        return data
+
+    try:
+        while True:
+            if not queue.empty():
+                item = queue.get_nowait()
+            elif buffer:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    yield flush()
+                    continue
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except TimeoutError:
+                    yield flush()
+                    continue
+            else:
+                item = await queue.get()
+
+            if isinstance(item, _End):
+                break
+            if isinstance(item, _SourceError):
+                if buffer:
+                    yield flush()
+                raise item.exc
+
+            enqueued_at, (event_id, chunk) = item
+            frame = encode(event_id, chunk)
+            stats.chunks += 1
+            if not buffer:
+                deadline = loop.time() + window_seconds
+            buffer.append(frame)
+            buffered_at.append(enqueued_at)
+            size += len(frame)
+            if (
+                chunk.type in IMMEDIATE_FLUSH_TYPES
+                or size >= max_bytes
+                or loop.time() >= deadline
+            ):
+                yield flush()
+
+        if buffer:
+            yield flush()
+    finally:
+        # Stop reading the source on disconnect too, and let the producer
+        # unwind before the response is torn down.
+        producer.cancel()
+        await asyncio.wait([producer])
@@ -0,0 +1,50 @@
+"""
+Incremental CSV / NDJSON encoding of stored tables for file downloads.
+
+Rows are encoded ``chunk_rows`` at a time from the DataFrame's columns, so
+a download holds one chunk of text in memory however large the table is.
+NDJSON rows carry the same JSON values as ``/api/data`` previews.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import Iterable, Iterator
+
+import pandas as pd
+from pydantic_core import to_json
+
+from ..store.artifact_store import to_rows
+
+# Export format -> media type of the uncompressed body
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def iter_table_chunks(
+    df: pd.DataFrame, fmt: str, *, chunk_rows: int = 10_000
+) -> Iterator[bytes]:
+    """Encode ``df`` as ``fmt`` (csv or ndjson), one row chunk at a time."""
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "csv":
+        # The header goes out even for an empty table.
+        yield df.iloc[:0].to_csv(index=False).encode()
+    for start in range(0, len(df), chunk_rows):
+        end = start + chunk_rows
+        if fmt == "csv":
+            yield df.iloc[start:end].to_csv(index=False, header=False).encode()
+        else:
+            yield b"".join(
+                to_json(row, inf_nan_mode="null") + b"\n"
+                for row in to_rows(df, start, end)
+            )
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a stream of chunks into one member without buffering the input."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
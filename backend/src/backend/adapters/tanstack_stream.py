@@ -4,12 +4,25 @@ TanStack AI StreamChunk models and SSE helpers.
 
 from __future__ import annotations
 
-import json
 import time
 from typing import Any, Literal
 
 from pydantic import BaseModel
 
+# Request header listing the stream modes a client supports (comma
+# separated); the modes the server applies are echoed back.
+STREAM_MODE_HEADER = "X-Stream-Mode"
+# Content chunks carry only `delta`; the client accumulates `content` itself.
+DELTA_ONLY_STREAM_MODE = "delta"
+# Only the first chunk carries the per-stream constant keys (`id`, `model`);
+# the client copies them onto later chunks.
+COMPACT_STREAM_MODE = "compact"
+# The stream ends (finishReason "tool_calls") once the run is parked on an
+# approval or client tool; POST /api/continuation streams the resumed run.
+DETACHED_STREAM_MODE = "detached"
+STREAM_MODES = (DELTA_ONLY_STREAM_MODE, COMPACT_STREAM_MODE, DETACHED_STREAM_MODE)
+STREAM_CONSTANT_KEYS = frozenset({"id", "model"})
+
 StreamChunkType = Literal[
     "content",
     "thinking",
@@ -31,7 +44,8 @@ class BaseStreamChunk(BaseModel):
 
 class ContentStreamChunk(BaseStreamChunk):
     type: Literal["content"] = "content"
-    content: str
+    # None in delta-only stream mode; omitted from the encoded chunk.
+    content: str | None = None
     delta: str
     role: Literal["assistant"] | None = None
 
@@ -123,10 +137,36 @@ def now_ms() -> int:
     return int(time.time() * 1000)
 
 
-def encode_chunk(chunk: StreamChunk) -> str:
-    payload = json.dumps(chunk.model_dump(by_alias=True), ensure_ascii=False)
-    return f"data: {payload}\n\n"
+SSE_DONE = b"data: [DONE]\n\n"
+
+_CONTENT_ONLY = frozenset({"content"})
+
+
+def parse_stream_modes(header: str | None) -> frozenset[str]:
+    """Supported stream modes requested in ``X-Stream-Mode``."""
+    if not header:
+        return frozenset()
+    requested = {mode.strip().lower() for mode in header.split(",")}
+    return frozenset(mode for mode in STREAM_MODES if mode in requested)
+
+
+def encode_chunk(
+    chunk: StreamChunk,
+    *,
+    exclude: frozenset[str] | None = None,
+    event_id: int | None = None,
+) -> bytes:
+    """Encode a chunk as one SSE frame (``id:`` + ``data:``), ready to write."""
+    if type(chunk) is ContentStreamChunk and chunk.content is None:
+        exclude = exclude | _CONTENT_ONLY if exclude else _CONTENT_ONLY
+    # pydantic-core writes JSON bytes directly, skipping model_dump + json.dumps.
+    payload = chunk.__pydantic_serializer__.to_json(
+        chunk, by_alias=True, exclude=exclude
+    )
+    if event_id is None:
+        return b"data: " + payload + b"\n\n"
+    return b"id: %d\ndata: %s\n\n" % (event_id, payload)
 
 
-def encode_done() -> str:
-    return "data: [DONE]\n\n"
+def encode_done() -> bytes:
+    return SSE_DONE
@@ -4,93 +4,82 @@ ADK agent definition for the SQL analysis demo.
 
 from __future__ import annotations
 
-from datetime import date
-
 from google.adk.agents import LlmAgent
+from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.apps.app import App, ResumabilityConfig
 from google.adk.runners import Runner
 from google.adk.sessions.base_session_service import BaseSessionService
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.adk.tools import FunctionTool
 
-from ...db import DB_SCHEMA, SQL_EXAMPLES
-from ...deps import Deps
+from ...llm.context_cache import GenaiCachedContentClient, PromptContextCache
 from ...settings import Settings, get_settings
 from ...tools import build_tools
+from .prompt import build_system_prompt, get_system_prompt_cache
 
 
-def _format_as_xml(examples: list[dict[str, str]]) -> str:
-    lines = ["<examples>"]
-    for example in examples:
-        lines.append("  <example>")
-        lines.append(f"    <request>{example['request']}</request>")
-        lines.append(f"    <response>{example['response']}</response>")
-        lines.append("  </example>")
-    lines.append("</examples>")
-    return "\n".join(lines)
-
-
-def build_system_prompt() -> str:
-    return f"""\
-You are a helpful data analyst assistant. Your job is to help users analyze
-log data stored in a PostgreSQL database.
-
-## Database Schema
-
-{DB_SCHEMA}
-
-## Today's Date
+def _instruction(_: ReadonlyContext) -> str:
+    # Resolved per LLM call so the date stays current in a long-lived runner.
+    return build_system_prompt()
 
-{date.today()}
 
-## Important Rules
+def _date_instruction(_: ReadonlyContext) -> str:
+    return get_system_prompt_cache().date_suffix()
 
-1. **Safety First**: Only SELECT queries are allowed. Never modify data.
-2. **Always Use LIMIT**: Every query must include LIMIT to prevent large result sets.
-3. **Approval Flow**: execute_sql and export_csv require approval. When you're ready
-   to run them, call the tool directly; the system will request approval and pause
-   execution. Do not ask for approval in plain text or wait for a manual "approve"
-   response. You may include a brief explanation alongside the tool call.
-4. **Use Artifact IDs**: After executing SQL, results are stored with an artifact_id.
-   The UI will automatically preview results from artifacts. Do not show
-   artifact_id to the user directly. Tool results include a JSON payload with
-   artifacts[].id for internal use.
-5. **CSV Export**: When the user wants to download data as CSV, use export_csv.
-   This also requires approval and runs on the client side.
-
-## Workflow Example
-
-1. User asks to analyze error logs from yesterday
-2. You write a SQL query and call execute_sql (system requests approval)
-3. After approval, the query runs and results are stored as an artifact_id
-4. The UI will show a preview of the data (do not mention artifact_id to the user)
-5. If user wants to download, call export_csv (system requests approval + client execution)
-
-## SQL Examples
-
-{_format_as_xml(SQL_EXAMPLES)}
-"""
 
+def build_agent(
+    *,
+    settings: Settings,
+    tools: list[FunctionTool],
+    context_cache: PromptContextCache | None = None,
+) -> LlmAgent:
+    if context_cache is None:
+        return LlmAgent(
+            name="sql_agent",
+            model=settings.llm_model,
+            description="SQL analysis assistant",
+            instruction=_instruction,
+            tools=tools,
+        )
 
-def build_agent(*, settings: Settings, tools: list[FunctionTool]) -> LlmAgent:
+    # Static prefix goes out as the system instruction (replaced by the cached
+    # content handle); the date suffix is sent with the request contents.
     return LlmAgent(
         name="sql_agent",
         model=settings.llm_model,
         description="SQL analysis assistant",
-        instruction=build_system_prompt(),
+        static_instruction=get_system_prompt_cache().prefix,
+        instruction=_date_instruction,
+        before_model_callback=context_cache.before_model_callback,
         tools=tools,
     )
 
 
-# Root agent is required for ADK discovery; the runtime builds tools per session.
+# Root agent is required for ADK discovery; the runtime builds its own runner.
 root_agent = build_agent(settings=get_settings(), tools=[])
 
 
 def create_runner(
-    *, deps: Deps, settings: Settings, session_service: BaseSessionService | None = None
+    *,
+    settings: Settings,
+    session_service: BaseSessionService | None = None,
+    context_cache: PromptContextCache | None = None,
 ) -> Runner:
-    tools = build_tools(deps, settings)
-    agent = build_agent(settings=settings, tools=tools)
+    """
+    Build the process-wide runner.
+
+    Tools resolve their run's dependencies via ``deps.get_deps()``, so one
+    runner serves every chat as long as each stream binds its Deps with
+    ``deps.use_deps()``.
+    """
+    tools = build_tools(settings)
+    if context_cache is None and settings.llm_context_cache:
+        context_cache = PromptContextCache(
+            GenaiCachedContentClient(),
+            ttl_seconds=settings.llm_context_cache_ttl_seconds,
+            refresh_margin_seconds=settings.llm_context_cache_refresh_margin_seconds,
+        )
+    agent = build_agent(settings=settings, tools=tools, context_cache=context_cache)
     app = App(
         name=settings.adk_app_name,
         root_agent=agent,
@@ -0,0 +1,148 @@
+"""
+System prompt rendering for the SQL agent.
+
+The prompt is split into a static prefix (role, schema, rules, examples) that
+is rendered once, and a short date suffix that changes once a day. The prefix
+hash identifies the cacheable part for provider-side context caching.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from datetime import date
+
+from ...db import DB_SCHEMA, SQL_EXAMPLES
+
+_STATIC_TEMPLATE = """\
+You are a helpful data analyst assistant. Your job is to help users analyze
+log data stored in a PostgreSQL database.
+
+## Database Schema
+
+{schema}
+
+## Important Rules
+
+1. **Safety First**: Only SELECT queries are allowed. Never modify data.
+2. **Always Use LIMIT**: Every query must include LIMIT to prevent large result sets.
+3. **Approval Flow**: execute_sql and export_csv require approval. When you're ready
+   to run them, call the tool directly; the system will request approval and pause
+   execution. Do not ask for approval in plain text or wait for a manual "approve"
+   response. You may include a brief explanation alongside the tool call.
+4. **Use Artifact IDs**: After executing SQL, results are stored with an artifact_id.
+   The UI will automatically preview results from artifacts. Do not show
+   artifact_id to the user directly. Tool results include a JSON payload with
+   artifacts[].id for internal use.
+5. **CSV Export**: When the user wants to download data as CSV, use export_csv.
+   This also requires approval and runs on the client side.
+
+## Workflow Example
+
+1. User asks to analyze error logs from yesterday
+2. You write a SQL query and call execute_sql (system requests approval)
+3. After approval, the query runs and results are stored as an artifact_id
+4. The UI will show a preview of the data (do not mention artifact_id to the user)
+5. If user wants to download, call export_csv (system requests approval + client execution)
+
+## SQL Examples
+
+{examples_xml}
+"""
+
+
+def _format_as_xml(examples: list[dict[str, str]]) -> str:
+    lines = ["<examples>"]
+    for example in examples:
+        lines.append("  <example>")
+        lines.append(f"    <request>{example['request']}</request>")
+        lines.append(f"    <response>{example['response']}</response>")
+        lines.append("  </example>")
+    lines.append("</examples>")
+    return "\n".join(lines)
+
+
+def render_date_suffix(today: date) -> str:
+    return f"""
+## Today's Date
+
+{today}
+"""
+
+
+class SystemPromptCache:
+    """Memoizes the rendered prompt until the date, schema or examples change."""
+
+    def __init__(
+        self,
+        *,
+        schema: str = DB_SCHEMA,
+        examples: list[dict[str, str]] = SQL_EXAMPLES,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        self._schema = schema
+        self._examples = examples
+        self._today = today
+        self._prefix: str | None = None
+        self._prefix_hash: str | None = None
+        self._prompt: str | None = None
+        self._prompt_date: date | None = None
+
+    @property
+    def prefix(self) -> str:
+        """Static part of the prompt; identical across days and requests."""
+        if self._prefix is None:
+            self._prefix = _STATIC_TEMPLATE.format(
+                schema=self._schema,
+                examples_xml=_format_as_xml(self._examples),
+            )
+        return self._prefix
+
+    @property
+    def prefix_hash(self) -> str:
+        """Stable SHA-256 of the static prefix."""
+        if self._prefix_hash is None:
+            self._prefix_hash = hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()
+        return self._prefix_hash
+
+    def date_suffix(self) -> str:
+        return render_date_suffix(self._today())
+
+    def render(self) -> str:
+        """Full prompt, re-rendered only when the date rolls over."""
+        today = self._today()
+        if self._prompt is None or today != self._prompt_date:
+            self._prompt = self.prefix + render_date_suffix(today)
+            self._prompt_date = today
+        return self._prompt
+
+    def update(
+        self,
+        *,
+        schema: str | None = None,
+        examples: list[dict[str, str]] | None = None,
+    ) -> None:
+        """Replace the schema and/or examples and drop every rendered value."""
+        if schema is not None:
+            self._schema = schema
+        if examples is not None:
+            self._examples = examples
+        self._prefix = None
+        self._prefix_hash = None
+        self._prompt = None
+        self._prompt_date = None
+
+
+_system_prompt = SystemPromptCache()
+
+
+def get_system_prompt_cache() -> SystemPromptCache:
+    return _system_prompt
+
+
+def build_system_prompt() -> str:
+    return _system_prompt.render()
+
+
+def system_prompt_prefix_hash() -> str:
+    return _system_prompt.prefix_hash
@@ -0,0 +1,126 @@
+"""
+Command-line entry point for database maintenance.
+
+Usage:
+    backend-db migrate
+    backend-db seed --rows 10000000 [--truncate]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+import asyncpg
+
+from .db import bootstrap_database
+from .seed import DEFAULT_LEVEL_WEIGHTS, SeedConfig, SeedResult, seed_records
+from .settings import get_settings
+
+
+async def _migrate(_: argparse.Namespace) -> None:
+    settings = get_settings()
+    version = await bootstrap_database(
+        server_dsn=settings.database_server_dsn,
+        database=settings.database_name,
+    )
+    print(f"{settings.database_name}: schema version {version}")
+
+
+def _parse_level_weights(value: str) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    for item in value.split(","):
+        level, _, weight = item.partition("=")
+        if not level or not weight:
+            raise argparse.ArgumentTypeError(
+                f"Invalid level weight {item!r}; expected level=weight."
+            )
+        weights[level.strip()] = float(weight)
+    return weights
+
+
+async def _seed(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    config = SeedConfig(
+        rows=args.rows,
+        spans_per_trace=args.spans_per_trace,
+        days=args.days,
+        level_weights=args.level_weights,
+        seed=args.seed,
+    )
+
+    def report(progress: SeedResult) -> None:
+        print(
+            f"  {progress.rows:>12,} rows  {progress.rows_per_second:>12,.0f} rows/s",
+            flush=True,
+        )
+
+    conn = await asyncpg.connect(
+        f"{settings.database_server_dsn}/{settings.database_name}"
+    )
+    try:
+        if args.truncate:
+            await conn.execute("TRUNCATE records")
+        result = await seed_records(
+            conn, config, batch_size=args.batch_size, on_batch=report
+        )
+        if args.analyze:
+            await conn.execute("ANALYZE records")
+    finally:
+        await conn.close()
+
+    print(
+        f"Loaded {result.rows:,} rows in {result.seconds:.1f}s "
+        f"({result.rows_per_second:,.0f} rows/s)"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="backend-db", description="Database maintenance commands"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate = commands.add_parser(
+        "migrate", help="Create the database and apply pending schema migrations"
+    )
+    migrate.set_defaults(handler=_migrate)
+
+    seed = commands.add_parser(
+        "seed", help="Bulk-load synthetic rows into records with COPY"
+    )
+    seed.add_argument("--rows", type=int, required=True, help="Rows to generate")
+    seed.add_argument(
+        "--batch-size", type=int, default=50_000, help="Rows per COPY batch"
+    )
+    seed.add_argument(
+        "--spans-per-trace", type=int, default=8, help="Maximum spans per trace"
+    )
+    seed.add_argument(
+        "--days", type=float, default=7.0, help="Spread timestamps over N days"
+    )
+    seed.add_argument(
+        "--level-weights",
+        type=_parse_level_weights,
+        default=dict(DEFAULT_LEVEL_WEIGHTS),
+        help="Relative level frequencies, e.g. info=60,error=8 (default: %(default)s)",
+    )
+    seed.add_argument("--seed", type=int, default=None, help="Random seed")
+    seed.add_argument(
+        "--truncate", action="store_true", help="Empty records before loading"
+    )
+    seed.add_argument(
+        "--no-analyze",
+        dest="analyze",
+        action="store_false",
+        help="Skip ANALYZE after loading",
+    )
+    seed.set_defaults(handler=_seed)
+
+    args = parser.parse_args(argv)
+    asyncio.run(args.handler(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
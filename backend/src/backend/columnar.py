@@ -0,0 +1,82 @@
+"""
+Columnar decoding of asyncpg query results.
+
+Rows are transposed batch by batch into per-column value lists and converted
+once into typed NumPy / pandas arrays, skipping the per-row dicts and the
+row-wise type inference of ``pd.DataFrame(list_of_dicts)``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from itertools import chain
+from typing import Any
+
+import asyncpg
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import ExtensionArray
+
+from .ports import ColumnarTable
+
+_INT_TYPES = frozenset({"int2", "int4", "int8", "oid"})
+_FLOAT_TYPES = frozenset({"float4", "float8"})
+_TIMESTAMP_TYPES = frozenset({"timestamp", "timestamptz"})
+
+
+def _to_array(type_name: str, values: list[Any]) -> np.ndarray | ExtensionArray:
+    count = len(values)
+    has_null = None in values
+    if type_name in _INT_TYPES:
+        if has_null:
+            return pd.array(values, dtype="Int64")
+        return np.fromiter(values, dtype=np.int64, count=count)
+    if type_name in _FLOAT_TYPES:
+        return np.fromiter(
+            (np.nan if v is None else v for v in values),
+            dtype=np.float64,
+            count=count,
+        )
+    if type_name == "bool":
+        if has_null:
+            return pd.array(values, dtype="boolean")
+        return np.fromiter(values, dtype=np.bool_, count=count)
+    if type_name in _TIMESTAMP_TYPES:
+        return pd.to_datetime(values, utc=type_name == "timestamptz").array
+    # text, jsonb (decoded as str), arrays, enums, numeric, ...: keep objects
+    return np.fromiter(values, dtype=object, count=count)
+
+
+class ColumnarBuilder:
+    """Accumulates record batches and builds a ``ColumnarTable``."""
+
+    def __init__(self, columns: list[str], type_names: list[str]) -> None:
+        self.columns = columns
+        self._type_names = type_names
+        self._chunks: list[list[tuple[Any, ...]]] = [[] for _ in columns]
+        self.row_count = 0
+
+    @classmethod
+    def from_statement(
+        cls, statement: asyncpg.prepared_stmt.PreparedStatement
+    ) -> ColumnarBuilder:
+        attributes = statement.get_attributes()
+        return cls(
+            [attr.name for attr in attributes],
+            [attr.type.name for attr in attributes],
+        )
+
+    def append(self, rows: Sequence[Sequence[Any]]) -> None:
+        if not rows:
+            return
+        for chunks, values in zip(self._chunks, zip(*rows, strict=True), strict=True):
+            chunks.append(values)
+        self.row_count += len(rows)
+
+    def build(self) -> ColumnarTable:
+        arrays = [
+            _to_array(type_name, list(chain.from_iterable(chunks)))
+            for type_name, chunks in zip(self._type_names, self._chunks, strict=True)
+        ]
+        self._chunks = [[] for _ in self.columns]
+        return ColumnarTable(columns=self.columns, arrays=arrays)
@@ -1,22 +1,304 @@
-"""In-memory continuation hub for approval/tool result callbacks."""
+"""Continuation hubs for approval/tool result callbacks."""
 
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
 from typing import Any
 
+from .logging import get_logger
+from .ports import ContinuationBrokerPort
+from .settings import get_settings
+
+logger = get_logger(__name__)
+
+
+class ContinuationUnavailableError(Exception):
+    """A parked run stopped waiting for its continuation."""
+
+    def __init__(self, run_id: str, reason: str) -> None:
+        super().__init__(f"continuation for run {run_id} {reason}")
+        self.run_id = run_id
+        self.reason = reason
+
+
+@dataclass
+class ContinuationHubStats:
+    parked_runs: int
+    waiting_runs: int
+    queued_payloads: int
+    timeouts: int
+    evictions: int
+    expirations: int
+
+
+# Queued in place of a payload to wake a waiter whose run was evicted.
+_EVICTED = object()
+
+
+class _Slot:
+    __slots__ = ("queue", "waiters", "touched_at")
+
+    def __init__(self, touched_at: float) -> None:
+        self.queue: asyncio.Queue[Any] = asyncio.Queue()
+        self.waiters = 0
+        self.touched_at = touched_at
+
 
 class ContinuationHub:
-    def __init__(self) -> None:
-        self._queues: dict[str, asyncio.Queue[dict[str, Any]]] = defaultdict(
-            asyncio.Queue
+    """
+    Per-run mailboxes for continuation payloads.
+
+    A slot exists while a stream waits on a run or a payload is queued for
+    it. Slots holding only queued payloads expire ``queued_ttl_seconds``
+    after they were last touched. At most ``max_parked_runs`` slots are
+    kept: the least recently used slot without a waiter is evicted first,
+    and only when every slot has one is the least recently used waiter
+    failed with ``ContinuationUnavailableError``.
+    """
+
+    def __init__(
+        self,
+        *,
+        wait_timeout_seconds: float | None = None,
+        max_parked_runs: int = 10_000,
+        queued_ttl_seconds: float | None = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._wait_timeout = wait_timeout_seconds or None
+        self._max_parked = max_parked_runs
+        self._queued_ttl = queued_ttl_seconds or None
+        self._clock = clock
+        self._slots: OrderedDict[str, _Slot] = OrderedDict()
+        self._timeouts = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def _slot(self, run_id: str) -> _Slot:
+        now = self._clock()
+        self._expire_queued(now)
+        slot = self._slots.get(run_id)
+        if slot is None:
+            slot = self._slots[run_id] = _Slot(now)
+            while len(self._slots) > self._max_parked:
+                self._evict_one(keep=run_id)
+        else:
+            slot.touched_at = now
+            self._slots.move_to_end(run_id)
+        return slot
+
+    def _expire_queued(self, now: float) -> None:
+        """Drop queued-only slots untouched for longer than the TTL."""
+        if self._queued_ttl is None:
+            return
+        cutoff = now - self._queued_ttl
+        # Slots are in touch order, so the scan stops at the first fresh one.
+        expired = []
+        for run_id, slot in self._slots.items():
+            if slot.touched_at > cutoff:
+                break
+            if not slot.waiters:
+                expired.append(run_id)
+        for run_id in expired:
+            del self._slots[run_id]
+            self._expirations += 1
+            logger.info("continuation_expired", run_id=run_id)
+
+    def _evict_one(self, *, keep: str) -> None:
+        run_id = next(
+            (
+                candidate
+                for candidate, slot in self._slots.items()
+                if not slot.waiters and candidate != keep
+            ),
+            None,
         )
+        if run_id is None:
+            # Every other slot has a live stream; fail the oldest one.
+            run_id = next(iter(self._slots))
+        slot = self._slots.pop(run_id)
+        self._evictions += 1
+        for _ in range(slot.waiters):
+            slot.queue.put_nowait(_EVICTED)
+        logger.warning("continuation_evicted", run_id=run_id, waiters=slot.waiters)
 
     async def wait(self, run_id: str) -> dict[str, Any]:
-        queue = self._queues[run_id]
-        return await queue.get()
+        """
+        Wait for the next payload pushed for ``run_id``.
+
+        Raises ``ContinuationUnavailableError`` after the wait timeout or if
+        the run is evicted meanwhile.
+        """
+        slot = self._slot(run_id)
+        slot.waiters += 1
+        self._on_wait(run_id)
+        try:
+            payload = await asyncio.wait_for(slot.queue.get(), self._wait_timeout)
+        except TimeoutError:
+            self._timeouts += 1
+            raise ContinuationUnavailableError(run_id, "timed out") from None
+        finally:
+            slot.waiters -= 1
+            if slot.waiters == 0 and self._slots.get(run_id) is slot:
+                self._release(run_id, slot)
+        if payload is _EVICTED:
+            raise ContinuationUnavailableError(run_id, "was evicted")
+        return payload
 
     def push(self, run_id: str, payload: dict[str, Any]) -> None:
-        queue = self._queues[run_id]
-        queue.put_nowait(payload)
+        """Queue ``payload`` for a waiter in this process."""
+        self._slot(run_id).queue.put_nowait(payload)
+
+    async def publish(self, run_id: str, payload: dict[str, Any]) -> None:
+        """Deliver ``payload`` to whichever process is waiting on the run."""
+        self.push(run_id, payload)
+
+    async def start(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    def _on_wait(self, run_id: str) -> None: ...
+
+    def _release(self, run_id: str, slot: _Slot) -> None:
+        """The last waiter left; keep the slot only if payloads are queued."""
+        if slot.queue.empty():
+            del self._slots[run_id]
+
+    def _waiting_slot(self, run_id: str) -> _Slot | None:
+        slot = self._slots.get(run_id)
+        return slot if slot is not None and slot.waiters else None
+
+    def discard(self, run_id: str) -> None:
+        """Drop undelivered payloads once the run's stream is finished."""
+        slot = self._slots.get(run_id)
+        if slot is not None and slot.waiters == 0:
+            del self._slots[run_id]
+
+    def stats(self) -> ContinuationHubStats:
+        return ContinuationHubStats(
+            parked_runs=len(self._slots),
+            waiting_runs=sum(1 for slot in self._slots.values() if slot.waiters),
+            queued_payloads=sum(slot.queue.qsize() for slot in self._slots.values()),
+            timeouts=self._timeouts,
+            evictions=self._evictions,
+            expirations=self._expirations,
+        )
+
+
+class BrokeredContinuationHub(ContinuationHub):
+    """
+    Continuation hub shared by several processes through a broker.
+
+    ``publish`` queues the payload in the broker and notifies every process;
+    only a process with a local waiter for the run claims it (an atomic pop),
+    so each payload reaches at most one stream. Payloads published before the
+    stream starts waiting are claimed when it does.
+    """
+
+    def __init__(self, broker: ContinuationBrokerPort, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._broker = broker
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def publish(self, run_id: str, payload: dict[str, Any]) -> None:
+        await self._broker.publish(run_id, payload)
+
+    async def start(self) -> None:
+        await self._broker.listen(self._on_notify, self._on_reconnect)
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await self._broker.close()
+
+    def _on_wait(self, run_id: str) -> None:
+        self._spawn(self._claim(run_id))
+
+    def _release(self, run_id: str, slot: _Slot) -> None:
+        # Payloads claimed for a waiter that has since left go back to the
+        # broker, where any process's next waiter for the run can claim them.
+        del self._slots[run_id]
+        while not slot.queue.empty():
+            payload = slot.queue.get_nowait()
+            if payload is not _EVICTED:
+                self._spawn(self._broker.publish(run_id, payload))
+
+    def _on_notify(self, run_id: str) -> None:
+        if self._waiting_slot(run_id) is not None:
+            self._spawn(self._claim(run_id))
+
+    def _on_reconnect(self) -> None:
+        # Notifications sent while the listener was down are lost; claim
+        # for every local waiter in case one was meant for it.
+        for run_id, slot in self._slots.items():
+            if slot.waiters:
+                self._spawn(self._claim(run_id))
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _claim(self, run_id: str) -> None:
+        try:
+            payload = await self._broker.claim(run_id)
+        except Exception:
+            logger.exception("continuation_claim_failed", run_id=run_id)
+            return
+        if payload is None:
+            return
+        slot = self._waiting_slot(run_id)
+        if slot is not None:
+            slot.queue.put_nowait(payload)
+        else:
+            # The waiter left while the claim was in flight; hand it back.
+            await self._broker.publish(run_id, payload)
+
+
+_continuation_hub: ContinuationHub | None = None
+
+
+def get_continuation_hub() -> ContinuationHub:
+    """Get or create the process-wide continuation hub (swap via settings)."""
+    global _continuation_hub
+    if _continuation_hub is not None:
+        return _continuation_hub
+
+    settings = get_settings()
+    limits = {
+        "wait_timeout_seconds": settings.continuation_wait_timeout_seconds,
+        "max_parked_runs": settings.continuation_max_parked_runs,
+        "queued_ttl_seconds": settings.continuation_queued_ttl_seconds,
+    }
+    ttl = int(settings.continuation_wait_timeout_seconds) or 86400
+    backend = settings.continuation_backend
+    if backend == "memory":
+        _continuation_hub = ContinuationHub(**limits)
+    elif backend == "redis":
+        from .store.continuation_broker import RedisContinuationBroker
+
+        if not settings.redis_url:
+            raise RuntimeError(
+                "REDIS_URL is required for the redis continuation backend."
+            )
+        _continuation_hub = BrokeredContinuationHub(
+            RedisContinuationBroker(settings.redis_url, ttl_seconds=ttl), **limits
+        )
+    elif backend == "postgres":
+        from .db import get_db_pool
+        from .store.continuation_broker import PostgresContinuationBroker
+
+        _continuation_hub = BrokeredContinuationHub(
+            PostgresContinuationBroker(
+                f"{settings.database_server_dsn}/{settings.database_name}",
+                pool_factory=get_db_pool,
+                ttl_seconds=ttl,
+            ),
+            **limits,
+        )
+    else:
+        raise RuntimeError(f"Unsupported continuation backend: {backend}")
+    return _continuation_hub
@@ -4,6 +4,9 @@ Run dependencies for the agent.
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 
 import asyncpg
@@ -17,11 +20,52 @@ class Deps:
     Dependencies for the SQL analysis agent.
 
     Attributes:
-        conn: Database connection for executing SQL queries
+        pool: Shared database pool; tools borrow a connection only while
+            executing SQL (see ``connection()``)
         run_id: Unique identifier for this run (used for scoping artifacts)
         artifact_store: Global artifact store for this run
+        acquire_timeout: Seconds to wait for a pooled connection
     """
 
-    conn: asyncpg.Connection
+    pool: asyncpg.Pool
     run_id: str
     artifact_store: ArtifactStorePort
+    acquire_timeout: float | None = None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[asyncpg.Connection]:
+        """Borrow a pooled connection for the duration of the block."""
+        async with self.pool.acquire(timeout=self.acquire_timeout) as conn:
+            yield conn
+
+
+_current_deps: ContextVar[Deps] = ContextVar("deps")
+
+
+@contextmanager
+def use_deps(deps: Deps) -> Iterator[Deps]:
+    """
+    Bind ``deps`` for the current run.
+
+    Tools are built once per process and look up their run's dependencies
+    with ``get_deps()``; ADK tasks spawned while iterating the runner inherit
+    the binding.
+    """
+    token = _current_deps.set(deps)
+    try:
+        yield deps
+    finally:
+        try:
+            _current_deps.reset(token)
+        except ValueError:
+            # A streaming generator finalized from another context (e.g. on
+            # client disconnect); that context never saw the binding.
+            pass
+
+
+def get_deps() -> Deps:
+    """Get the dependencies bound for the current run."""
+    try:
+        return _current_deps.get()
+    except LookupError:
+        raise RuntimeError("No Deps bound for this run. Use use_deps().") from None
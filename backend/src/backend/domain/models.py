@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Any, Literal
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingAction:
     kind: Literal["approval", "client_tool"]
     tool_call_id: str
@@ -18,10 +18,13 @@ class PendingAction:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class RunState:
     run_id: str
     session_id: str
     invocation_id: str | None = None
     pending_approvals: dict[str, PendingAction] = field(default_factory=dict)
     pending_client_tools: dict[str, PendingAction] = field(default_factory=dict)
+    # Store clock reading (monotonic seconds) of the last read or write;
+    # drives TTL expiry in the memory store.
+    updated_at: float = 0.0
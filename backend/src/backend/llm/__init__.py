@@ -1 +1 @@
-"""LLM credential helpers."""
+"""LLM provider helpers (credentials, context caching)."""
@@ -0,0 +1,248 @@
+"""
+Provider-side context caching for the static system-prompt prefix.
+
+When enabled, the SQL agent sends its static prefix as ``static_instruction``
+(the date suffix moves into the request contents). A before-model callback
+swaps that system instruction and the tool declarations for a Gemini
+cached-content handle. One handle is kept per (model, prefix hash) and its
+TTL is renewed shortly before it expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedContentHandle:
+    name: str
+    token_count: int
+    expires_at: float
+
+
+class CachedContentClient(Protocol):
+    """Creates and renews provider-side cached content."""
+
+    async def create(
+        self,
+        *,
+        model: str,
+        system_instruction: str,
+        tools: list[types.Tool] | None,
+        ttl_seconds: int,
+    ) -> tuple[str, int]:
+        """Create cached content and return ``(name, token_count)``."""
+        ...
+
+    async def renew(self, *, name: str, ttl_seconds: int) -> None: ...
+
+
+class GenaiCachedContentClient(CachedContentClient):
+    """Gemini API / Vertex AI cached content via google-genai."""
+
+    def __init__(self, client=None) -> None:
+        if client is None:
+            from google.genai import Client
+
+            client = Client()
+        self._client = client
+
+    async def create(
+        self,
+        *,
+        model: str,
+        system_instruction: str,
+        tools: list[types.Tool] | None,
+        ttl_seconds: int,
+    ) -> tuple[str, int]:
+        cached = await self._client.aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_instruction,
+                tools=tools,
+                ttl=f"{ttl_seconds}s",
+            ),
+        )
+        usage = cached.usage_metadata
+        token_count = (usage.total_token_count or 0) if usage else 0
+        return cached.name or "", token_count
+
+    async def renew(self, *, name: str, ttl_seconds: int) -> None:
+        await self._client.aio.caches.update(
+            name=name,
+            config=types.UpdateCachedContentConfig(ttl=f"{ttl_seconds}s"),
+        )
+
+
+class FakeCachedContentClient(CachedContentClient):
+    """Offline stand-in that counts ~4 characters per token."""
+
+    def __init__(self) -> None:
+        self.created: list[str] = []
+        self.renewed: list[str] = []
+        self.fail = False
+
+    async def create(
+        self,
+        *,
+        model: str,
+        system_instruction: str,
+        tools: list[types.Tool] | None,
+        ttl_seconds: int,
+    ) -> tuple[str, int]:
+        if self.fail:
+            raise RuntimeError("cached content unavailable")
+        name = f"cachedContents/fake-{len(self.created)}"
+        self.created.append(name)
+        tools_text = "".join(tool.model_dump_json() for tool in tools or [])
+        return name, (len(system_instruction) + len(tools_text)) // 4
+
+    async def renew(self, *, name: str, ttl_seconds: int) -> None:
+        self.renewed.append(name)
+
+
+@dataclass
+class ContextCacheStats:
+    requests: int = 0
+    hits: int = 0
+    creates: int = 0
+    renewals: int = 0
+    failures: int = 0
+    cached_prompt_tokens: int = 0
+
+
+def _system_instruction_text(config: types.GenerateContentConfig) -> str | None:
+    instruction = config.system_instruction
+    if instruction is None or isinstance(instruction, str):
+        return instruction
+    if isinstance(instruction, types.Content):
+        return "".join(part.text or "" for part in instruction.parts or [])
+    return None
+
+
+class PromptContextCache:
+    """Tracks cached-content handles per (model, prefix hash)."""
+
+    def __init__(
+        self,
+        client: CachedContentClient,
+        *,
+        ttl_seconds: int = 3600,
+        refresh_margin_seconds: int = 300,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._client = client
+        self._ttl = ttl_seconds
+        self._margin = min(refresh_margin_seconds, ttl_seconds)
+        self._clock = clock
+        self._handles: dict[tuple[str, str], CachedContentHandle] = {}
+        self._failed_until: dict[tuple[str, str], float] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self.stats = ContextCacheStats()
+
+    async def get_handle(
+        self,
+        *,
+        model: str,
+        prefix_hash: str,
+        system_instruction: str,
+        tools: list[types.Tool] | None,
+    ) -> CachedContentHandle | None:
+        key = (model, prefix_hash)
+        handle = self._handles.get(key)
+        if handle is not None and self._clock() < handle.expires_at - self._margin:
+            return handle
+        if self._clock() < self._failed_until.get(key, 0.0):
+            return None
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            now = self._clock()
+            handle = self._handles.get(key)
+            if handle is not None and now < handle.expires_at - self._margin:
+                return handle
+            try:
+                if handle is not None and now < handle.expires_at:
+                    await self._client.renew(name=handle.name, ttl_seconds=self._ttl)
+                    handle = CachedContentHandle(
+                        name=handle.name,
+                        token_count=handle.token_count,
+                        expires_at=now + self._ttl,
+                    )
+                    self.stats.renewals += 1
+                else:
+                    name, token_count = await self._client.create(
+                        model=model,
+                        system_instruction=system_instruction,
+                        tools=tools,
+                        ttl_seconds=self._ttl,
+                    )
+                    handle = CachedContentHandle(
+                        name=name, token_count=token_count, expires_at=now + self._ttl
+                    )
+                    self.stats.creates += 1
+            except Exception as exc:
+                # e.g. prefix below the model's minimum cacheable size; retry
+                # after one TTL and send the prompt uncached meanwhile.
+                logger.warning(
+                    "context_cache_unavailable", model=model, error=str(exc)
+                )
+                self._handles.pop(key, None)
+                self._failed_until[key] = now + self._ttl
+                self.stats.failures += 1
+                return None
+            self._handles[key] = handle
+            return handle
+
+    async def apply(self, llm_request: LlmRequest) -> bool:
+        """
+        Replace the request's system instruction and tools with a cached
+        content reference. Returns False if the request was left unchanged.
+        """
+        self.stats.requests += 1
+        config = llm_request.config
+        system_instruction = _system_instruction_text(config)
+        if not llm_request.model or not system_instruction or config.cached_content:
+            return False
+
+        tools = [tool for tool in config.tools or [] if isinstance(tool, types.Tool)]
+        digest = hashlib.sha256(system_instruction.encode("utf-8"))
+        for tool in tools:
+            digest.update(tool.model_dump_json(exclude_none=True).encode("utf-8"))
+
+        handle = await self.get_handle(
+            model=llm_request.model,
+            prefix_hash=digest.hexdigest(),
+            system_instruction=system_instruction,
+            tools=tools or None,
+        )
+        if handle is None:
+            return False
+
+        config.cached_content = handle.name
+        config.system_instruction = None
+        config.tools = None
+        config.tool_config = None
+        self.stats.hits += 1
+        self.stats.cached_prompt_tokens += handle.token_count
+        return True
+
+    async def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        await self.apply(llm_request)
+        return None
@@ -4,36 +4,85 @@ FastAPI application for the TanStack AI HITL Demo (ADK backend).
 
 from __future__ import annotations
 
+import base64
+import json
 import uuid
-from collections.abc import AsyncIterator
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict
 
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic_core import to_json
 from structlog.contextvars import bound_contextvars
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 
 from .adapters.adk_to_tanstack import TanStackAdkAdapter
-from .adapters.tanstack_stream import DoneStreamChunk, encode_chunk, encode_done, now_ms
+from .adapters.sse_compression import (
+    available_encodings,
+    compress_frames,
+    negotiate_encoding,
+)
+from .adapters.sse_writer import SseWriteStats, StreamEvent, sse_frames
+from .adapters.table_export import EXPORT_MEDIA_TYPES, gzip_chunks, iter_table_chunks
+from .adapters.tanstack_stream import (
+    COMPACT_STREAM_MODE,
+    DELTA_ONLY_STREAM_MODE,
+    DETACHED_STREAM_MODE,
+    STREAM_MODE_HEADER,
+    DoneStreamChunk,
+    ErrorObj,
+    ErrorStreamChunk,
+    StreamChunk,
+    encode_done,
+    now_ms,
+    parse_stream_modes,
+)
 from .adapters.tanstack_to_adk import extract_user_text
 from .agents.sql_agent.agent import create_runner
-from .continuation import ContinuationHub
-from .db import get_db_connection
-from .deps import Deps
+from .continuation import ContinuationUnavailableError, get_continuation_hub
+from .db import bootstrap_database, close_db_pool, get_db_pool, init_db_pool
+from .deps import Deps, use_deps
 from .logging import configure_logging, get_logger
 from .settings import get_settings
 from .store import get_artifact_store, get_run_store
+from .stream_buffer import ReplayGapError, RunStreamBuffer, RunStreamRegistry
 
 # Get settings
 settings = get_settings()
 configure_logging()
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Bootstrap the schema once, then hold the shared pool for the process."""
+    if settings.database_bootstrap_on_startup:
+        await bootstrap_database(
+            server_dsn=settings.database_server_dsn,
+            database=settings.database_name,
+        )
+    await init_db_pool(settings)
+    await store.start()
+    await artifact_store.start()
+    await continuation_hub.start()
+    try:
+        yield
+    finally:
+        await continuation_hub.close()
+        await artifact_store.close()
+        await store.close()
+        await close_db_pool()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="TanStack AI HITL Demo",
     description="SQL Analysis Agent with Human-in-the-Loop",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -47,8 +96,27 @@ app.add_middleware(
 
 # Run store for HITL continuation (swap via settings)
 store = get_run_store()
-continuation_hub = ContinuationHub()
+artifact_store = get_artifact_store()
+continuation_hub = get_continuation_hub()
 session_service = InMemorySessionService()
+# Built once; tools look up per-run Deps bound with use_deps()
+runner = create_runner(settings=settings, session_service=session_service)
+# Per-run chunk buffers for Last-Event-ID replay (None when disabled)
+run_streams = (
+    RunStreamRegistry(
+        capacity=settings.sse_replay_buffer_size,
+        retention_seconds=settings.sse_replay_retention_seconds,
+        max_runs=settings.sse_replay_max_runs,
+        model=settings.llm_model,
+    )
+    if settings.sse_replay_buffer_size > 0
+    else None
+)
+# Agent streams created and not yet finished, keyed by run_id, in both
+# replay modes; entries vanish with their stream if it is never started
+active_runs: weakref.WeakValueDictionary[str, AsyncIterator[StreamChunk]] = (
+    weakref.WeakValueDictionary()
+)
 
 
 def _sse_headers() -> dict[str, str]:
@@ -60,14 +128,218 @@ def _sse_headers() -> dict[str, str]:
     }
 
 
-@app.post("/api/continuation")
-async def continuation(request: Request) -> JSONResponse:
+@contextmanager
+def _discard_continuations(run_id: str) -> Iterator[None]:
+    """Free the run's continuation mailbox when its stream ends or is dropped."""
+    try:
+        yield
+    finally:
+        continuation_hub.discard(run_id)
+
+
+@contextmanager
+def _release_active_run(
+    run_id: str, stream_ref: weakref.ref[AsyncIterator[StreamChunk]]
+) -> Iterator[None]:
+    """Drop the run from ``active_runs`` when its agent stream ends."""
+    try:
+        yield
+    finally:
+        if active_runs.get(run_id) is stream_ref():
+            del active_runs[run_id]
+
+
+def _agent_chunks(
+    run_id: str,
+    *,
+    delta_only: bool,
+    detached: bool,
+    user_text: str | None = None,
+    continuation: dict | None = None,
+) -> AsyncIterator[StreamChunk]:
+    """
+    Chunks for one chat turn: run the user text (or resume from a
+    continuation payload), then either wait for continuations in-stream or,
+    when ``detached``, end the stream as soon as the run is parked.
+
+    The run is registered in ``active_runs`` from this call until the
+    returned stream finishes.
+    """
+
+    async def chunks() -> AsyncIterator[StreamChunk]:
+        deps = Deps(
+            pool=get_db_pool(),
+            run_id=run_id,
+            artifact_store=get_artifact_store(),
+            acquire_timeout=settings.database_pool_acquire_timeout,
+        )
+        with (
+            bound_contextvars(run_id=run_id),
+            use_deps(deps),
+            _discard_continuations(run_id),
+            _release_active_run(run_id, stream_ref),
+        ):
+            adapter = TanStackAdkAdapter(
+                run_id=run_id,
+                model=settings.llm_model,
+                runner=runner,
+                run_store=store,
+                user_id=settings.adk_user_id,
+                delta_only=delta_only,
+            )
+
+            source = None
+            if continuation is not None:
+                source = adapter.resume_from_continuation(continuation)
+            elif user_text:
+                source = adapter.run_from_user_text(user_text)
+
+            finish_reason = "stop"
+            if source is not None:
+                async for chunk in source:
+                    yield chunk
+
+                if detached and await adapter.has_pending():
+                    # Parked: the client resumes via POST /api/continuation.
+                    finish_reason = "tool_calls"
+                while finish_reason == "stop" and await adapter.has_pending():
+                    try:
+                        payload = await continuation_hub.wait(run_id)
+                    except ContinuationUnavailableError as exc:
+                        yield ErrorStreamChunk(
+                            id=run_id,
+                            model=settings.llm_model,
+                            timestamp=now_ms(),
+                            error=ErrorObj(
+                                message=str(exc), code="continuation_unavailable"
+                            ),
+                        )
+                        break
+                    async for chunk in adapter.resume_from_continuation(payload):
+                        yield chunk
+
+            yield DoneStreamChunk(
+                id=run_id,
+                model=settings.llm_model,
+                timestamp=now_ms(),
+                finishReason=finish_reason,
+            )
+
+    stream = chunks()
+    # Weak so the generator does not keep itself alive through its closure
+    stream_ref = weakref.ref(stream)
+    active_runs[run_id] = stream
+    return stream
+
+
+def _sse_response(
+    request: Request,
+    run_id: str,
+    stream_modes: frozenset[str],
+    chunks: AsyncIterator[StreamChunk] | None,
+    replay_from: int | None = None,
+) -> StreamingResponse:
+    """
+    Stream ``chunks`` (or replay the run's buffer after ``replay_from``) as
+    SSE, applying the negotiated stream modes and content encoding.
+    """
+    encoding = None
+    if settings.sse_compression:
+        encoding = negotiate_encoding(
+            request.headers.get("accept-encoding"), available_encodings()
+        )
+
+    async def untracked() -> AsyncIterator[StreamEvent]:
+        async for chunk in chunks:
+            yield None, chunk
+
+    async def replayable(
+        run_stream: RunStreamBuffer, after: int
+    ) -> AsyncIterator[StreamEvent]:
+        try:
+            async for event in run_stream.follow(after):
+                yield event
+        except ReplayGapError as exc:
+            yield (
+                None,
+                ErrorStreamChunk(
+                    id=run_id,
+                    model=settings.llm_model,
+                    timestamp=now_ms(),
+                    error=ErrorObj(message=str(exc), code="replay_gap"),
+                ),
+            )
+
+    if run_streams is None:
+        events = untracked()
+    elif replay_from is not None:
+        run_stream = run_streams.get(run_id)
+        if run_stream is None:
+            raise HTTPException(status_code=404, detail="Stream not found or expired")
+        events = replayable(run_stream, replay_from)
+    else:
+        run_stream = run_streams.start(run_id, chunks)
+        events = replayable(run_stream, run_stream.first_id - 1)
+
+    async def stream() -> AsyncIterator[bytes]:
+        stats = SseWriteStats()
+        try:
+            async for frame in sse_frames(
+                events,
+                window_seconds=settings.sse_coalesce_window_ms / 1000,
+                max_bytes=settings.sse_coalesce_max_bytes,
+                omit_constant_keys=COMPACT_STREAM_MODE in stream_modes,
+                stats=stats,
+            ):
+                yield frame
+            yield encode_done()
+        finally:
+            logger.info("sse_stream_stats", run_id=run_id, **stats.summary())
+
+    headers = _sse_headers()
+    if stream_modes:
+        headers[STREAM_MODE_HEADER] = ", ".join(sorted(stream_modes))
+    body_stream = stream()
+    if settings.sse_compression:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        body_stream = compress_frames(body_stream, encoding)
+    return StreamingResponse(
+        body_stream,
+        headers=headers,
+    )
+
+
+@app.post("/api/continuation", response_model=None)
+async def continuation(request: Request) -> JSONResponse | StreamingResponse:
+    """
+    Deliver approvals / client tool results for a parked run.
+
+    A run whose chat stream is still open (the default) receives the payload
+    through the continuation hub. A run parked by a ``detached`` chat stream
+    is resumed here instead: ask for ``Accept: text/event-stream`` and this
+    response streams the resumed run.
+    """
     body = await request.json()
     run_id = body.get("run_id")
     if not run_id:
         raise HTTPException(status_code=400, detail="Missing run_id")
-    continuation_hub.push(run_id, body)
-    return JSONResponse({"status": "ok"})
+
+    if "text/event-stream" not in request.headers.get("accept", ""):
+        await continuation_hub.publish(run_id, body)
+        return JSONResponse({"status": "ok"})
+
+    if run_id in active_runs:
+        raise HTTPException(status_code=409, detail="Run is still streaming")
+    stream_modes = parse_stream_modes(request.headers.get(STREAM_MODE_HEADER))
+    chunks = _agent_chunks(
+        run_id,
+        delta_only=DELTA_ONLY_STREAM_MODE in stream_modes,
+        detached=True,
+        continuation=body,
+    )
+    return _sse_response(request, run_id, stream_modes | {DETACHED_STREAM_MODE}, chunks)
 
 
 @app.post("/api/chat")
@@ -84,64 +356,52 @@ async def chat(request: Request) -> StreamingResponse:
     if not run_id:
         run_id = uuid.uuid4().hex
 
+    stream_modes = parse_stream_modes(request.headers.get(STREAM_MODE_HEADER))
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None and run_streams is not None:
+        try:
+            replay_from = int(last_event_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail="Invalid Last-Event-ID"
+            ) from None
+        return _sse_response(request, run_id, stream_modes, None, replay_from)
+
     messages = body_json.get("messages") if isinstance(body_json, dict) else []
     user_text = extract_user_text(messages or [])
+    chunks = _agent_chunks(
+        run_id,
+        delta_only=DELTA_ONLY_STREAM_MODE in stream_modes,
+        detached=DETACHED_STREAM_MODE in stream_modes,
+        user_text=user_text,
+    )
+    return _sse_response(request, run_id, stream_modes, chunks)
 
-    async def stream() -> AsyncIterator[bytes]:
-        with bound_contextvars(run_id=run_id):
-            async with get_db_connection() as conn:
-                deps = Deps(
-                    conn=conn,
-                    run_id=run_id,
-                    artifact_store=get_artifact_store(),
-                )
-                runner = create_runner(
-                    deps=deps,
-                    settings=settings,
-                    session_service=session_service,
-                )
-                adapter = TanStackAdkAdapter(
-                    run_id=run_id,
-                    model=settings.llm_model,
-                    runner=runner,
-                    run_store=store,
-                    user_id=settings.adk_user_id,
-                )
-
-                if not user_text:
-                    yield encode_chunk(
-                        DoneStreamChunk(
-                            id=run_id,
-                            model=settings.llm_model,
-                            timestamp=now_ms(),
-                            finishReason="stop",
-                        )
-                    ).encode("utf-8")
-                    yield encode_done().encode("utf-8")
-                    return
 
-                async for chunk in adapter.run_from_user_text(user_text):
-                    yield encode_chunk(chunk).encode("utf-8")
+def _encode_cursor(offset: int, limit: int | None, columns: list[str] | None) -> str:
+    payload = json.dumps({"offset": offset, "limit": limit, "columns": columns})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
 
-                while adapter.has_pending():
-                    payload = await continuation_hub.wait(run_id)
-                    async for chunk in adapter.resume_from_continuation(payload):
-                        yield encode_chunk(chunk).encode("utf-8")
-
-                yield encode_chunk(
-                    DoneStreamChunk(
-                        id=run_id,
-                        model=settings.llm_model,
-                        timestamp=now_ms(),
-                        finishReason="stop",
-                    )
-                ).encode("utf-8")
-                yield encode_done().encode("utf-8")
 
-    return StreamingResponse(
-        stream(),
-        headers=_sse_headers(),
-    )
+def _decode_cursor(cursor: str) -> tuple[int, int | None, list[str] | None]:
+    """Raises ValueError on a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        offset, limit, columns = payload["offset"], payload["limit"], payload["columns"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if (
+        not isinstance(offset, int)
+        or offset < 0
+        or not (limit is None or (isinstance(limit, int) and 1 <= limit <= 10_000))
+        or not (
+            columns is None
+            or (isinstance(columns, list) and all(isinstance(c, str) for c in columns))
+        )
+    ):
+        raise ValueError("Invalid cursor")
+    return offset, limit, columns
 
 
 @app.get("/api/data/{run_id}/{artifact_id:path}")
@@ -149,7 +409,11 @@ async def get_csv_data(
     run_id: str,
     artifact_id: str,
     mode: str = Query(default="preview", pattern="^(preview|download)$"),
-) -> dict:
+    offset: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1, le=10_000),
+    columns: str | None = Query(default=None),
+    cursor: str | None = Query(default=None),
+) -> Response:
     """
     Get CSV export data by run_id and artifact ID.
 
@@ -161,34 +425,109 @@ async def get_csv_data(
     Args:
         run_id: The run ID that produced this dataset
         artifact_id: The artifact identifier
+        offset: First row of the page
+        limit: Rows per page (all remaining rows when omitted)
+        columns: Comma-separated columns to include (all when omitted)
+        cursor: ``next_cursor`` of a previous page; replaces the three above
 
     Returns:
-        JSON with rows/columns or a signed download URL
+        JSON with rows/columns (plus ``next_cursor`` while more rows remain)
+        or a signed download URL
     """
     artifact_store = get_artifact_store()
 
     if mode == "download":
         download = artifact_store.get_download(run_id, artifact_id)
         if download is not None:
-            return {
-                "mode": "signed-url",
-                "download_url": download.url,
-                "expires_in_seconds": download.expires_in_seconds,
-                "method": download.method,
-                "headers": download.headers,
-            }
-
-    preview = artifact_store.get_preview(run_id, artifact_id)
+            return JSONResponse(
+                {
+                    "mode": "signed-url",
+                    "download_url": download.url,
+                    "expires_in_seconds": download.expires_in_seconds,
+                    "method": download.method,
+                    "headers": download.headers,
+                }
+            )
+
+    selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    try:
+        if cursor is not None:
+            offset, limit, selected = _decode_cursor(cursor)
+        preview = artifact_store.get_preview(
+            run_id, artifact_id, offset=offset, limit=limit, columns=selected
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     if preview is None:
         raise HTTPException(status_code=404, detail="Artifact not found or expired")
 
-    return {
+    next_cursor = (
+        _encode_cursor(preview.next_offset, limit, selected)
+        if preview.next_offset is not None
+        else None
+    )
+    body = {
         "mode": "inline",
         "rows": preview.rows,
         "columns": preview.columns,
         "original_row_count": preview.original_row_count,
         "exported_row_count": preview.exported_row_count,
+        "offset": preview.offset,
+        "total_row_count": preview.total_row_count,
+        "next_cursor": next_cursor,
     }
+    # Rows are plain Python values, so skip FastAPI's generic encoder.
+    return Response(
+        content=to_json(body, inf_nan_mode="null"), media_type="application/json"
+    )
+
+
+@app.get("/api/export/{run_id}/{artifact_id:path}")
+async def export_artifact(
+    run_id: str,
+    artifact_id: str,
+    fmt: str = Query(default="csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = Query(default=False),
+) -> StreamingResponse:
+    """
+    Stream an artifact as a CSV or NDJSON file download.
+
+    Rows are encoded in chunks of ``artifact_export_chunk_rows`` while the
+    response is sent, so memory stays flat however large the export is.
+    The memory artifact store links here from ``mode=download``.
+
+    Args:
+        run_id: The run ID that produced this dataset
+        artifact_id: The artifact identifier
+        fmt: ``csv`` or ``ndjson`` (query parameter ``format``)
+        gzip: Send a ``.gz`` file instead
+    """
+    df = get_artifact_store().get_dataframe(run_id, artifact_id)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Artifact not found or expired")
+
+    chunks = iter_table_chunks(df, fmt, chunk_rows=settings.artifact_export_chunk_rows)
+    filename = f"{artifact_id.rsplit('/', 1)[-1]}.{fmt}"
+    media_type = EXPORT_MEDIA_TYPES[fmt]
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    # A sync iterator, so Starlette encodes chunks in its threadpool.
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.get("/api/metrics")
+async def metrics() -> dict:
+    """In-process gauges and counters."""
+    gauges = {"continuations": asdict(continuation_hub.stats())}
+    if (artifact_stats := artifact_store.stats()) is not None:
+        gauges["artifacts"] = asdict(artifact_stats)
+    return gauges
 
 
 @app.get("/health")
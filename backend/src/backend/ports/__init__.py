@@ -4,7 +4,13 @@ from .artifact_store import (
     ArtifactPreview,
     ArtifactRef,
     ArtifactStorePort,
+    ArtifactStoreStats,
+    ArtifactTooLargeError,
+    ColumnarTable,
+    TableData,
+    TableWriter,
 )
+from .continuation import ContinuationBrokerPort
 from .run_store import PendingAction, RunStorePort, RunState
 
 __all__ = [
@@ -13,6 +19,12 @@ __all__ = [
     "ArtifactPreview",
     "ArtifactRef",
     "ArtifactStorePort",
+    "ArtifactStoreStats",
+    "ArtifactTooLargeError",
+    "ColumnarTable",
+    "TableData",
+    "TableWriter",
+    "ContinuationBrokerPort",
     "RunStorePort",
     "RunState",
     "PendingAction",
@@ -4,11 +4,28 @@ Port definition for artifact storage.
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Protocol
 
+import numpy as np
 import pandas as pd
+from pandas.api.extensions import ExtensionArray
+
+
+class ArtifactTooLargeError(Exception):
+    """An artifact does not fit the store's memory budget or run quota."""
+
+
+@dataclass
+class ArtifactStoreStats:
+    artifacts: int
+    runs: int
+    bytes_held: int
+    evicted_artifacts: int
+    evicted_bytes: int
+    rejected_artifacts: int
 
 
 @dataclass(frozen=True)
@@ -22,24 +39,56 @@ class ArtifactRef:
 
 @dataclass
 class Artifact:
-    """Stored artifact payload for a single run."""
+    """
+    Stored artifact payload for a single run, held only as its DataFrame;
+    JSON rows are built per request.
+    """
 
     id: str
     type: str
     run_id: str
-    dataframe: pd.DataFrame | None
-    rows: list[dict[str, Any]]
+    dataframe: pd.DataFrame
     columns: list[str]
     original_row_count: int
     created_at: datetime = field(default_factory=datetime.now)
 
 
+@dataclass(frozen=True)
+class ColumnarTable:
+    """Table held as one typed array per column (no per-row objects)."""
+
+    columns: list[str]
+    arrays: list[np.ndarray | ExtensionArray]
+
+    def __len__(self) -> int:
+        return len(self.arrays[0]) if self.arrays else 0
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Wrap the column arrays in a DataFrame without copying them."""
+        df = pd.DataFrame(dict(enumerate(self.arrays)), copy=False)
+        df.columns = self.columns
+        return df
+
+
+# Tabular payloads accepted by ArtifactStorePort.store_table
+TableData = pd.DataFrame | ColumnarTable
+
+
 @dataclass(frozen=True)
 class ArtifactPreview:
+    """
+    One page of preview rows. ``exported_row_count`` counts the rows in this
+    page, ``total_row_count`` those available to page through, and
+    ``next_offset`` is None on the last page.
+    """
+
     rows: list[dict[str, Any]]
     columns: list[str]
     original_row_count: int
     exported_row_count: int
+    offset: int = 0
+    total_row_count: int = 0
+    next_offset: int | None = None
 
 
 @dataclass(frozen=True)
@@ -50,15 +99,51 @@ class ArtifactDownload:
     headers: dict[str, str] | None = None
 
 
+class TableWriter(Protocol):
+    """Incremental writer for a table artifact built from row batches."""
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None: ...
+
+    def close(self) -> ArtifactRef: ...
+
+    def abort(self) -> None: ...
+
+
 class ArtifactStorePort(Protocol):
     """Interface for storing and retrieving artifacts."""
 
-    def store_table(self, run_id: str, df: pd.DataFrame) -> ArtifactRef: ...
+    def store_table(self, run_id: str, table: TableData) -> ArtifactRef: ...
+
+    def open_table(self, run_id: str, columns: list[str]) -> TableWriter: ...
 
     def get_metadata(self, run_id: str, artifact_id: str) -> ArtifactRef | None: ...
 
-    def get_preview(self, run_id: str, artifact_id: str) -> ArtifactPreview | None: ...
+    def get_preview(
+        self,
+        run_id: str,
+        artifact_id: str,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        columns: list[str] | None = None,
+    ) -> ArtifactPreview | None:
+        """
+        Rows ``offset`` to ``offset + limit`` (all when ``limit`` is None),
+        restricted to ``columns`` when given; unknown columns raise
+        ``ValueError``.
+        """
+        ...
 
     def get_download(
         self, run_id: str, artifact_id: str
     ) -> ArtifactDownload | None: ...
+
+    def stats(self) -> ArtifactStoreStats | None:
+        """In-process gauges and counters, or None if the backend keeps none."""
+        ...
+
+    async def start(self) -> None:
+        """Start background work (e.g. expiry sweeps); called at app startup."""
+        ...
+
+    async def close(self) -> None: ...
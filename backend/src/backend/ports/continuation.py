@@ -0,0 +1,39 @@
+"""
+Port definition for cross-process continuation delivery.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, Protocol
+
+
+class ContinuationBrokerPort(Protocol):
+    """
+    Shared mailbox for continuation payloads plus a "payload available"
+    notification fan-out, so the process holding a run's stream can pick up
+    payloads posted to any other process.
+    """
+
+    async def publish(self, run_id: str, payload: dict[str, Any]) -> None:
+        """Queue ``payload`` for ``run_id`` and notify every listener."""
+        ...
+
+    async def claim(self, run_id: str) -> dict[str, Any] | None:
+        """Atomically pop the oldest queued payload for ``run_id``."""
+        ...
+
+    async def listen(
+        self,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Start calling ``on_notify(run_id)`` for every publish.
+
+        Notifications sent while the listener is disconnected are lost, so
+        ``on_reconnect()`` is called once it is listening again.
+        """
+        ...
+
+    async def close(self) -> None: ...
@@ -10,33 +10,48 @@ from ..domain.models import PendingAction, RunState
 
 
 class RunStorePort(Protocol):
-    def get_or_create(self, run_id: str) -> RunState: ...
+    """
+    Per-run HITL state. Async so backends can live out of process (shared
+    by several workers and surviving restarts).
+    """
 
-    def get(self, run_id: str) -> RunState | None: ...
+    async def get_or_create(self, run_id: str) -> RunState: ...
 
-    def set_invocation_id(self, run_id: str, invocation_id: str) -> None: ...
+    async def get(self, run_id: str) -> RunState | None: ...
 
-    def add_pending_approval(self, run_id: str, action: PendingAction) -> None: ...
+    async def set_invocation_id(self, run_id: str, invocation_id: str) -> None: ...
 
-    def add_pending_client_tool(self, run_id: str, action: PendingAction) -> None: ...
+    async def add_pending_approval(
+        self, run_id: str, action: PendingAction
+    ) -> None: ...
 
-    def get_pending_approval(
+    async def add_pending_client_tool(
+        self, run_id: str, action: PendingAction
+    ) -> None: ...
+
+    async def get_pending_approval(
         self, run_id: str, tool_call_id: str
     ) -> PendingAction | None: ...
 
-    def get_pending_client_tool(
+    async def get_pending_client_tool(
         self, run_id: str, tool_call_id: str
     ) -> PendingAction | None: ...
 
-    def pop_pending_approval(
+    async def pop_pending_approval(
         self, run_id: str, tool_call_id: str
     ) -> PendingAction | None: ...
 
-    def pop_pending_client_tool(
+    async def pop_pending_client_tool(
         self, run_id: str, tool_call_id: str
     ) -> PendingAction | None: ...
 
-    def has_pending(self, run_id: str) -> bool: ...
+    async def has_pending(self, run_id: str) -> bool: ...
+
+    async def start(self) -> None:
+        """Start background work (e.g. expiry sweeps); called at app startup."""
+        ...
+
+    async def close(self) -> None: ...
 
 
 __all__ = ["RunState", "RunStorePort", "PendingAction"]
@@ -0,0 +1,209 @@
+"""
+Synthetic `records` data for load testing.
+
+Rows are generated as trace/span trees and bulk-loaded with binary COPY
+(``copy_records_to_table``), which is orders of magnitude faster than the
+row-by-row INSERTs used for the demo sample data.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+
+# Column order used for COPY; matches the records table in db.DB_SCHEMA.
+RECORD_COLUMNS: tuple[str, ...] = (
+    "created_at",
+    "start_timestamp",
+    "end_timestamp",
+    "trace_id",
+    "span_id",
+    "parent_span_id",
+    "level",
+    "span_name",
+    "message",
+    "attributes_json_schema",
+    "attributes",
+    "tags",
+    "is_exception",
+    "otel_status_message",
+    "service_name",
+)
+
+DEFAULT_LEVEL_WEIGHTS: dict[str, float] = {
+    "debug": 15.0,
+    "info": 60.0,
+    "warning": 15.0,
+    "error": 8.0,
+    "critical": 2.0,
+}
+
+_SERVICES = (
+    "api-gateway",
+    "auth-service",
+    "payment-service",
+    "worker-service",
+    "batch-processor",
+    "cache-service",
+    "notification-service",
+)
+_OPERATIONS = ("handler", "db.query", "cache.get", "http.request", "queue.publish")
+_ENVIRONMENTS = ("production", "staging")
+_EXTRA_TAGS = ("critical", "payment", "performance", "security", "batch", "email")
+_MESSAGES = {
+    "debug": ("Cache miss for key user:{n}", "Retrying request attempt {n}"),
+    "info": ("Processed batch job {n}", "Request completed in {n} ms"),
+    "warning": ("High memory usage detected ({n}%)", "Slow query took {n} ms"),
+    "error": ("Connection timeout after {n} ms", "Failed to process payment {n}"),
+    "critical": ("Service unavailable ({n} failures)", "Disk full on node {n}"),
+}
+_ATTRIBUTES_JSON_SCHEMA = json.dumps(
+    {
+        "type": "object",
+        "properties": {
+            "http.method": {"type": "string"},
+            "http.status_code": {"type": "integer"},
+            "user_id": {"type": "integer"},
+            "duration_ms": {"type": "number"},
+            "foobar": {"type": "boolean"},
+        },
+    }
+)
+
+
+@dataclass(frozen=True)
+class SeedConfig:
+    """Shape of the synthetic dataset."""
+
+    rows: int
+    spans_per_trace: int = 8
+    days: float = 7.0
+    level_weights: dict[str, float] = field(
+        default_factory=lambda: dict(DEFAULT_LEVEL_WEIGHTS)
+    )
+    seed: int | None = None
+
+
+@dataclass(frozen=True)
+class SeedResult:
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def generate_records(config: SeedConfig) -> Iterator[tuple]:
+    """
+    Yield synthetic records rows in ``RECORD_COLUMNS`` order.
+
+    Each trace has a root span and up to ``spans_per_trace - 1`` children,
+    each parented to a random earlier span in the same trace.
+    """
+    rng = random.Random(config.seed)
+    levels = list(config.level_weights)
+    weights = list(config.level_weights.values())
+    end = datetime.now(UTC)
+    window_s = config.days * 86400
+
+    emitted = 0
+    trace_no = 0
+    while emitted < config.rows:
+        trace_id = f"trace-{trace_no:012x}"
+        trace_no += 1
+        service = rng.choice(_SERVICES)
+        trace_start = end - timedelta(seconds=rng.random() * window_s)
+        span_count = min(
+            rng.randint(1, max(config.spans_per_trace, 1)), config.rows - emitted
+        )
+        span_ids: list[str] = []
+
+        for span_no in range(span_count):
+            span_id = f"{trace_id[6:]}{span_no:04x}"
+            parent_span_id = rng.choice(span_ids) if span_ids else None
+            span_ids.append(span_id)
+
+            level = rng.choices(levels, weights)[0]
+            is_exception = level in ("error", "critical")
+            start = trace_start + timedelta(milliseconds=span_no * rng.randint(1, 50))
+            duration_ms = rng.expovariate(1 / 40)
+            n = rng.randint(1, 9999)
+
+            attributes: dict[str, object] = {
+                "http.method": rng.choice(("GET", "POST", "PUT")),
+                "http.status_code": 500 if is_exception else 200,
+                "user_id": rng.randint(1, 100_000),
+                "duration_ms": round(duration_ms, 3),
+            }
+            if rng.random() < 0.1:
+                attributes["foobar"] = rng.random() < 0.5
+
+            tags = [rng.choice(_ENVIRONMENTS)]
+            if rng.random() < 0.3:
+                tags.append(rng.choice(_EXTRA_TAGS))
+
+            yield (
+                start,
+                start,
+                start + timedelta(milliseconds=duration_ms),
+                trace_id,
+                span_id,
+                parent_span_id,
+                level,
+                f"{service}.{rng.choice(_OPERATIONS)}",
+                rng.choice(_MESSAGES.get(level, ("{n}",))).format(n=n),
+                _ATTRIBUTES_JSON_SCHEMA,
+                json.dumps(attributes),
+                tags,
+                is_exception,
+                "error" if is_exception else None,
+                service,
+            )
+        emitted += span_count
+
+
+async def seed_records(
+    conn: asyncpg.Connection,
+    config: SeedConfig,
+    *,
+    batch_size: int = 50_000,
+    on_batch: Callable[[SeedResult], None] | None = None,
+) -> SeedResult:
+    """
+    Bulk-load synthetic rows into ``records`` with binary COPY.
+
+    Args:
+        conn: Connection to the bootstrapped target database
+        config: Dataset shape
+        batch_size: Rows per COPY round-trip
+        on_batch: Called with cumulative progress after each batch
+    """
+    started = time.perf_counter()
+    loaded = 0
+    batch: list[tuple] = []
+
+    async def flush() -> None:
+        nonlocal loaded
+        await conn.copy_records_to_table(
+            "records", records=batch, columns=RECORD_COLUMNS
+        )
+        loaded += len(batch)
+        batch.clear()
+        if on_batch is not None:
+            on_batch(SeedResult(rows=loaded, seconds=time.perf_counter() - started))
+
+    for record in generate_records(config):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    return SeedResult(rows=loaded, seconds=time.perf_counter() - started)
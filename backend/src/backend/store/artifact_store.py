@@ -6,31 +6,169 @@ A single global store that can be referenced across HITL continuation requests.
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
 from datetime import datetime, timedelta
+from typing import Any
+from urllib.parse import quote
 
 import pandas as pd
 
+from ..logging import get_logger
 from ..ports import (
     Artifact,
     ArtifactDownload,
     ArtifactPreview,
     ArtifactRef,
     ArtifactStorePort,
+    ArtifactStoreStats,
+    ArtifactTooLargeError,
+    ColumnarTable,
+    TableData,
+    TableWriter,
 )
 from ..settings import get_settings
 
+logger = get_logger(__name__)
+
+
+def _frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def select_columns(available: list[str], requested: list[str] | None) -> list[str]:
+    """Validate a column projection; None selects every column."""
+    if requested is None:
+        return list(available)
+    unknown = [column for column in requested if column not in available]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return list(dict.fromkeys(requested))
+
+
+def page_bounds(
+    total: int, offset: int, limit: int | None
+) -> tuple[int, int, int | None]:
+    """Clamp a page to ``total`` rows; returns (start, end, next_offset)."""
+    start = min(max(offset, 0), total)
+    end = total if limit is None else min(start + limit, total)
+    return start, end, end if end < total else None
+
+
+def to_rows(
+    df: pd.DataFrame, start: int = 0, end: int | None = None
+) -> list[dict[str, Any]]:
+    """
+    JSON-ready row dicts for a slice of ``df``: datetimes and timedeltas
+    become strings and missing values (NaT, pd.NA) become None. Float NaN
+    is left for the JSON encoder.
+    """
+    page = df.iloc[start:end]
+    for position, dtype in enumerate(page.dtypes):
+        column = page.iloc[:, position]
+        # datetime64 (with or without tz) or timedelta64
+        is_temporal = dtype.kind in "mM"
+        if not is_temporal and pd.api.types.is_float_dtype(dtype):
+            continue
+        missing = column.isna()
+        if not is_temporal and not missing.any():
+            continue
+        values = column.astype(str) if is_temporal else column
+        # isetitem swaps in a new array; the stored column is untouched.
+        page.isetitem(position, values.astype(object).where(~missing, None))
+    return page.to_dict(orient="records")
+
+
+class _InMemoryTableWriter(TableWriter):
+    """Builds one DataFrame per row batch and stores their concatenation."""
+
+    def __init__(
+        self, store: InMemoryArtifactStore, run_id: str, columns: list[str]
+    ) -> None:
+        self._store = store
+        self._run_id = run_id
+        self._columns = columns
+        self._frames: list[pd.DataFrame] = []
+        self._nbytes = 0
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        if rows:
+            frame = pd.DataFrame.from_records(
+                [tuple(row) for row in rows], columns=self._columns
+            )
+            self._frames.append(frame)
+            # Stop pulling rows as soon as the result cannot be kept anyway.
+            self._nbytes += _frame_nbytes(frame)
+            self._store._check_fits(self._run_id, self._nbytes)
+
+    def close(self) -> ArtifactRef:
+        if not self._frames:
+            df = pd.DataFrame(columns=self._columns)
+        elif len(self._frames) == 1:
+            df = self._frames[0]
+        else:
+            df = pd.concat(self._frames, ignore_index=True)
+        self._frames = []
+        # Built here, so the store can keep it without a copy.
+        artifact = self._store._keep(self._run_id, df, "table")
+        return ArtifactRef(
+            id=artifact.id, type=artifact.type, row_count=artifact.original_row_count
+        )
 
-class InMemoryArtifactStore(ArtifactStorePort):
-    """In-memory artifact store scoped by run_id with TTL eviction."""
+    def abort(self) -> None:
+        self._frames = []
 
-    def __init__(self, ttl_minutes: int = 30):
-        self._store: dict[str, Artifact] = {}
+
+class InMemoryArtifactStore(ArtifactStorePort):
+    """
+    In-memory artifact store scoped by run_id with TTL eviction.
+
+    Artifacts are indexed per run, so lookups and listings only touch the
+    run's own artifacts. Expiry times sit in a min-heap: cleanup pops only
+    what has expired (amortized O(log n) per artifact). Cleanup runs on
+    every store/list call, or, with ``sweep_interval_seconds``, from a
+    background task started by ``start()`` instead.
+
+    Memory is bounded by ``max_bytes`` overall and ``max_run_bytes`` per
+    run (0 = unbounded): storing past either evicts the least recently
+    used artifacts (the run's own first for its quota), and an artifact
+    that cannot fit even then raises ``ArtifactTooLargeError``.
+
+    With ``export_path`` set, ``get_download`` links to the app's streaming
+    export route instead of leaving the client to build the file.
+    """
+
+    def __init__(
+        self,
+        ttl_minutes: int = 30,
+        *,
+        sweep_interval_seconds: float = 0.0,
+        max_bytes: int = 0,
+        max_run_bytes: int = 0,
+        export_path: str | None = None,
+        export_gzip: bool = False,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        self._runs: dict[str, dict[str, Artifact]] = {}
+        self._expiry: list[tuple[datetime, str, str]] = []
+        # (run_id, artifact_id) -> estimated bytes, least recently used first
+        self._lru: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._run_bytes: dict[str, int] = {}
+        self._bytes_held = 0
+        self._max_bytes = max_bytes
+        self._max_run_bytes = max_run_bytes
+        self._export_path = export_path
+        self._export_gzip = export_gzip
+        self._evicted_artifacts = 0
+        self._evicted_bytes = 0
+        self._rejected_artifacts = 0
         self._ttl = timedelta(minutes=ttl_minutes)
         self._run_counters: dict[str, int] = {}
-
-    @staticmethod
-    def _composite_key(run_id: str, artifact_id: str) -> str:
-        return f"{run_id}::{artifact_id}"
+        self._clock = clock
+        self._sweep_interval = sweep_interval_seconds
+        self._sweeper: asyncio.Task[None] | None = None
 
     def _generate_artifact_id(self, run_id: str) -> str:
         counter = self._run_counters.get(run_id, 0) + 1
@@ -38,34 +176,78 @@ class InMemoryArtifactStore(ArtifactStorePort):
         run_prefix = run_id[:8] if run_id else "unknown"
         return f"a_{run_prefix}_{counter}"
 
-    @staticmethod
-    def _serialize_dataframe(df: pd.DataFrame) -> pd.DataFrame:
-        df_serializable = df.copy()
-        for col in df_serializable.columns:
-            if pd.api.types.is_datetime64_any_dtype(df_serializable[col]):
-                df_serializable[col] = df_serializable[col].astype(str)
-        return df_serializable
+    def _check_fits(self, run_id: str, nbytes: int) -> None:
+        """Raise ``ArtifactTooLargeError`` if ``nbytes`` exceeds a limit."""
+        for limit, scope in (
+            (self._max_run_bytes, "per-run quota"),
+            (self._max_bytes, "memory budget"),
+        ):
+            if limit and nbytes > limit:
+                self._rejected_artifacts += 1
+                logger.warning(
+                    "artifact_rejected", run_id=run_id, nbytes=nbytes, limit=limit
+                )
+                raise ArtifactTooLargeError(
+                    f"Result of {nbytes} bytes exceeds the artifact {scope} "
+                    f"of {limit} bytes; narrow the query or lower its LIMIT."
+                )
+
+    def _make_room(self, run_id: str, nbytes: int) -> None:
+        if self._max_run_bytes:
+            while self._run_bytes.get(run_id, 0) + nbytes > self._max_run_bytes:
+                # Each run's dict is kept in its own recency order.
+                self._evict((run_id, next(iter(self._runs[run_id]))))
+        if self._max_bytes:
+            while self._bytes_held + nbytes > self._max_bytes:
+                self._evict(next(iter(self._lru)))
+
+    def _evict(self, key: tuple[str, str]) -> None:
+        nbytes = self._lru[key]
+        self._remove(*key)
+        self._evicted_artifacts += 1
+        self._evicted_bytes += nbytes
+        logger.info(
+            "artifact_evicted", run_id=key[0], artifact_id=key[1], nbytes=nbytes
+        )
 
     def store(self, run_id: str, df: pd.DataFrame, type: str = "table") -> Artifact:
-        self._cleanup_expired()
+        return self._keep(run_id, df, type, owned=False)
+
+    def _keep(
+        self, run_id: str, df: pd.DataFrame, type: str, *, owned: bool = True
+    ) -> Artifact:
+        """
+        Store ``df``, deep-copied unless ``owned`` (a frame nobody else
+        holds, such as one built by a table writer).
+        """
+        self._cleanup_on_access()
+
+        nbytes = _frame_nbytes(df)
+        self._check_fits(run_id, nbytes)
+        self._make_room(run_id, nbytes)
 
         artifact_id = self._generate_artifact_id(run_id)
-        df_serializable = self._serialize_dataframe(df)
-        rows = df_serializable.to_dict(orient="records")
-        columns = list(df_serializable.columns)
         artifact = Artifact(
             id=artifact_id,
             type=type,
             run_id=run_id,
-            dataframe=df,
-            rows=rows,
-            columns=columns,
+            # Later changes to a caller's frame must not reach the store.
+            dataframe=df if owned else df.copy(),
+            columns=list(df.columns),
             original_row_count=len(df),
+            created_at=self._clock(),
+        )
+        self._runs.setdefault(run_id, {})[artifact_id] = artifact
+        self._lru[(run_id, artifact_id)] = nbytes
+        self._run_bytes[run_id] = self._run_bytes.get(run_id, 0) + nbytes
+        self._bytes_held += nbytes
+        heapq.heappush(
+            self._expiry, (artifact.created_at + self._ttl, run_id, artifact_id)
         )
-        self._store[self._composite_key(run_id, artifact_id)] = artifact
         return artifact
 
-    def store_table(self, run_id: str, df: pd.DataFrame) -> ArtifactRef:
+    def store_table(self, run_id: str, table: TableData) -> ArtifactRef:
+        df = table.to_dataframe() if isinstance(table, ColumnarTable) else table
         artifact = self.store(run_id, df, type="table")
         return ArtifactRef(
             id=artifact.id,
@@ -73,18 +255,22 @@ class InMemoryArtifactStore(ArtifactStorePort):
             row_count=artifact.original_row_count,
         )
 
-    def get(self, run_id: str, artifact_id: str) -> Artifact | None:
-        self._cleanup_expired()
+    def open_table(self, run_id: str, columns: list[str]) -> TableWriter:
+        return _InMemoryTableWriter(self, run_id, columns)
 
-        key = self._composite_key(run_id, artifact_id)
-        artifact = self._store.get(key)
+    def get(self, run_id: str, artifact_id: str) -> Artifact | None:
+        artifacts = self._runs.get(run_id)
+        artifact = artifacts.get(artifact_id) if artifacts is not None else None
         if artifact is None:
             return None
 
-        if datetime.now() - artifact.created_at > self._ttl:
-            del self._store[key]
+        if self._clock() - artifact.created_at > self._ttl:
+            # Its heap entry is discarded when popped.
+            self._remove(run_id, artifact_id)
             return None
 
+        self._lru.move_to_end((run_id, artifact_id))
+        artifacts[artifact_id] = artifacts.pop(artifact_id)
         return artifact
 
     def get_metadata(self, run_id: str, artifact_id: str) -> ArtifactRef | None:
@@ -97,54 +283,116 @@ class InMemoryArtifactStore(ArtifactStorePort):
             row_count=artifact.original_row_count,
         )
 
-    def get_preview(self, run_id: str, artifact_id: str) -> ArtifactPreview | None:
+    def get_preview(
+        self,
+        run_id: str,
+        artifact_id: str,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        columns: list[str] | None = None,
+    ) -> ArtifactPreview | None:
         artifact = self.get(run_id, artifact_id)
         if artifact is None:
             return None
-        rows = artifact.rows
+        df = artifact.dataframe
+        selected = select_columns(artifact.columns, columns)
+        if columns is not None:
+            df = df[selected]
+        start, end, next_offset = page_bounds(len(df), offset, limit)
+        rows = to_rows(df, start, end)
         return ArtifactPreview(
             rows=rows,
-            columns=artifact.columns,
+            columns=selected,
             original_row_count=artifact.original_row_count,
             exported_row_count=len(rows),
+            offset=start,
+            total_row_count=len(df),
+            next_offset=next_offset,
         )
 
     def get_download(self, run_id: str, artifact_id: str) -> ArtifactDownload | None:
-        return None
+        """Link to the streaming ``/api/export`` route, valid for the TTL left."""
+        if self._export_path is None:
+            return None
+        artifact = self.get(run_id, artifact_id)
+        if artifact is None:
+            return None
+        remaining = artifact.created_at + self._ttl - self._clock()
+        url = f"{self._export_path}/{quote(run_id, safe='')}/{quote(artifact_id)}"
+        url += "?format=csv&gzip=true" if self._export_gzip else "?format=csv"
+        return ArtifactDownload(
+            url=url, expires_in_seconds=max(int(remaining.total_seconds()), 0)
+        )
 
     def get_dataframe(self, run_id: str, artifact_id: str) -> pd.DataFrame | None:
+        """
+        Zero-copy view of the stored table. Treat it as read-only: adding or
+        dropping columns is fine, but editing values in place may change the
+        stored artifact.
+        """
         artifact = self.get(run_id, artifact_id)
         if artifact is None:
             return None
-        if artifact.dataframe is not None:
-            return artifact.dataframe
-        if not artifact.rows:
-            return pd.DataFrame(columns=artifact.columns)
-        return pd.DataFrame(artifact.rows, columns=artifact.columns)
+        return artifact.dataframe.copy(deep=False)
 
     def list_artifacts(self, run_id: str) -> list[str]:
-        self._cleanup_expired()
-        prefix = f"{run_id}::"
-        return [
-            key.split("::", 1)[1]
-            for key in self._store.keys()
-            if key.startswith(prefix)
-        ]
+        self._cleanup_on_access()
+        return list(self._runs.get(run_id, ()))
 
     def cleanup_expired(self) -> int:
         """Remove expired entries from the store."""
         return self._cleanup_expired()
 
+    def _cleanup_on_access(self) -> None:
+        if self._sweeper is None:
+            self._cleanup_expired()
+
     def _cleanup_expired(self) -> int:
-        now = datetime.now()
-        expired = [
-            key
-            for key, artifact in self._store.items()
-            if now - artifact.created_at > self._ttl
-        ]
-        for key in expired:
-            del self._store[key]
-        return len(expired)
+        now = self._clock()
+        removed = 0
+        while self._expiry and self._expiry[0][0] < now:
+            _, run_id, artifact_id = heapq.heappop(self._expiry)
+            if self._remove(run_id, artifact_id):
+                removed += 1
+        return removed
+
+    def _remove(self, run_id: str, artifact_id: str) -> bool:
+        artifacts = self._runs.get(run_id)
+        if artifacts is None or artifacts.pop(artifact_id, None) is None:
+            return False
+        nbytes = self._lru.pop((run_id, artifact_id))
+        self._bytes_held -= nbytes
+        if not artifacts:
+            del self._runs[run_id]
+            del self._run_bytes[run_id]
+        else:
+            self._run_bytes[run_id] -= nbytes
+        return True
+
+    def stats(self) -> ArtifactStoreStats:
+        return ArtifactStoreStats(
+            artifacts=len(self._lru),
+            runs=len(self._runs),
+            bytes_held=self._bytes_held,
+            evicted_artifacts=self._evicted_artifacts,
+            evicted_bytes=self._evicted_bytes,
+            rejected_artifacts=self._rejected_artifacts,
+        )
+
+    async def start(self) -> None:
+        if self._sweep_interval > 0 and self._sweeper is None:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            self._cleanup_expired()
 
 
 _artifact_store: ArtifactStorePort | None = None
@@ -160,7 +408,12 @@ def get_artifact_store() -> ArtifactStorePort:
     backend = settings.artifact_store_backend
     if backend == "memory":
         _artifact_store = InMemoryArtifactStore(
-            ttl_minutes=settings.csv_data_ttl_minutes
+            ttl_minutes=settings.csv_data_ttl_minutes,
+            sweep_interval_seconds=settings.artifact_store_sweep_interval_seconds,
+            max_bytes=settings.artifact_store_max_bytes,
+            max_run_bytes=settings.artifact_store_max_run_bytes,
+            export_path="/api/export",
+            export_gzip=settings.artifact_export_gzip,
         )
         return _artifact_store
     elif backend == "s3":
@@ -0,0 +1,345 @@
+"""
+Continuation broker backends.
+
+Payloads are queued per run in shared storage and popped atomically by the
+process that holds the run's stream, so each payload is delivered at most
+once however many workers receive the notification. Notification listeners
+check their connection while idle and reconnect with backoff when it drops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import defaultdict, deque
+from collections.abc import Callable
+from typing import Any
+
+import asyncpg
+
+from ..logging import get_logger
+from ..ports import ContinuationBrokerPort
+
+logger = get_logger(__name__)
+
+CONTINUATION_CHANNEL = "continuations"
+
+
+def _next_delay(delay: float, max_delay: float) -> float:
+    return min(delay * 2, max_delay)
+
+
+class RedisContinuationBroker(ContinuationBrokerPort):
+    """Redis lists as per-run mailboxes; pub/sub carries the notifications."""
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        ttl_seconds: int = 900,
+        key_prefix: str = "continuation:",
+        health_check_seconds: float = 15.0,
+        reconnect_delay_seconds: float = 0.5,
+        max_reconnect_delay_seconds: float = 30.0,
+        client=None,
+    ) -> None:
+        if client is None:
+            try:
+                from redis.asyncio import from_url
+            except ImportError as exc:
+                raise RuntimeError(
+                    "redis is required for the redis continuation backend."
+                ) from exc
+            client = from_url(url)
+        self._redis = client
+        self._ttl = ttl_seconds
+        self._prefix = key_prefix
+        self._health_check = health_check_seconds
+        self._reconnect_delay = reconnect_delay_seconds
+        self._max_reconnect_delay = max_reconnect_delay_seconds
+        self._pubsub = None
+        self._reader: asyncio.Task[None] | None = None
+        self._reconnected = False
+
+    def _key(self, run_id: str) -> str:
+        return f"{self._prefix}{run_id}"
+
+    async def publish(self, run_id: str, payload: dict[str, Any]) -> None:
+        key = self._key(run_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, json.dumps(payload))
+            pipe.expire(key, self._ttl)
+            pipe.publish(CONTINUATION_CHANNEL, run_id)
+            await pipe.execute()
+
+    async def claim(self, run_id: str) -> dict[str, Any] | None:
+        raw = await self._redis.lpop(self._key(run_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def _subscribe(self) -> None:
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(CONTINUATION_CHANNEL)
+        # redis-py reconnects and re-subscribes a dropped pub/sub connection
+        # on its next read; notifications sent meanwhile are gone.
+        self._pubsub.connection.register_connect_callback(self._on_connect)
+
+    def _on_connect(self, _connection) -> None:
+        self._reconnected = True
+
+    async def _unsubscribe(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    async def listen(
+        self,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None] | None = None,
+    ) -> None:
+        await self._subscribe()
+        self._reader = asyncio.get_running_loop().create_task(
+            self._read(on_notify, on_reconnect)
+        )
+
+    async def _read(
+        self,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None] | None,
+    ) -> None:
+        delay = self._reconnect_delay
+        while True:
+            try:
+                if self._pubsub is None:
+                    await self._subscribe()
+                    self._reconnected = True
+                message = await self._pubsub.get_message(timeout=self._health_check)
+                if message is None:
+                    # Idle: a dead connection only shows up when used.
+                    await self._pubsub.ping()
+                elif message["type"] == "message":
+                    data = message["data"]
+                    on_notify(data.decode("utf-8") if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "continuation_listener_lost",
+                    backend="redis",
+                    error=repr(exc),
+                    retry_in_seconds=delay,
+                )
+                await self._unsubscribe()
+                await asyncio.sleep(delay)
+                delay = _next_delay(delay, self._max_reconnect_delay)
+                continue
+            if self._reconnected:
+                self._reconnected = False
+                delay = self._reconnect_delay
+                logger.info("continuation_listener_reconnected", backend="redis")
+                if on_reconnect is not None:
+                    on_reconnect()
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        await self._unsubscribe()
+        await self._redis.aclose()
+
+
+class PostgresContinuationBroker(ContinuationBrokerPort):
+    """
+    Rows in ``continuation_payloads`` as mailboxes (see db migration 2);
+    LISTEN/NOTIFY carries the notifications.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        *,
+        pool_factory: Callable[[], asyncpg.Pool],
+        ttl_seconds: int = 900,
+        health_check_seconds: float = 15.0,
+        reconnect_delay_seconds: float = 0.5,
+        max_reconnect_delay_seconds: float = 30.0,
+    ) -> None:
+        self._dsn = dsn
+        self._pool_factory = pool_factory
+        self._ttl = ttl_seconds
+        self._health_check = health_check_seconds
+        self._reconnect_delay = reconnect_delay_seconds
+        self._max_reconnect_delay = max_reconnect_delay_seconds
+        self._listener: asyncpg.Connection | None = None
+        self._supervisor: asyncio.Task[None] | None = None
+        self._lost = asyncio.Event()
+
+    async def publish(self, run_id: str, payload: dict[str, Any]) -> None:
+        async with self._pool_factory().acquire() as conn:
+            await conn.execute(
+                """
+                WITH expired AS (
+                    DELETE FROM continuation_payloads
+                    WHERE created_at < now() - make_interval(secs => $3)
+                ), inserted AS (
+                    INSERT INTO continuation_payloads (run_id, payload)
+                    VALUES ($1, $2::jsonb)
+                    RETURNING run_id
+                )
+                SELECT pg_notify($4, run_id) FROM inserted
+                """,
+                run_id,
+                json.dumps(payload),
+                float(self._ttl),
+                CONTINUATION_CHANNEL,
+            )
+
+    async def claim(self, run_id: str) -> dict[str, Any] | None:
+        async with self._pool_factory().acquire() as conn:
+            raw = await conn.fetchval(
+                """
+                DELETE FROM continuation_payloads
+                WHERE id = (
+                    SELECT id FROM continuation_payloads
+                    WHERE run_id = $1
+                      AND created_at >= now() - make_interval(secs => $2)
+                    ORDER BY id
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING payload
+                """,
+                run_id,
+                float(self._ttl),
+            )
+        return json.loads(raw) if raw is not None else None
+
+    async def _connect(self, on_notify: Callable[[str], None]) -> None:
+        # LISTEN needs a connection of its own for the process lifetime.
+        conn = await asyncpg.connect(self._dsn)
+        try:
+            await conn.add_listener(
+                CONTINUATION_CHANNEL,
+                lambda _conn, _pid, _channel, run_id: on_notify(run_id),
+            )
+        except BaseException:
+            conn.terminate()
+            raise
+        self._lost.clear()
+        conn.add_termination_listener(self._on_terminated)
+        self._listener = conn
+
+    def _on_terminated(self, conn: asyncpg.Connection) -> None:
+        if conn is self._listener:
+            self._lost.set()
+
+    async def listen(
+        self,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None] | None = None,
+    ) -> None:
+        await self._connect(on_notify)
+        self._supervisor = asyncio.get_running_loop().create_task(
+            self._supervise(on_notify, on_reconnect)
+        )
+
+    async def _supervise(
+        self,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None] | None,
+    ) -> None:
+        """Ping the LISTEN connection while idle; reconnect when it is lost."""
+        while True:
+            try:
+                await asyncio.wait_for(self._lost.wait(), self._health_check)
+                error = "connection terminated"
+            except TimeoutError:
+                try:
+                    await self._listener.execute("SELECT 1", timeout=self._health_check)
+                    continue
+                except Exception as exc:
+                    error = repr(exc)
+            conn, self._listener = self._listener, None
+            if conn is not None:
+                conn.terminate()
+            delay = self._reconnect_delay
+            while True:
+                logger.warning(
+                    "continuation_listener_lost",
+                    backend="postgres",
+                    error=error,
+                    retry_in_seconds=delay,
+                )
+                await asyncio.sleep(delay)
+                try:
+                    await self._connect(on_notify)
+                    break
+                except Exception as exc:
+                    error = repr(exc)
+                    delay = _next_delay(delay, self._max_reconnect_delay)
+            logger.info("continuation_listener_reconnected", backend="postgres")
+            if on_reconnect is not None:
+                on_reconnect()
+
+    async def close(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        if self._listener is not None:
+            conn, self._listener = self._listener, None
+            await conn.close()
+
+
+class FakeContinuationBroker(ContinuationBrokerPort):
+    """
+    In-process broker for tests: hubs sharing one instance behave like
+    workers sharing a Redis or Postgres backend.
+    """
+
+    def __init__(self) -> None:
+        self._queues: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        self._listeners: list[Callable[[str], None]] = []
+        self._reconnect_listeners: list[Callable[[], None]] = []
+        self.connected = True
+
+    async def publish(self, run_id: str, payload: dict[str, Any]) -> None:
+        self._queues[run_id].append(payload)
+        if not self.connected:
+            # Like a dropped LISTEN connection: the notification is lost.
+            return
+        loop = asyncio.get_running_loop()
+        for on_notify in self._listeners:
+            loop.call_soon(on_notify, run_id)
+
+    async def claim(self, run_id: str) -> dict[str, Any] | None:
+        queue = self._queues.get(run_id)
+        if not queue:
+            return None
+        payload = queue.popleft()
+        if not queue:
+            del self._queues[run_id]
+        return payload
+
+    async def listen(
+        self,
+        on_notify: Callable[[str], None],
+        on_reconnect: Callable[[], None] | None = None,
+    ) -> None:
+        self._listeners.append(on_notify)
+        if on_reconnect is not None:
+            self._reconnect_listeners.append(on_reconnect)
+
+    async def close(self) -> None:
+        self._listeners.clear()
+        self._reconnect_listeners.clear()
+
+    def reconnect(self) -> None:
+        """End a simulated outage (``connected = False``) like a listener would."""
+        self.connected = True
+        for on_reconnect in self._reconnect_listeners:
+            on_reconnect()
+
+    def queued(self, run_id: str) -> int:
+        return len(self._queues.get(run_id, ()))
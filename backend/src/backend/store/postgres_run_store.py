@@ -0,0 +1,344 @@
+"""
+PostgreSQL-backed run store.
+
+Pending actions are rows of ``run_pending_actions`` keyed by
+``(run_id, tool_call_id, kind)`` (see db migration 3); pops are a single
+``DELETE ... RETURNING`` so an action is resumed by exactly one worker.
+As in the redis store, a run expires ``ttl_seconds`` after its last write
+(``updated_at`` in ``run_states``) together with all of its pending actions;
+expired rows are ignored by reads, reset by the next write to the run and
+removed in batches by a background sweeper.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Callable
+
+import asyncpg
+
+from ..db import RUN_STORE_SCHEMA
+from ..domain.models import PendingAction, RunState
+from ..logging import get_logger
+from ..ports import RunStorePort
+
+logger = get_logger(__name__)
+
+# Single-byte codes stored in the "char" kind column
+_KIND_CODES = {"approval": "a", "client_tool": "c"}
+_KINDS = {code: kind for kind, code in _KIND_CODES.items()}
+
+_ACTION_COLUMNS = (
+    "tool_call_id, kind, tool_name, tool_input, invocation_id, "
+    "adk_confirmation_call_id, created_at"
+)
+
+
+def _live_run(ttl_param: str) -> str:
+    """SQL condition: run ``$1`` was written within the TTL bound to ``ttl_param``."""
+    return f"""EXISTS (
+        SELECT 1 FROM run_states
+        WHERE run_states.run_id = $1
+          AND run_states.updated_at >= now() - make_interval(secs => {ttl_param})
+    )"""
+
+
+def _row_to_action(row: asyncpg.Record) -> PendingAction:
+    tool_input = row["tool_input"]
+    return PendingAction(
+        kind=_KINDS[row["kind"]],
+        tool_call_id=row["tool_call_id"],
+        tool_name=row["tool_name"],
+        tool_input=json.loads(tool_input) if tool_input is not None else None,
+        invocation_id=row["invocation_id"],
+        adk_confirmation_call_id=row["adk_confirmation_call_id"],
+        # The domain model uses naive local times.
+        created_at=row["created_at"].astimezone().replace(tzinfo=None),
+    )
+
+
+class PostgresRunStore(RunStorePort):
+    """
+    Durable run state on the app database (``pool_factory``, usually the
+    shared pool) or on a database of its own (``dsn``).
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_factory: Callable[[], asyncpg.Pool] | None = None,
+        dsn: str | None = None,
+        ttl_seconds: int = 86400,
+        sweep_interval_seconds: float = 60.0,
+        sweep_batch_size: int = 1000,
+    ) -> None:
+        if (pool_factory is None) == (dsn is None):
+            raise ValueError("Pass exactly one of pool_factory or dsn.")
+        self._pool_factory = pool_factory
+        self._dsn = dsn
+        self._own_pool: asyncpg.Pool | None = None
+        self._ttl = float(ttl_seconds)
+        self._sweep_interval = sweep_interval_seconds
+        self._sweep_batch = sweep_batch_size
+        self._sweeper: asyncio.Task[None] | None = None
+
+    def _pool(self) -> asyncpg.Pool:
+        if self._pool_factory is not None:
+            return self._pool_factory()
+        if self._own_pool is None:
+            raise RuntimeError("PostgresRunStore is not started. Call start().")
+        return self._own_pool
+
+    async def start(self) -> None:
+        if self._dsn is not None and self._own_pool is None:
+            self._own_pool = await asyncpg.create_pool(self._dsn, min_size=1)
+            # A separate database is not covered by `backend-db migrate`.
+            async with self._own_pool.acquire() as conn:
+                await conn.execute(RUN_STORE_SCHEMA)
+        if self._sweep_interval > 0 and self._sweeper is None:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        if self._own_pool is not None:
+            pool, self._own_pool = self._own_pool, None
+            await pool.close()
+
+    async def _touch(self, conn: asyncpg.Connection, run_id: str) -> str | None:
+        """
+        Create the run or refresh its ``updated_at``; a run past its TTL
+        starts over without its old invocation id and pending actions.
+        Call inside a transaction. Returns the run's invocation id.
+        """
+        expired = await conn.fetchval(
+            """
+            SELECT updated_at < now() - make_interval(secs => $2)
+            FROM run_states WHERE run_id = $1
+            FOR UPDATE
+            """,
+            run_id,
+            self._ttl,
+        )
+        if expired:
+            await conn.execute(
+                "DELETE FROM run_pending_actions WHERE run_id = $1", run_id
+            )
+        return await conn.fetchval(
+            """
+            INSERT INTO run_states (run_id) VALUES ($1)
+            ON CONFLICT (run_id) DO UPDATE SET
+                invocation_id = CASE WHEN $2::boolean THEN NULL
+                                     ELSE run_states.invocation_id END,
+                updated_at = now()
+            RETURNING invocation_id
+            """,
+            run_id,
+            bool(expired),
+        )
+
+    async def _load(
+        self, conn: asyncpg.Connection, run_id: str, invocation_id: str | None
+    ) -> RunState:
+        rows = await conn.fetch(
+            f"""
+            SELECT {_ACTION_COLUMNS} FROM run_pending_actions
+            WHERE run_id = $1 AND {_live_run("$2")}
+            ORDER BY created_at
+            """,
+            run_id,
+            self._ttl,
+        )
+        state = RunState(run_id=run_id, session_id=run_id, invocation_id=invocation_id)
+        for row in rows:
+            action = _row_to_action(row)
+            if action.kind == "approval":
+                state.pending_approvals[action.tool_call_id] = action
+            else:
+                state.pending_client_tools[action.tool_call_id] = action
+        return state
+
+    async def get_or_create(self, run_id: str) -> RunState:
+        async with self._pool().acquire() as conn, conn.transaction():
+            invocation_id = await self._touch(conn, run_id)
+            return await self._load(conn, run_id, invocation_id)
+
+    async def get(self, run_id: str) -> RunState | None:
+        async with self._pool().acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT invocation_id FROM run_states
+                WHERE run_id = $1 AND updated_at >= now() - make_interval(secs => $2)
+                """,
+                run_id,
+                self._ttl,
+            )
+            if row is None:
+                return None
+            return await self._load(conn, run_id, row["invocation_id"])
+
+    async def set_invocation_id(self, run_id: str, invocation_id: str) -> None:
+        async with self._pool().acquire() as conn, conn.transaction():
+            await self._touch(conn, run_id)
+            await conn.execute(
+                "UPDATE run_states SET invocation_id = $2 WHERE run_id = $1",
+                run_id,
+                invocation_id,
+            )
+
+    async def _add(self, run_id: str, action: PendingAction) -> None:
+        async with self._pool().acquire() as conn, conn.transaction():
+            await self._touch(conn, run_id)
+            await conn.execute(
+                """
+                INSERT INTO run_pending_actions (
+                    run_id, tool_call_id, kind, tool_name, tool_input,
+                    invocation_id, adk_confirmation_call_id, created_at
+                )
+                VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7, $8)
+                ON CONFLICT (run_id, tool_call_id, kind) DO UPDATE SET
+                    tool_name = EXCLUDED.tool_name,
+                    tool_input = EXCLUDED.tool_input,
+                    invocation_id = EXCLUDED.invocation_id,
+                    adk_confirmation_call_id = EXCLUDED.adk_confirmation_call_id,
+                    created_at = EXCLUDED.created_at
+                """,
+                run_id,
+                action.tool_call_id,
+                _KIND_CODES[action.kind],
+                action.tool_name,
+                json.dumps(action.tool_input)
+                if action.tool_input is not None
+                else None,
+                action.invocation_id,
+                action.adk_confirmation_call_id,
+                action.created_at.astimezone(),
+            )
+
+    async def add_pending_approval(self, run_id: str, action: PendingAction) -> None:
+        await self._add(run_id, action)
+
+    async def add_pending_client_tool(self, run_id: str, action: PendingAction) -> None:
+        await self._add(run_id, action)
+
+    async def _get_pending(
+        self, run_id: str, tool_call_id: str, kind: str
+    ) -> PendingAction | None:
+        async with self._pool().acquire() as conn:
+            row = await conn.fetchrow(
+                f"""
+                SELECT {_ACTION_COLUMNS} FROM run_pending_actions
+                WHERE run_id = $1 AND tool_call_id = $2 AND kind = $3
+                  AND {_live_run("$4")}
+                """,
+                run_id,
+                tool_call_id,
+                _KIND_CODES[kind],
+                self._ttl,
+            )
+        return _row_to_action(row) if row is not None else None
+
+    async def get_pending_approval(
+        self, run_id: str, tool_call_id: str
+    ) -> PendingAction | None:
+        return await self._get_pending(run_id, tool_call_id, "approval")
+
+    async def get_pending_client_tool(
+        self, run_id: str, tool_call_id: str
+    ) -> PendingAction | None:
+        return await self._get_pending(run_id, tool_call_id, "client_tool")
+
+    async def _pop(
+        self, run_id: str, tool_call_id: str, kind: str
+    ) -> PendingAction | None:
+        async with self._pool().acquire() as conn:
+            row = await conn.fetchrow(
+                f"""
+                DELETE FROM run_pending_actions
+                WHERE run_id = $1 AND tool_call_id = $2 AND kind = $3
+                  AND {_live_run("$4")}
+                RETURNING {_ACTION_COLUMNS}
+                """,
+                run_id,
+                tool_call_id,
+                _KIND_CODES[kind],
+                self._ttl,
+            )
+        return _row_to_action(row) if row is not None else None
+
+    async def pop_pending_approval(
+        self, run_id: str, tool_call_id: str
+    ) -> PendingAction | None:
+        return await self._pop(run_id, tool_call_id, "approval")
+
+    async def pop_pending_client_tool(
+        self, run_id: str, tool_call_id: str
+    ) -> PendingAction | None:
+        return await self._pop(run_id, tool_call_id, "client_tool")
+
+    async def has_pending(self, run_id: str) -> bool:
+        async with self._pool().acquire() as conn:
+            return await conn.fetchval(
+                f"""
+                SELECT {_live_run("$2")} AND EXISTS (
+                    SELECT 1 FROM run_pending_actions WHERE run_id = $1
+                )
+                """,
+                run_id,
+                self._ttl,
+            )
+
+    async def sweep(self) -> int:
+        """
+        Delete expired rows ``sweep_batch_size`` at a time, so a large
+        backlog never holds long locks; returns the number deleted.
+        Pending actions go first, so a run is never removed before them.
+        """
+        deleted = 0
+        for table, expired in (
+            (
+                "run_pending_actions",
+                """NOT EXISTS (
+                    SELECT 1 FROM run_states
+                    WHERE run_states.run_id = run_pending_actions.run_id
+                      AND run_states.updated_at >= now() - make_interval(secs => $1)
+                )""",
+            ),
+            ("run_states", "updated_at < now() - make_interval(secs => $1)"),
+        ):
+            while True:
+                async with self._pool().acquire() as conn:
+                    count = await conn.fetchval(
+                        f"""
+                        WITH expired AS (
+                            DELETE FROM {table}
+                            WHERE ctid = ANY(ARRAY(
+                                SELECT ctid FROM {table}
+                                WHERE {expired}
+                                LIMIT $2
+                                FOR UPDATE SKIP LOCKED
+                            ))
+                            RETURNING 1
+                        )
+                        SELECT count(*) FROM expired
+                        """,
+                        self._ttl,
+                        self._sweep_batch,
+                    )
+                deleted += count
+                if count < self._sweep_batch:
+                    break
+        return deleted
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            try:
+                deleted = await self.sweep()
+            except Exception:
+                logger.exception("run_store_sweep_failed")
+                continue
+            if deleted:
+                logger.info("run_store_swept", deleted=deleted)
@@ -0,0 +1,174 @@
+"""
+Redis-backed run store.
+
+Each run is a hash (``run_id``, ``session_id``, ``invocation_id``) plus one
+hash per pending kind mapping ``tool_call_id`` to the JSON-encoded action.
+Every write refreshes the TTL of all three keys, and pops run HGET + HDEL in
+one MULTI/EXEC so an action is handed to exactly one worker.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any
+
+from ..domain.models import PendingAction, RunState
+from ..ports import RunStorePort
+
+_APPROVALS = "approvals"
+_CLIENT_TOOLS = "client_tools"
+
+
+def _dump_action(action: PendingAction) -> str:
+    return json.dumps(
+        {
+            "kind": action.kind,
+            "tool_call_id": action.tool_call_id,
+            "tool_name": action.tool_name,
+            "tool_input": action.tool_input,
+            "invocation_id": action.invocation_id,
+            "adk_confirmation_call_id": action.adk_confirmation_call_id,
+            "created_at": action.created_at.isoformat(),
+        },
+        ensure_ascii=False,
+    )
+
+
+def _load_action(raw: bytes | str) -> PendingAction:
+    data: dict[str, Any] = json.loads(raw)
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    return PendingAction(**data)
+
+
+def _text(value: bytes | str | None) -> str | None:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+class RedisRunStore(RunStorePort):
+    """Run state shared by every worker and surviving their restarts."""
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        ttl_seconds: int = 86400,
+        key_prefix: str = "run:",
+        client=None,
+    ) -> None:
+        if client is None:
+            try:
+                from redis.asyncio import from_url
+            except ImportError as exc:
+                raise RuntimeError(
+                    "redis is required for the redis run store backend."
+                ) from exc
+            client = from_url(url)
+        self._redis = client
+        self._ttl = ttl_seconds
+        self._prefix = key_prefix
+
+    def _keys(self, run_id: str) -> tuple[str, str, str]:
+        base = f"{self._prefix}{run_id}"
+        return base, f"{base}:{_APPROVALS}", f"{base}:{_CLIENT_TOOLS}"
+
+    def _create(self, pipe, run_id: str) -> None:
+        """Queue commands creating the run hash if missing and refreshing TTLs."""
+        keys = self._keys(run_id)
+        pipe.hsetnx(keys[0], "run_id", run_id)
+        pipe.hsetnx(keys[0], "session_id", run_id)
+        for key in keys:
+            pipe.expire(key, self._ttl)
+
+    async def get_or_create(self, run_id: str) -> RunState:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            self._create(pipe, run_id)
+            await pipe.execute()
+        state = await self.get(run_id)
+        assert state is not None
+        return state
+
+    async def get(self, run_id: str) -> RunState | None:
+        base, approvals_key, client_tools_key = self._keys(run_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(base)
+            pipe.hgetall(approvals_key)
+            pipe.hgetall(client_tools_key)
+            fields, approvals, client_tools = await pipe.execute()
+        if not fields:
+            return None
+        fields = {_text(key): _text(value) for key, value in fields.items()}
+        return RunState(
+            run_id=fields.get("run_id") or run_id,
+            session_id=fields.get("session_id") or run_id,
+            invocation_id=fields.get("invocation_id"),
+            pending_approvals={
+                _text(key): _load_action(value) for key, value in approvals.items()
+            },
+            pending_client_tools={
+                _text(key): _load_action(value) for key, value in client_tools.items()
+            },
+        )
+
+    async def set_invocation_id(self, run_id: str, invocation_id: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            self._create(pipe, run_id)
+            pipe.hset(self._keys(run_id)[0], "invocation_id", invocation_id)
+            await pipe.execute()
+
+    async def _add(self, run_id: str, kind_key: str, action: PendingAction) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(kind_key, action.tool_call_id, _dump_action(action))
+            self._create(pipe, run_id)
+            await pipe.execute()
+
+    async def add_pending_approval(self, run_id: str, action: PendingAction) -> None:
+        await self._add(run_id, self._keys(run_id)[1], action)
+
+    async def add_pending_client_tool(self, run_id: str, action: PendingAction) -> None:
+        await self._add(run_id, self._keys(run_id)[2], action)
+
+    async def _get_pending(
+        self, kind_key: str, tool_call_id: str
+    ) -> PendingAction | None:
+        raw = await self._redis.hget(kind_key, tool_call_id)
+        return _load_action(raw) if raw is not None else None
+
+    async def get_pending_approval(
+        self, run_id: str, tool_call_id: str
+    ) -> PendingAction | None:
+        return await self._get_pending(self._keys(run_id)[1], tool_call_id)
+
+    async def get_pending_client_tool(
+        self, run_id: str, tool_call_id: str
+    ) -> PendingAction | None:
+        return await self._get_pending(self._keys(run_id)[2], tool_call_id)
+
+    async def _pop(self, kind_key: str, tool_call_id: str) -> PendingAction | None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hget(kind_key, tool_call_id)
+            pipe.hdel(kind_key, tool_call_id)
+            raw, _ = await pipe.execute()
+        return _load_action(raw) if raw is not None else None
+
+    async def pop_pending_approval(
+        self, run_id: str, tool_call_id: str
+    ) -> PendingAction | None:
+        return await self._pop(self._keys(run_id)[1], tool_call_id)
+
+    async def pop_pending_client_tool(
+        self, run_id: str, tool_call_id: str
+    ) -> PendingAction | None:
+        return await self._pop(self._keys(run_id)[2], tool_call_id)
+
+    async def has_pending(self, run_id: str) -> bool:
+        # Redis drops a hash with its last field, so existence means pending.
+        _, approvals_key, client_tools_key = self._keys(run_id)
+        return bool(await self._redis.exists(approvals_key, client_tools_key))
+
+    async def start(self) -> None: ...
+
+    async def close(self) -> None:
+        await self._redis.aclose()
@@ -4,75 +4,147 @@ Run store backends and factory.
 
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
 from ..domain.models import PendingAction, RunState
+from ..logging import get_logger
 from ..ports import RunStorePort
 from ..settings import get_settings
 
+logger = get_logger(__name__)
 
-class InMemoryRunStore(RunStorePort):
-    def __init__(self) -> None:
-        self._runs: dict[str, RunState] = {}
 
-    def get_or_create(self, run_id: str) -> RunState:
+class InMemoryRunStore(RunStorePort):
+    """
+    Run state in process memory.
+
+    Runs are kept in least-recently-used order; a run not read or written
+    for ``ttl_seconds`` is dropped, and at most ``max_runs`` are kept (the
+    least recently used goes first). ``None`` disables either bound.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float | None = None,
+        max_runs: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._runs: OrderedDict[str, RunState] = OrderedDict()
+        self._ttl = ttl_seconds or None
+        self._max_runs = max_runs or None
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def _lookup(self, run_id: str) -> RunState | None:
+        """Return the live state for ``run_id`` and mark it recently used."""
         state = self._runs.get(run_id)
         if state is None:
-            state = RunState(run_id=run_id, session_id=run_id)
-            self._runs[run_id] = state
+            return None
+        now = self._clock()
+        if self._ttl is not None and now - state.updated_at >= self._ttl:
+            del self._runs[run_id]
+            return None
+        state.updated_at = now
+        self._runs.move_to_end(run_id)
         return state
 
-    def get(self, run_id: str) -> RunState | None:
-        return self._runs.get(run_id)
+    def _get_or_create(self, run_id: str) -> RunState:
+        state = self._lookup(run_id)
+        if state is None:
+            self.prune()
+            state = RunState(run_id=run_id, session_id=run_id, updated_at=self._clock())
+            self._runs[run_id] = state
+            if self._max_runs is not None:
+                while len(self._runs) > self._max_runs:
+                    self._evict_oldest()
+        return state
 
-    def set_invocation_id(self, run_id: str, invocation_id: str) -> None:
-        state = self.get_or_create(run_id)
+    def _evict_oldest(self) -> None:
+        run_id, state = self._runs.popitem(last=False)
+        if state.pending_approvals or state.pending_client_tools:
+            logger.warning(
+                "run_state_evicted",
+                run_id=run_id,
+                pending=len(state.pending_approvals) + len(state.pending_client_tools),
+            )
+
+    def prune(self) -> int:
+        """Drop expired runs; returns the number dropped."""
+        if self._ttl is None:
+            return 0
+        cutoff = self._clock() - self._ttl
+        dropped = 0
+        # Oldest first, so stop at the first run still within its TTL.
+        while self._runs and next(iter(self._runs.values())).updated_at <= cutoff:
+            self._runs.popitem(last=False)
+            dropped += 1
+        return dropped
+
+    async def get_or_create(self, run_id: str) -> RunState:
+        return self._get_or_create(run_id)
+
+    async def get(self, run_id: str) -> RunState | None:
+        return self._lookup(run_id)
+
+    async def set_invocation_id(self, run_id: str, invocation_id: str) -> None:
+        state = self._get_or_create(run_id)
         state.invocation_id = invocation_id
 
-    def add_pending_approval(self, run_id: str, action: PendingAction) -> None:
-        state = self.get_or_create(run_id)
+    async def add_pending_approval(self, run_id: str, action: PendingAction) -> None:
+        state = self._get_or_create(run_id)
         state.pending_approvals[action.tool_call_id] = action
 
-    def add_pending_client_tool(self, run_id: str, action: PendingAction) -> None:
-        state = self.get_or_create(run_id)
+    async def add_pending_client_tool(self, run_id: str, action: PendingAction) -> None:
+        state = self._get_or_create(run_id)
         state.pending_client_tools[action.tool_call_id] = action
 
-    def get_pending_approval(
+    async def get_pending_approval(
         self, run_id: str, tool_call_id: str
     ) -> PendingAction | None:
-        state = self.get(run_id)
+        state = self._lookup(run_id)
         if state is None:
             return None
         return state.pending_approvals.get(tool_call_id)
 
-    def get_pending_client_tool(
+    async def get_pending_client_tool(
         self, run_id: str, tool_call_id: str
     ) -> PendingAction | None:
-        state = self.get(run_id)
+        state = self._lookup(run_id)
         if state is None:
             return None
         return state.pending_client_tools.get(tool_call_id)
 
-    def pop_pending_approval(
+    async def pop_pending_approval(
         self, run_id: str, tool_call_id: str
     ) -> PendingAction | None:
-        state = self.get(run_id)
+        state = self._lookup(run_id)
         if state is None:
             return None
         return state.pending_approvals.pop(tool_call_id, None)
 
-    def pop_pending_client_tool(
+    async def pop_pending_client_tool(
         self, run_id: str, tool_call_id: str
     ) -> PendingAction | None:
-        state = self.get(run_id)
+        state = self._lookup(run_id)
         if state is None:
             return None
         return state.pending_client_tools.pop(tool_call_id, None)
 
-    def has_pending(self, run_id: str) -> bool:
-        state = self.get(run_id)
+    async def has_pending(self, run_id: str) -> bool:
+        state = self._lookup(run_id)
         if state is None:
             return False
         return bool(state.pending_approvals or state.pending_client_tools)
 
+    async def start(self) -> None: ...
+
+    async def close(self) -> None: ...
+
 
 _run_store: RunStorePort | None = None
 
@@ -86,9 +158,36 @@ def get_run_store() -> RunStorePort:
     settings = get_settings()
     backend = settings.run_store_backend
     if backend == "memory":
-        _run_store = InMemoryRunStore()
+        _run_store = InMemoryRunStore(
+            ttl_seconds=settings.run_store_ttl_seconds,
+            max_runs=settings.run_store_max_runs,
+        )
+        return _run_store
+    if backend == "redis":
+        from .redis_run_store import RedisRunStore
+
+        if not settings.redis_url:
+            raise RuntimeError("REDIS_URL is required for the redis run store backend.")
+        _run_store = RedisRunStore(
+            settings.redis_url, ttl_seconds=settings.run_store_ttl_seconds
+        )
+        return _run_store
+    if backend == "postgres":
+        from ..db import get_db_pool
+        from .postgres_run_store import PostgresRunStore
+
+        # Share the app pool unless the run store has a database of its own.
+        dsn = settings.run_store_database_url
+        _run_store = PostgresRunStore(
+            pool_factory=None if dsn else get_db_pool,
+            dsn=str(dsn) if dsn else None,
+            ttl_seconds=settings.run_store_ttl_seconds,
+            sweep_interval_seconds=settings.run_store_sweep_interval_seconds,
+            sweep_batch_size=settings.run_store_sweep_batch_size,
+        )
         return _run_store
 
     raise RuntimeError(
-        f"Unsupported run store backend: {backend}. Only 'memory' is supported."
+        f"Unsupported run store backend: {backend}. "
+        "Use 'memory', 'redis' or 'postgres'."
     )
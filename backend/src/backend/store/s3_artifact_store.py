@@ -6,12 +6,84 @@ from __future__ import annotations
 
 import io
 import json
+import tempfile
 import uuid
+from collections.abc import Sequence
 from typing import Any
 
 import pandas as pd
 
-from ..ports import ArtifactDownload, ArtifactPreview, ArtifactRef, ArtifactStorePort
+from ..ports import (
+    ArtifactDownload,
+    ArtifactPreview,
+    ArtifactRef,
+    ArtifactStorePort,
+    ArtifactStoreStats,
+    ColumnarTable,
+    TableData,
+    TableWriter,
+)
+from .artifact_store import page_bounds, select_columns
+
+# Spill streamed CSV data to disk beyond this many bytes
+_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+class _S3TableWriter(TableWriter):
+    """
+    Streams row batches into a spooled CSV file and keeps only the preview
+    rows in memory; the CSV is uploaded on close. Each batch goes through the
+    same DataFrame serialization as ``store_table``, so values are formatted
+    alike on both paths.
+    """
+
+    def __init__(self, store: S3ArtifactStore, run_id: str, columns: list[str]) -> None:
+        self._store = store
+        self._run_id = run_id
+        self._columns = columns
+        self._artifact_id = store._new_artifact_id(run_id)
+        self._file = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES)
+        self._text = io.TextIOWrapper(self._file, encoding="utf-8", newline="")
+        pd.DataFrame(columns=columns).to_csv(self._text, index=False)
+        self._preview_rows: list[dict[str, Any]] = []
+        self._row_count = 0
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        if not rows:
+            return
+        frame = self._store._serialize_dataframe(
+            pd.DataFrame.from_records(
+                [tuple(row) for row in rows], columns=self._columns
+            )
+        )
+        frame.to_csv(self._text, index=False, header=False)
+        self._row_count += len(frame)
+        remaining = self._store._preview_rows - len(self._preview_rows)
+        if remaining > 0:
+            self._preview_rows.extend(frame.head(remaining).to_dict(orient="records"))
+
+    def close(self) -> ArtifactRef:
+        try:
+            self._text.flush()
+            self._file.seek(0)
+            self._store._client.upload_fileobj(
+                self._file,
+                self._store._bucket,
+                self._store._key(self._run_id, self._artifact_id, "data.csv"),
+                ExtraArgs={"ContentType": "text/csv"},
+            )
+        finally:
+            self._text.close()
+        return self._store._put_table_metadata(
+            self._run_id,
+            self._artifact_id,
+            columns=self._columns,
+            preview_rows=self._preview_rows,
+            row_count=self._row_count,
+        )
+
+    def abort(self) -> None:
+        self._text.close()
 
 
 class S3ArtifactStore(ArtifactStorePort):
@@ -72,8 +144,11 @@ class S3ArtifactStore(ArtifactStorePort):
                 df_serializable[col] = df_serializable[col].astype(str)
         return df_serializable
 
+    def _new_artifact_id(self, run_id: str) -> str:
+        return f"a_{run_id[:8]}_{uuid.uuid4().hex[:8]}"
+
     def _put_json(self, key: str, payload: dict[str, Any]) -> None:
-        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
         self._client.put_object(
             Bucket=self._bucket,
             Key=key,
@@ -93,21 +168,42 @@ class S3ArtifactStore(ArtifactStorePort):
         body = resp["Body"].read().decode("utf-8")
         return json.loads(body)
 
-    def store_table(self, run_id: str, df: pd.DataFrame) -> ArtifactRef:
-        artifact_id = f"a_{run_id[:8]}_{uuid.uuid4().hex[:8]}"
-        df_serializable = self._serialize_dataframe(df)
-
-        preview_df = df_serializable.head(self._preview_rows)
-        preview_rows = preview_df.to_dict(orient="records")
-        columns = list(df_serializable.columns)
-
+    def _put_table_metadata(
+        self,
+        run_id: str,
+        artifact_id: str,
+        *,
+        columns: list[str],
+        preview_rows: list[dict[str, Any]],
+        row_count: int,
+    ) -> ArtifactRef:
         metadata = {
             "id": artifact_id,
             "type": "table",
             "columns": columns,
-            "original_row_count": len(df_serializable),
+            "original_row_count": row_count,
             "exported_row_count": len(preview_rows),
         }
+        self._put_json(
+            self._key(run_id, artifact_id, "preview.json"),
+            {"rows": preview_rows},
+        )
+        self._put_json(self._key(run_id, artifact_id, "metadata.json"), metadata)
+
+        return ArtifactRef(
+            id=artifact_id,
+            type="table",
+            row_count=row_count,
+        )
+
+    def store_table(self, run_id: str, table: TableData) -> ArtifactRef:
+        artifact_id = self._new_artifact_id(run_id)
+        df = table.to_dataframe() if isinstance(table, ColumnarTable) else table
+        df_serializable = self._serialize_dataframe(df)
+
+        preview_df = df_serializable.head(self._preview_rows)
+        preview_rows = preview_df.to_dict(orient="records")
+        columns = list(df_serializable.columns)
 
         csv_buffer = io.StringIO()
         df_serializable.to_csv(csv_buffer, index=False)
@@ -118,18 +214,17 @@ class S3ArtifactStore(ArtifactStorePort):
             ContentType="text/csv",
         )
 
-        self._put_json(
-            self._key(run_id, artifact_id, "preview.json"),
-            {"rows": preview_rows},
-        )
-        self._put_json(self._key(run_id, artifact_id, "metadata.json"), metadata)
-
-        return ArtifactRef(
-            id=artifact_id,
-            type="table",
+        return self._put_table_metadata(
+            run_id,
+            artifact_id,
+            columns=columns,
+            preview_rows=preview_rows,
             row_count=len(df_serializable),
         )
 
+    def open_table(self, run_id: str, columns: list[str]) -> TableWriter:
+        return _S3TableWriter(self, run_id, columns)
+
     def get_metadata(self, run_id: str, artifact_id: str) -> ArtifactRef | None:
         metadata = self._get_json(self._key(run_id, artifact_id, "metadata.json"))
         if not metadata:
@@ -140,19 +235,38 @@ class S3ArtifactStore(ArtifactStorePort):
             row_count=int(metadata.get("original_row_count", 0)),
         )
 
-    def get_preview(self, run_id: str, artifact_id: str) -> ArtifactPreview | None:
+    def get_preview(
+        self,
+        run_id: str,
+        artifact_id: str,
+        *,
+        offset: int = 0,
+        limit: int | None = None,
+        columns: list[str] | None = None,
+    ) -> ArtifactPreview | None:
         metadata = self._get_json(self._key(run_id, artifact_id, "metadata.json"))
         preview = self._get_json(self._key(run_id, artifact_id, "preview.json"))
         if not metadata or not preview:
             return None
 
         rows = preview.get("rows", [])
-        columns = metadata.get("columns", [])
+        rows = rows if isinstance(rows, list) else []
+        available = metadata.get("columns", [])
+        available = available if isinstance(available, list) else []
+        selected = select_columns(available, columns)
+        # Only the stored preview rows can be paged; the full data is the CSV.
+        start, end, next_offset = page_bounds(len(rows), offset, limit)
+        page = rows[start:end]
+        if columns is not None:
+            page = [{column: row.get(column) for column in selected} for row in page]
         return ArtifactPreview(
-            rows=rows if isinstance(rows, list) else [],
-            columns=columns if isinstance(columns, list) else [],
+            rows=page,
+            columns=selected,
             original_row_count=int(metadata.get("original_row_count", 0)),
-            exported_row_count=len(rows) if isinstance(rows, list) else 0,
+            exported_row_count=len(page),
+            offset=start,
+            total_row_count=len(rows),
+            next_offset=next_offset,
         )
 
     def get_download(self, run_id: str, artifact_id: str) -> ArtifactDownload | None:
@@ -166,3 +280,10 @@ class S3ArtifactStore(ArtifactStorePort):
             url=url,
             expires_in_seconds=self._url_expires_in,
         )
+
+    def stats(self) -> ArtifactStoreStats | None:
+        return None
+
+    async def start(self) -> None: ...
+
+    async def close(self) -> None: ...
@@ -0,0 +1,215 @@
+"""In-memory replay buffers for resumable chat streams."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+
+from .adapters.tanstack_stream import (
+    DoneStreamChunk,
+    ErrorObj,
+    ErrorStreamChunk,
+    StreamChunk,
+    now_ms,
+)
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReplayGapError(Exception):
+    """Chunks after the requested event id were already evicted."""
+
+
+class RunStreamBuffer:
+    """
+    Chunks produced by one chat turn, numbered from ``first_id``, keeping the
+    last ``capacity`` for replay. Any number of readers may follow the stream.
+    """
+
+    def __init__(self, capacity: int, first_id: int = 1) -> None:
+        self._chunks: deque[StreamChunk] = deque(maxlen=capacity)
+        self.first_id = first_id
+        self._last_id = first_id - 1
+        self._changed = asyncio.Event()
+        self.closed_at: float | None = None
+        self.task: asyncio.Task[None] | None = None
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    @property
+    def closed(self) -> bool:
+        return self.closed_at is not None
+
+    def append(self, chunk: StreamChunk) -> int:
+        if self.closed:
+            return self._last_id
+        self._chunks.append(chunk)
+        self._last_id += 1
+        self._notify()
+        return self._last_id
+
+    def close(self, now: float) -> None:
+        if self.closed_at is None:
+            self.closed_at = now
+            self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self, after: int = 0) -> AsyncIterator[tuple[int, StreamChunk]]:
+        """
+        Yield ``(event_id, chunk)`` for every chunk after ``after``, then wait
+        for new ones until the stream is closed.
+        """
+        next_id = after + 1
+        while True:
+            while next_id <= self._last_id:
+                first_id = self._last_id - len(self._chunks) + 1
+                if next_id < first_id:
+                    raise ReplayGapError(
+                        f"events {next_id}..{first_id - 1} are no longer buffered"
+                    )
+                yield next_id, self._chunks[next_id - first_id]
+                next_id += 1
+            if self.closed:
+                return
+            await self._changed.wait()
+
+
+class RunStreamRegistry:
+    """
+    Replay buffers per run_id; closed buffers are kept for ``retention``.
+
+    At most ``max_runs`` buffers are held: past that the oldest closed one
+    is dropped, or, if every run is still streaming, the oldest run is
+    stopped. Runs that fail, are replaced by a new turn or are stopped end
+    with an error chunk and a done chunk so readers see why.
+    """
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        retention_seconds: float,
+        max_runs: int = 1000,
+        model: str = "",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._capacity = capacity
+        self._retention = retention_seconds
+        self._max_runs = max_runs
+        self._model = model
+        self._clock = clock
+        # Oldest first: a run moves to the end when a new turn starts.
+        self._streams: dict[str, RunStreamBuffer] = {}
+
+    def __len__(self) -> int:
+        return len(self._streams)
+
+    def create(self, run_id: str) -> RunStreamBuffer:
+        """
+        Start a new buffer for ``run_id``. A new turn replaces the previous
+        buffer (stopping its run if still streaming) and continues its event
+        ids, so ids stay unique per run.
+        """
+        self.prune()
+        previous = self._streams.pop(run_id, None)
+        if previous is not None and not previous.closed:
+            self._stop(run_id, previous, "run_replaced", "Replaced by a new turn")
+        while self._streams and len(self._streams) >= self._max_runs:
+            self._evict_oldest()
+        first_id = previous.last_id + 1 if previous is not None else 1
+        stream = RunStreamBuffer(self._capacity, first_id=first_id)
+        self._streams[run_id] = stream
+        return stream
+
+    def _evict_oldest(self) -> None:
+        run_id = next(
+            (run_id for run_id, stream in self._streams.items() if stream.closed),
+            None,
+        )
+        if run_id is None:
+            run_id = next(iter(self._streams))
+        stream = self._streams.pop(run_id)
+        if not stream.closed:
+            logger.warning("run_stream_evicted", run_id=run_id)
+            self._stop(run_id, stream, "run_evicted", "Too many active streams")
+
+    def _stop(
+        self, run_id: str, stream: RunStreamBuffer, code: str, message: str
+    ) -> None:
+        self._fail(run_id, stream, code, message)
+        if stream.task is not None:
+            stream.task.cancel()
+
+    def _fail(
+        self, run_id: str, stream: RunStreamBuffer, code: str, message: str
+    ) -> None:
+        timestamp = now_ms()
+        stream.append(
+            ErrorStreamChunk(
+                id=run_id,
+                model=self._model,
+                timestamp=timestamp,
+                error=ErrorObj(message=message, code=code),
+            )
+        )
+        stream.append(
+            DoneStreamChunk(
+                id=run_id, model=self._model, timestamp=timestamp, finishReason="stop"
+            )
+        )
+        self.close(stream)
+
+    def start(self, run_id: str, chunks: AsyncIterator[StreamChunk]) -> RunStreamBuffer:
+        """
+        Drain ``chunks`` into a new buffer from a background task, so the run
+        keeps going (and stays replayable) if the client disconnects.
+        """
+        stream = self.create(run_id)
+
+        async def pump() -> None:
+            try:
+                async for chunk in chunks:
+                    stream.append(chunk)
+            except Exception as exc:
+                logger.exception("run_stream_failed", run_id=run_id)
+                self._fail(run_id, stream, "run_failed", str(exc))
+            finally:
+                self.close(stream)
+
+        stream.task = asyncio.get_running_loop().create_task(pump())
+        return stream
+
+    def get(self, run_id: str) -> RunStreamBuffer | None:
+        stream = self._streams.get(run_id)
+        if stream is not None and self._expired(stream, self._clock()):
+            del self._streams[run_id]
+            return None
+        return stream
+
+    def close(self, stream: RunStreamBuffer) -> None:
+        stream.close(self._clock())
+
+    def prune(self) -> int:
+        """Drop closed buffers past their retention; returns the number dropped."""
+        now = self._clock()
+        expired = [
+            run_id
+            for run_id, stream in self._streams.items()
+            if self._expired(stream, now)
+        ]
+        for run_id in expired:
+            del self._streams[run_id]
+        return len(expired)
+
+    def _expired(self, stream: RunStreamBuffer, now: float) -> bool:
+        return (
+            stream.closed_at is not None and now - stream.closed_at >= self._retention
+        )
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from google.adk.tools import FunctionTool
 
-from ..deps import Deps
+from ..deps import get_deps
 from ._common import _tool_result
 
 
-def build_export_tool(deps: Deps) -> FunctionTool:
+def build_export_tool() -> FunctionTool:
     async def export_csv(artifact_id: str) -> str | None:
         """
         Export a dataset as CSV file (executed on client side).
@@ -15,6 +15,7 @@ def build_export_tool(deps: Deps) -> FunctionTool:
         The client will receive the data reference and fetch the actual data
         from /api/data/{run_id}/{artifact_id} (optionally with mode=download).
         """
+        deps = get_deps()
         if deps.artifact_store.get_metadata(deps.run_id, artifact_id) is None:
             return _tool_result(
                 "エクスポート対象のデータが見つかりませんでした。"
@@ -0,0 +1,124 @@
+"""
+Process-level cache for the formatted database schema used by preview_schema.
+
+Entries are keyed by database name and tagged with a catalog fingerprint.
+Within the TTL the cached text is returned without touching the database;
+after it expires one cheap fingerprint query decides whether the schema has
+to be rebuilt.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from ..settings import get_settings
+
+# Changes whenever a public table is created/dropped/renamed/rewritten, a
+# column is added/dropped/renamed or changes type, length or nullability, or enum
+# labels are added or renamed.
+SCHEMA_FINGERPRINT_SQL = """
+SELECT md5(
+    COALESCE((
+        SELECT string_agg(
+            c.oid::text || ':' || c.relfilenode::text || ':' || c.relname,
+            ',' ORDER BY c.oid
+        )
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relkind = 'r'
+    ), '')
+    || '|' || COALESCE((
+        SELECT string_agg(
+            a.attrelid::text || ':' || a.attname || ':' || a.atttypid::text
+                || ':' || a.atttypmod::text || ':' || a.attnotnull::text,
+            ',' ORDER BY a.attrelid, a.attnum
+        )
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public'
+          AND c.relkind = 'r'
+          AND a.attnum > 0
+          AND NOT a.attisdropped
+    ), '')
+    || '|' || COALESCE((
+        SELECT string_agg(
+            e.oid::text || ':' || e.enumlabel, ',' ORDER BY e.oid
+        )
+        FROM pg_enum e
+        JOIN pg_type t ON t.oid = e.enumtypid
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE n.nspname = 'public'
+    ), '')
+)
+"""
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    schema: str
+    checked_at: float
+
+
+class SchemaCache:
+    """Formatted schema per database with TTL and fingerprint revalidation."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: dict[str, _Entry] = {}
+
+    def get(self, database: str) -> str | None:
+        """Return the cached schema if it was checked within the TTL."""
+        entry = self._entries.get(database)
+        if entry is None or self._clock() - entry.checked_at >= self._ttl:
+            return None
+        return entry.schema
+
+    def revalidate(self, database: str, fingerprint: str) -> str | None:
+        """
+        Return the cached schema if it still matches ``fingerprint``,
+        restarting its TTL; otherwise drop it and return None.
+        """
+        entry = self._entries.get(database)
+        if entry is None:
+            return None
+        if entry.fingerprint != fingerprint:
+            del self._entries[database]
+            return None
+        entry.checked_at = self._clock()
+        return entry.schema
+
+    def set(self, database: str, fingerprint: str, schema: str) -> None:
+        if self._ttl <= 0:
+            return
+        self._entries[database] = _Entry(
+            fingerprint=fingerprint, schema=schema, checked_at=self._clock()
+        )
+
+    def invalidate(self, database: str | None = None) -> None:
+        """Drop one database's entry, or every entry when ``database`` is None."""
+        if database is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(database, None)
+
+
+_schema_cache: SchemaCache | None = None
+
+
+def get_schema_cache() -> SchemaCache:
+    """Get or create the process-wide schema cache."""
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = SchemaCache(
+            ttl_seconds=get_settings().schema_cache_ttl_seconds
+        )
+    return _schema_cache
@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import re
 
+import asyncpg
 import pandas as pd
 from google.adk.tools import FunctionTool
 
-from ..deps import Deps
+from ..columnar import ColumnarBuilder
+from ..deps import get_deps
+from ..logging import get_logger
+from ..ports import ArtifactRef, ArtifactStorePort, ColumnarTable
 from ..settings import Settings
 from ._common import _tool_result
+from .schema_cache import SCHEMA_FINGERPRINT_SQL, get_schema_cache
 
+logger = get_logger(__name__)
 
 FORBIDDEN_PATTERNS: list[tuple[str, str]] = [
     (r"\bUPDATE\b", "UPDATE"),
@@ -51,83 +57,129 @@ def _enforce_limit(sql: str, max_limit: int) -> str:
     return sql
 
 
-def build_preview_schema_tool(deps: Deps) -> FunctionTool:
-    async def preview_schema() -> str:
+async def _stream_query_to_artifact(
+    conn: asyncpg.Connection,
+    sql: str,
+    *,
+    artifact_store: ArtifactStorePort,
+    run_id: str,
+    batch_size: int,
+) -> ArtifactRef:
+    """
+    Run a query through a server-side cursor, handing each batch of rows to
+    the artifact store so only one batch is held in Python at a time.
+    """
+    async with conn.transaction(readonly=True):
+        statement = await conn.prepare(sql)
+        columns = [attr.name for attr in statement.get_attributes()]
+        writer = artifact_store.open_table(run_id, columns)
+        try:
+            cursor = await statement.cursor()
+            while rows := await cursor.fetch(batch_size):
+                writer.write_rows(rows)
+        except BaseException:
+            writer.abort()
+            raise
+    return writer.close()
+
+
+async def _fetch_columnar(conn: asyncpg.Connection, sql: str) -> ColumnarTable:
+    statement = await conn.prepare(sql)
+    builder = ColumnarBuilder.from_statement(statement)
+    builder.append(await statement.fetch())
+    return builder.build()
+
+
+async def _load_schema(conn: asyncpg.Connection) -> str:
+    """Introspect public enums and tables and format them as DDL."""
+    enum_rows = await conn.fetch(
         """
-        Show the database schema for available tables.
+        SELECT
+            t.typname AS enum_name,
+            e.enumlabel AS enum_value,
+            e.enumsortorder AS sort_order
+        FROM pg_type t
+        JOIN pg_enum e ON t.oid = e.enumtypid
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE n.nspname = 'public'
+        ORDER BY t.typname, e.enumsortorder
+        """
+    )
 
-        Use this to understand the structure before writing SQL queries.
+    column_rows = await conn.fetch(
         """
-        try:
-            enum_rows = await deps.conn.fetch(
-                """
-                SELECT
-                    t.typname AS enum_name,
-                    e.enumlabel AS enum_value,
-                    e.enumsortorder AS sort_order
-                FROM pg_type t
-                JOIN pg_enum e ON t.oid = e.enumtypid
-                JOIN pg_namespace n ON n.oid = t.typnamespace
-                WHERE n.nspname = 'public'
-                ORDER BY t.typname, e.enumsortorder
-                """
-            )
+        SELECT
+            c.relname AS table_name,
+            a.attname AS column_name,
+            pg_catalog.format_type(a.atttypid, a.atttypmod) AS data_type,
+            a.attnotnull AS not_null,
+            a.attnum AS ordinal_position
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public'
+          AND c.relkind = 'r'
+          AND a.attnum > 0
+          AND NOT a.attisdropped
+        ORDER BY c.relname, a.attnum
+        """
+    )
 
-            enums: dict[str, list[str]] = {}
-            for row in enum_rows:
-                enums.setdefault(row["enum_name"], []).append(row["enum_value"])
-
-            column_rows = await deps.conn.fetch(
-                """
-                SELECT
-                    c.relname AS table_name,
-                    a.attname AS column_name,
-                    pg_catalog.format_type(a.atttypid, a.atttypmod) AS data_type,
-                    a.attnotnull AS not_null,
-                    a.attnum AS ordinal_position
-                FROM pg_attribute a
-                JOIN pg_class c ON c.oid = a.attrelid
-                JOIN pg_namespace n ON n.oid = c.relnamespace
-                WHERE n.nspname = 'public'
-                  AND c.relkind = 'r'
-                  AND a.attnum > 0
-                  AND NOT a.attisdropped
-                ORDER BY c.relname, a.attnum
-                """
-            )
+    enums: dict[str, list[str]] = {}
+    for row in enum_rows:
+        enums.setdefault(row["enum_name"], []).append(row["enum_value"])
 
-            if not column_rows:
-                return _tool_result("Database Schema:\n(no tables found)")
-
-            tables: dict[str, list[str]] = {}
-            for row in column_rows:
-                table_name = row["table_name"]
-                col_name = row["column_name"]
-                data_type = row["data_type"]
-                not_null = row["not_null"]
-                col_def = f"    {col_name} {data_type}"
-                if not_null:
-                    col_def += " NOT NULL"
-                tables.setdefault(table_name, []).append(col_def)
-
-            schema_lines: list[str] = []
-            if enums:
-                enum_defs = []
-                for enum_name, values in enums.items():
-                    quoted = ", ".join(f"'{value}'" for value in values)
-                    enum_defs.append(
-                        f"CREATE TYPE {enum_name} AS ENUM ({quoted});"
-                    )
-                schema_lines.append("Enum Types:\n" + "\n".join(enum_defs))
+    if not column_rows:
+        return _tool_result("Database Schema:\n(no tables found)")
 
-            table_defs = []
-            for table_name, columns in tables.items():
-                table_defs.append(
-                    f"CREATE TABLE {table_name} (\n{',\n'.join(columns)}\n);"
-                )
-            schema_lines.append("Tables:\n" + "\n\n".join(table_defs))
+    tables: dict[str, list[str]] = {}
+    for row in column_rows:
+        table_name = row["table_name"]
+        col_name = row["column_name"]
+        data_type = row["data_type"]
+        not_null = row["not_null"]
+        col_def = f"    {col_name} {data_type}"
+        if not_null:
+            col_def += " NOT NULL"
+        tables.setdefault(table_name, []).append(col_def)
 
-            return _tool_result("Database Schema:\n" + "\n\n".join(schema_lines))
+    schema_lines: list[str] = []
+    if enums:
+        enum_defs = []
+        for enum_name, values in enums.items():
+            quoted = ", ".join(f"'{value}'" for value in values)
+            enum_defs.append(f"CREATE TYPE {enum_name} AS ENUM ({quoted});")
+        schema_lines.append("Enum Types:\n" + "\n".join(enum_defs))
+
+    table_defs = []
+    for table_name, columns in tables.items():
+        table_defs.append(f"CREATE TABLE {table_name} (\n{',\n'.join(columns)}\n);")
+    schema_lines.append("Tables:\n" + "\n\n".join(table_defs))
+
+    return _tool_result("Database Schema:\n" + "\n\n".join(schema_lines))
+
+
+def build_preview_schema_tool(settings: Settings) -> FunctionTool:
+    async def preview_schema() -> str:
+        """
+        Show the database schema for available tables.
+
+        Use this to understand the structure before writing SQL queries.
+        """
+        deps = get_deps()
+        cache = get_schema_cache()
+        database = settings.database_name
+        if (cached := cache.get(database)) is not None:
+            return cached
+
+        try:
+            async with deps.connection() as conn:
+                fingerprint = await conn.fetchval(SCHEMA_FINGERPRINT_SQL)
+                if (cached := cache.revalidate(database, fingerprint)) is not None:
+                    return cached
+                result = await _load_schema(conn)
+            cache.set(database, fingerprint, result)
+            return result
         except Exception as exc:
             return _tool_result(
                 f"Failed to load schema: {exc}",
@@ -137,7 +189,14 @@ def build_preview_schema_tool(deps: Deps) -> FunctionTool:
     return FunctionTool(preview_schema)
 
 
-def build_sql_tool(deps: Deps, settings: Settings) -> FunctionTool:
+def build_sql_tool(settings: Settings) -> FunctionTool:
+    if settings.sql_streaming and settings.sql_columnar_results:
+        # The streaming writer builds its own frames from row batches.
+        logger.warning(
+            "sql_columnar_results_ignored",
+            reason="sql_streaming takes precedence",
+        )
+
     async def execute_sql(sql: str) -> str:
         """
         Execute a SQL query on the database after user approval.
@@ -157,11 +216,27 @@ def build_sql_tool(deps: Deps, settings: Settings) -> FunctionTool:
             )
 
         sql = _enforce_limit(sql, settings.sql_max_limit)
+        deps = get_deps()
 
         try:
-            rows = await deps.conn.fetch(sql)
-            df = pd.DataFrame([dict(r) for r in rows])
-            artifact = deps.artifact_store.store_table(deps.run_id, df)
+            if settings.sql_streaming:
+                async with deps.connection() as conn:
+                    artifact = await _stream_query_to_artifact(
+                        conn,
+                        sql,
+                        artifact_store=deps.artifact_store,
+                        run_id=deps.run_id,
+                        batch_size=settings.sql_stream_batch_size,
+                    )
+            elif settings.sql_columnar_results:
+                async with deps.connection() as conn:
+                    table = await _fetch_columnar(conn, sql)
+                artifact = deps.artifact_store.store_table(deps.run_id, table)
+            else:
+                async with deps.connection() as conn:
+                    rows = await conn.fetch(sql)
+                df = pd.DataFrame([dict(r) for r in rows])
+                artifact = deps.artifact_store.store_table(deps.run_id, df)
 
             row_count = artifact.row_count
             return _tool_result(
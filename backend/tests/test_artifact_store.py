@@ -1,13 +1,17 @@
+import asyncio
 import os
 import sys
 import unittest
+from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
 )
 
+from backend.ports import ArtifactTooLargeError  # noqa: E402
 from backend.store import InMemoryArtifactStore  # noqa: E402
 
 
@@ -43,6 +47,81 @@ class ArtifactStoreTests(unittest.TestCase):
         self.assertIsNotNone(loaded)
         self.assertEqual(list(loaded.columns), ["x"])
 
+    def test_get_dataframe_is_zero_copy(self) -> None:
+        store = InMemoryArtifactStore(ttl_minutes=30)
+        df = pd.DataFrame({"x": [1.0, 2.0]})
+        artifact = store.store("run123", df)
+
+        loaded = store.get_dataframe("run123", artifact.id)
+        again = store.get_dataframe("run123", artifact.id)
+        self.assertTrue(np.shares_memory(loaded["x"].to_numpy(), again["x"].to_numpy()))
+        loaded["y"] = 1
+        self.assertEqual(
+            list(store.get_dataframe("run123", artifact.id).columns), ["x"]
+        )
+        # The store keeps its own copy of the caller's frame.
+        df.iloc[1, 0] = -1.0
+        self.assertEqual(
+            store.get_dataframe("run123", artifact.id)["x"].tolist(), [1.0, 2.0]
+        )
+
+    def test_preview_rows_are_built_on_request(self) -> None:
+        store = InMemoryArtifactStore(ttl_minutes=30)
+        df = pd.DataFrame(
+            {"t": pd.to_datetime(["2026-01-01", "2026-01-02"]), "n": [1, 2]}
+        )
+        artifact = store.store("run123", df)
+
+        self.assertFalse(hasattr(artifact, "rows"))
+        preview = store.get_preview("run123", artifact.id)
+        self.assertEqual(preview.rows[1], {"t": "2026-01-02", "n": 2})
+        # The stored frame keeps its datetime dtype.
+        self.assertTrue(
+            pd.api.types.is_datetime64_any_dtype(
+                store.get_dataframe("run123", artifact.id)["t"]
+            )
+        )
+
+    def test_preview_pages_and_projects_columns(self) -> None:
+        store = InMemoryArtifactStore(ttl_minutes=30)
+        df = pd.DataFrame({"x": range(5), "y": list("abcde"), "z": [0.5] * 5})
+        artifact = store.store("run123", df)
+
+        page = store.get_preview(
+            "run123", artifact.id, offset=1, limit=2, columns=["y", "x"]
+        )
+        self.assertEqual(page.columns, ["y", "x"])
+        self.assertEqual(page.rows, [{"y": "b", "x": 1}, {"y": "c", "x": 2}])
+        self.assertEqual((page.offset, page.total_row_count), (1, 5))
+        self.assertEqual(page.next_offset, 3)
+
+        last = store.get_preview("run123", artifact.id, offset=3, limit=10)
+        self.assertEqual(len(last.rows), 2)
+        self.assertIsNone(last.next_offset)
+        past_end = store.get_preview("run123", artifact.id, offset=9)
+        self.assertEqual(past_end.rows, [])
+
+        with self.assertRaises(ValueError):
+            store.get_preview("run123", artifact.id, columns=["missing"])
+
+    def test_open_table_batches(self) -> None:
+        store = InMemoryArtifactStore(ttl_minutes=30)
+        writer = store.open_table("run123", ["x", "y"])
+        writer.write_rows([(1, "a"), (2, "b")])
+        writer.write_rows([(3, "c")])
+        ref = writer.close()
+
+        self.assertEqual(ref.row_count, 3)
+        loaded = store.get_dataframe("run123", ref.id)
+        self.assertEqual(loaded["x"].tolist(), [1, 2, 3])
+
+    def test_open_table_empty(self) -> None:
+        store = InMemoryArtifactStore(ttl_minutes=30)
+        ref = store.open_table("run123", ["x"]).close()
+
+        self.assertEqual(ref.row_count, 0)
+        self.assertEqual(store.get_preview("run123", ref.id).columns, ["x"])
+
     def test_ttl_expiration(self) -> None:
         store = InMemoryArtifactStore(ttl_minutes=0)
         df = pd.DataFrame({"x": [1]})
@@ -52,6 +131,92 @@ class ArtifactStoreTests(unittest.TestCase):
         self.assertGreaterEqual(expired, 1)
         self.assertIsNone(store.get("run123", artifact.id))
 
+    def test_expiry_only_removes_expired_artifacts(self) -> None:
+        now = [datetime(2026, 1, 1)]
+        store = InMemoryArtifactStore(ttl_minutes=10, clock=lambda: now[0])
+        df = pd.DataFrame({"x": [1]})
+        old = store.store("run_a", df)
+        now[0] += timedelta(minutes=6)
+        young = store.store("run_a", df)
+        other = store.store("run_b", df)
+
+        now[0] += timedelta(minutes=5)
+        self.assertEqual(store.cleanup_expired(), 1)
+        self.assertEqual(store.list_artifacts("run_a"), [young.id])
+        self.assertEqual(store.list_artifacts("run_b"), [other.id])
+        self.assertIsNone(store.get("run_a", old.id))
+
+        now[0] += timedelta(minutes=6)
+        self.assertEqual(store.cleanup_expired(), 2)
+        self.assertEqual(store.list_artifacts("run_a"), [])
+
+    def test_background_sweeper_replaces_on_access_cleanup(self) -> None:
+        now = [datetime(2026, 1, 1)]
+        store = InMemoryArtifactStore(
+            ttl_minutes=1, sweep_interval_seconds=0.01, clock=lambda: now[0]
+        )
+        df = pd.DataFrame({"x": [1]})
+
+        async def run() -> None:
+            await store.start()
+            try:
+                store.store("run", df)
+                now[0] += timedelta(minutes=2)
+                store.store("run", df)
+                # Cleanup is left to the sweeper, so both are still listed.
+                self.assertEqual(len(store.list_artifacts("run")), 2)
+                await asyncio.sleep(0.05)
+                self.assertEqual(len(store.list_artifacts("run")), 1)
+            finally:
+                await store.close()
+
+        asyncio.run(run())
+
+    def test_byte_budget_evicts_least_recently_used(self) -> None:
+        df = pd.DataFrame({"x": range(100)})
+        probe = InMemoryArtifactStore()
+        probe.store("probe", df)
+        nbytes = probe.stats().bytes_held
+
+        store = InMemoryArtifactStore(max_bytes=2 * nbytes)
+        first = store.store("run_a", df)
+        second = store.store("run_b", df)
+        store.get("run_a", first.id)
+        store.store("run_c", df)
+
+        self.assertIsNotNone(store.get("run_a", first.id))
+        self.assertIsNone(store.get("run_b", second.id))
+        stats = store.stats()
+        self.assertEqual(stats.bytes_held, 2 * nbytes)
+        self.assertEqual((stats.evicted_artifacts, stats.evicted_bytes), (1, nbytes))
+
+    def test_run_quota_evicts_only_that_runs_artifacts(self) -> None:
+        df = pd.DataFrame({"x": range(100)})
+        probe = InMemoryArtifactStore()
+        probe.store("probe", df)
+        nbytes = probe.stats().bytes_held
+
+        store = InMemoryArtifactStore(max_run_bytes=2 * nbytes)
+        other = store.store("run_b", df)
+        first = store.store("run_a", df)
+        store.store("run_a", df)
+        store.store("run_a", df)
+
+        self.assertIsNone(store.get("run_a", first.id))
+        self.assertEqual(len(store.list_artifacts("run_a")), 2)
+        self.assertIsNotNone(store.get("run_b", other.id))
+
+    def test_oversized_artifact_is_rejected(self) -> None:
+        store = InMemoryArtifactStore(max_run_bytes=1024)
+        with self.assertRaises(ArtifactTooLargeError):
+            store.store("run", pd.DataFrame({"x": range(10_000)}))
+
+        writer = store.open_table("run", ["x"])
+        with self.assertRaises(ArtifactTooLargeError):
+            writer.write_rows([(i,) for i in range(10_000)])
+        self.assertEqual(store.stats().rejected_artifacts, 2)
+        self.assertEqual(store.stats().bytes_held, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
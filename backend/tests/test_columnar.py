@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+from datetime import UTC, datetime
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.columnar import ColumnarBuilder  # noqa: E402
+from backend.store import InMemoryArtifactStore  # noqa: E402
+
+
+class ColumnarBuilderTests(unittest.TestCase):
+    def _build(self):
+        builder = ColumnarBuilder(
+            ["id", "score", "ok", "ts", "tags"],
+            ["int8", "float8", "bool", "timestamptz", "_text"],
+        )
+        ts = datetime(2024, 1, 1, tzinfo=UTC)
+        builder.append([(1, 0.5, True, ts, ["a"]), (2, None, False, ts, [])])
+        builder.append([(3, 1.5, True, None, ["b", "c"])])
+        return builder.build()
+
+    def test_typed_columns(self) -> None:
+        df = self._build().to_dataframe()
+
+        self.assertEqual(list(df.columns), ["id", "score", "ok", "ts", "tags"])
+        self.assertEqual(str(df["id"].dtype), "int64")
+        self.assertEqual(str(df["score"].dtype), "float64")
+        self.assertEqual(str(df["ok"].dtype), "bool")
+        self.assertTrue(str(df["ts"].dtype).startswith("datetime64"))
+        self.assertEqual(df["tags"].tolist(), [["a"], [], ["b", "c"]])
+
+    def test_nullable_ints(self) -> None:
+        builder = ColumnarBuilder(["n"], ["int4"])
+        builder.append([(1,), (None,)])
+        df = builder.build().to_dataframe()
+
+        self.assertEqual(str(df["n"].dtype), "Int64")
+
+    def test_duplicate_column_names(self) -> None:
+        builder = ColumnarBuilder(["x", "x"], ["int4", "text"])
+        builder.append([(1, "a")])
+        df = builder.build().to_dataframe()
+
+        self.assertEqual(list(df.columns), ["x", "x"])
+
+    def test_store_table_accepts_columnar(self) -> None:
+        store = InMemoryArtifactStore(ttl_minutes=30)
+        ref = store.store_table("run123", self._build())
+
+        self.assertEqual(ref.row_count, 3)
+        preview = store.get_preview("run123", ref.id)
+        self.assertEqual(preview.rows[0]["id"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import sys
+import unittest
+from collections.abc import AsyncGenerator
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from google.adk.models.base_llm import BaseLlm  # noqa: E402
+from google.adk.models.llm_request import LlmRequest  # noqa: E402
+from google.adk.models.llm_response import LlmResponse  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from backend.agents.sql_agent.agent import create_runner  # noqa: E402
+from backend.llm.context_cache import (  # noqa: E402
+    FakeCachedContentClient,
+    PromptContextCache,
+)
+from backend.settings import Settings  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingLlm(BaseLlm):
+    """Offline model that records requests and replies with fixed text."""
+
+    requests: list[LlmRequest] = []
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.requests.append(llm_request)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="ok")])
+        )
+
+
+def _request(instruction: str = "static prefix") -> LlmRequest:
+    return LlmRequest(
+        model="gemini-test",
+        config=types.GenerateContentConfig(
+            system_instruction=instruction,
+            tools=[
+                types.Tool(
+                    function_declarations=[types.FunctionDeclaration(name="f")]
+                )
+            ],
+        ),
+    )
+
+
+class PromptContextCacheTests(unittest.TestCase):
+    def test_apply_swaps_prefix_for_handle(self) -> None:
+        client = FakeCachedContentClient()
+        cache = PromptContextCache(client, ttl_seconds=100, clock=FakeClock())
+
+        first, second = _request(), _request()
+        self.assertTrue(asyncio.run(cache.apply(first)))
+        self.assertTrue(asyncio.run(cache.apply(second)))
+
+        self.assertEqual(len(client.created), 1)
+        self.assertEqual(second.config.cached_content, client.created[0])
+        self.assertIsNone(second.config.system_instruction)
+        self.assertIsNone(second.config.tools)
+        self.assertEqual(cache.stats.hits, 2)
+        self.assertGreater(cache.stats.cached_prompt_tokens, 0)
+
+    def test_renews_before_expiry_and_recreates_after(self) -> None:
+        client = FakeCachedContentClient()
+        clock = FakeClock()
+        cache = PromptContextCache(
+            client, ttl_seconds=100, refresh_margin_seconds=10, clock=clock
+        )
+        asyncio.run(cache.apply(_request()))
+
+        clock.now = 95
+        asyncio.run(cache.apply(_request()))
+        self.assertEqual(client.renewed, [client.created[0]])
+
+        clock.now = 500
+        asyncio.run(cache.apply(_request()))
+        self.assertEqual(len(client.created), 2)
+
+    def test_distinct_prefixes_get_distinct_handles(self) -> None:
+        client = FakeCachedContentClient()
+        cache = PromptContextCache(client, clock=FakeClock())
+
+        asyncio.run(cache.apply(_request("a")))
+        asyncio.run(cache.apply(_request("b")))
+
+        self.assertEqual(len(client.created), 2)
+
+    def test_failure_leaves_request_uncached(self) -> None:
+        client = FakeCachedContentClient()
+        client.fail = True
+        cache = PromptContextCache(client, clock=FakeClock())
+
+        request = _request()
+        self.assertFalse(asyncio.run(cache.apply(request)))
+        self.assertEqual(request.config.system_instruction, "static prefix")
+        self.assertEqual(cache.stats.failures, 1)
+
+    def test_runner_sends_cached_content_to_model(self) -> None:
+        client = FakeCachedContentClient()
+        cache = PromptContextCache(client, clock=FakeClock())
+        runner = create_runner(settings=Settings(), context_cache=cache)
+        llm = RecordingLlm(model="gemini-test")
+        runner.agent.model = llm
+
+        async def run() -> None:
+            await runner.session_service.create_session(
+                app_name=runner.app_name, user_id="u", session_id="s"
+            )
+            async for _ in runner.run_async(
+                user_id="u",
+                session_id="s",
+                new_message=types.Content(role="user", parts=[types.Part(text="hi")]),
+            ):
+                pass
+
+        asyncio.run(run())
+
+        sent = llm.requests[-1]
+        self.assertEqual(sent.config.cached_content, client.created[0])
+        self.assertIsNone(sent.config.system_instruction)
+        self.assertIn("Today's Date", str(sent.contents))
+
+
+if __name__ == "__main__":
+    unittest.main()
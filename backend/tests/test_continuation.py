@@ -0,0 +1,93 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.continuation import (  # noqa: E402
+    ContinuationHub,
+    ContinuationUnavailableError,
+)
+
+
+class ContinuationHubTests(unittest.TestCase):
+    def test_push_before_and_after_wait(self) -> None:
+        async def run() -> None:
+            hub = ContinuationHub()
+            hub.push("early", {"n": 1})
+            self.assertEqual(await hub.wait("early"), {"n": 1})
+
+            waiter = asyncio.create_task(hub.wait("late"))
+            await asyncio.sleep(0)
+            self.assertEqual(hub.stats().waiting_runs, 1)
+            hub.push("late", {"n": 2})
+            self.assertEqual(await waiter, {"n": 2})
+            self.assertEqual(hub.stats().parked_runs, 0)
+
+        asyncio.run(run())
+
+    def test_wait_times_out_and_frees_slot(self) -> None:
+        async def run() -> None:
+            hub = ContinuationHub(wait_timeout_seconds=0.01)
+            with self.assertRaises(ContinuationUnavailableError):
+                await hub.wait("run")
+            stats = hub.stats()
+            self.assertEqual((stats.parked_runs, stats.timeouts), (0, 1))
+
+        asyncio.run(run())
+
+    def test_eviction_prefers_slots_without_waiters(self) -> None:
+        async def run() -> None:
+            hub = ContinuationHub(max_parked_runs=2)
+            waiter = asyncio.create_task(hub.wait("oldest"))
+            await asyncio.sleep(0)
+            hub.push("b", {})
+            hub.push("c", {})
+            # The queued-only slot "b" went, though "oldest" is older.
+            self.assertFalse(waiter.done())
+            self.assertEqual(hub.stats().evictions, 1)
+            self.assertEqual(hub.stats().waiting_runs, 1)
+
+            # With only waiters left, the least recently used one is failed.
+            other = asyncio.create_task(hub.wait("c"))
+            await asyncio.sleep(0)
+            self.assertEqual(await other, {})
+            second = asyncio.create_task(hub.wait("d"))
+            await asyncio.sleep(0)
+            hub.push("e", {})
+            with self.assertRaises(ContinuationUnavailableError):
+                await waiter
+            self.assertFalse(second.done())
+            hub.push("d", {"n": 1})
+            self.assertEqual(await second, {"n": 1})
+
+        asyncio.run(run())
+
+    def test_queued_only_slots_expire(self) -> None:
+        async def run() -> None:
+            now = [0.0]
+            hub = ContinuationHub(queued_ttl_seconds=60, clock=lambda: now[0])
+            hub.push("stale", {})
+            waiter = asyncio.create_task(hub.wait("parked"))
+            await asyncio.sleep(0)
+            now[0] += 61
+            hub.push("fresh", {})
+            stats = hub.stats()
+            self.assertEqual((stats.parked_runs, stats.expirations), (2, 1))
+            hub.push("parked", {"n": 1})
+            self.assertEqual(await waiter, {"n": 1})
+
+        asyncio.run(run())
+
+    def test_discard_drops_queued_payloads(self) -> None:
+        hub = ContinuationHub()
+        hub.push("run", {"stale": True})
+        hub.discard("run")
+        self.assertEqual(hub.stats().parked_runs, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.continuation import BrokeredContinuationHub  # noqa: E402
+from backend.store.continuation_broker import (  # noqa: E402
+    FakeContinuationBroker,
+    RedisContinuationBroker,
+)
+
+HAS_FAKEREDIS = importlib.util.find_spec("fakeredis") is not None
+
+
+async def _workers(count: int) -> tuple[FakeContinuationBroker, list]:
+    broker = FakeContinuationBroker()
+    hubs = [BrokeredContinuationHub(broker) for _ in range(count)]
+    for hub in hubs:
+        await hub.start()
+    return broker, hubs
+
+
+class BrokeredContinuationHubTests(unittest.TestCase):
+    def test_payload_posted_to_another_worker_reaches_waiter(self) -> None:
+        async def run() -> None:
+            _broker, (stream_worker, api_worker) = await _workers(2)
+            waiter = asyncio.create_task(stream_worker.wait("run"))
+            await asyncio.sleep(0)
+            await api_worker.publish("run", {"approvals": {"t1": True}})
+            self.assertEqual(
+                await asyncio.wait_for(waiter, 1), {"approvals": {"t1": True}}
+            )
+
+        asyncio.run(run())
+
+    def test_payload_published_before_wait_is_claimed(self) -> None:
+        async def run() -> None:
+            broker, (stream_worker, api_worker) = await _workers(2)
+            await api_worker.publish("run", {"n": 1})
+            await asyncio.sleep(0)
+            self.assertEqual(broker.queued("run"), 1)
+            self.assertEqual(
+                await asyncio.wait_for(stream_worker.wait("run"), 1), {"n": 1}
+            )
+            self.assertEqual(broker.queued("run"), 0)
+
+        asyncio.run(run())
+
+    def test_each_payload_delivered_at_most_once(self) -> None:
+        async def run() -> None:
+            _broker, hubs = await _workers(3)
+            waiters = [asyncio.create_task(hub.wait("run")) for hub in hubs]
+            await asyncio.sleep(0)
+            await hubs[0].publish("run", {"n": 1})
+            await asyncio.sleep(0.05)
+            delivered = [w.result() for w in waiters if w.done()]
+            self.assertEqual(delivered, [{"n": 1}])
+            for waiter in waiters:
+                waiter.cancel()
+
+        asyncio.run(run())
+
+    def test_claim_after_waiter_left_returns_payload(self) -> None:
+        async def run() -> None:
+            broker, (hub,) = await _workers(1)
+            waiter = asyncio.create_task(hub.wait("run"))
+            await asyncio.sleep(0)
+            await broker.publish("run", {"n": 1})
+            waiter.cancel()
+            await asyncio.sleep(0.01)
+            self.assertEqual(broker.queued("run"), 1)
+
+        asyncio.run(run())
+
+    def test_waiters_claim_after_listener_reconnects(self) -> None:
+        async def run() -> None:
+            broker, (stream_worker, api_worker) = await _workers(2)
+            waiter = asyncio.create_task(stream_worker.wait("run"))
+            # Let the claim made when the wait starts come back empty.
+            await asyncio.sleep(0.01)
+            broker.connected = False
+            await api_worker.publish("run", {"n": 1})
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+            broker.reconnect()
+            self.assertEqual(await asyncio.wait_for(waiter, 1), {"n": 1})
+
+        asyncio.run(run())
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis is not installed")
+class RedisContinuationBrokerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        import fakeredis
+
+        self.server = fakeredis.FakeServer()
+        self.fakeredis = fakeredis
+
+    def _hub(self) -> BrokeredContinuationHub:
+        broker = RedisContinuationBroker(
+            "redis://unused",
+            health_check_seconds=0.05,
+            reconnect_delay_seconds=0.2,
+            client=self.fakeredis.FakeAsyncRedis(server=self.server),
+        )
+        return BrokeredContinuationHub(broker)
+
+    def test_delivery_survives_dropped_pubsub_connection(self) -> None:
+        async def run() -> None:
+            stream_worker, api_worker = self._hub(), self._hub()
+            await stream_worker.start()
+            waiter = asyncio.create_task(stream_worker.wait("run"))
+            await asyncio.sleep(0.01)
+            # Kill the listener's connection; this notification is lost.
+            await stream_worker._broker._pubsub.connection.disconnect()
+            await api_worker.publish("run", {"n": 1})
+            self.assertEqual(await asyncio.wait_for(waiter, 2), {"n": 1})
+            await stream_worker.close()
+
+        asyncio.run(run())
+
+    def test_delivery_survives_redis_outage(self) -> None:
+        async def run() -> None:
+            stream_worker, api_worker = self._hub(), self._hub()
+            await stream_worker.start()
+            waiter = asyncio.create_task(stream_worker.wait("run"))
+            await asyncio.sleep(0.01)
+            self.server.connected = False
+            await asyncio.sleep(0.1)
+            self.server.connected = True
+            # Published while the listener is backing off, before it
+            # subscribes again.
+            await api_worker.publish("run", {"n": 1})
+            self.assertEqual(await asyncio.wait_for(waiter, 2), {"n": 1})
+            await stream_worker.close()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
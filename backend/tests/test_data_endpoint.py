@@ -0,0 +1,146 @@
+import gzip
+import json
+import os
+import sys
+import unittest
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import main  # noqa: E402
+from backend.adapters.table_export import iter_table_chunks  # noqa: E402
+from backend.store import get_artifact_store  # noqa: E402
+
+
+class DataEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = TestClient(main.app)
+        df = pd.DataFrame(
+            {
+                "n": range(5),
+                "s": list("abcde"),
+                "f": [0.5, float("nan"), 1.5, 2.5, 3.5],
+            }
+        )
+        self.artifact_id = get_artifact_store().store("data-run", df).id
+
+    def test_cursor_walks_pages_with_projection(self) -> None:
+        url = f"/api/data/data-run/{self.artifact_id}"
+        body = self.client.get(url, params={"limit": 2, "columns": "f,n"}).json()
+        self.assertEqual(body["columns"], ["f", "n"])
+        self.assertEqual(body["rows"], [{"f": 0.5, "n": 0}, {"f": None, "n": 1}])
+        self.assertEqual(body["total_row_count"], 5)
+
+        seen = body["rows"]
+        while body["next_cursor"] is not None:
+            body = self.client.get(url, params={"cursor": body["next_cursor"]}).json()
+            self.assertEqual(body["columns"], ["f", "n"])
+            seen += body["rows"]
+        self.assertEqual([row["n"] for row in seen], [0, 1, 2, 3, 4])
+
+    def test_bad_columns_and_cursor_are_rejected(self) -> None:
+        url = f"/api/data/data-run/{self.artifact_id}"
+        self.assertEqual(self.client.get(url, params={"columns": "x"}).status_code, 400)
+        self.assertEqual(
+            self.client.get(url, params={"cursor": "not-a-cursor"}).status_code, 400
+        )
+
+    def test_missing_temporal_and_nullable_values_are_null(self) -> None:
+        df = pd.DataFrame(
+            {
+                "wait": pd.to_timedelta(["1h", None]),
+                "at": pd.to_datetime(["2024-01-02 03:04:05", None]),
+                "n": pd.array([1, None], dtype="Int64"),
+            }
+        )
+        artifact_id = get_artifact_store().store("data-run", df).id
+        response = self.client.get(f"/api/data/data-run/{artifact_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["rows"],
+            [
+                {"wait": "0 days 01:00:00", "at": "2024-01-02 03:04:05", "n": 1},
+                {"wait": None, "at": None, "n": None},
+            ],
+        )
+
+    def test_download_mode_links_to_streaming_export(self) -> None:
+        body = self.client.get(
+            f"/api/data/data-run/{self.artifact_id}", params={"mode": "download"}
+        ).json()
+        self.assertEqual(body["mode"], "signed-url")
+        self.assertTrue(body["download_url"].startswith("/api/export/data-run/"))
+
+        response = self.client.get(body["download_url"])
+        self.assertEqual(response.headers["content-type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment", response.headers["content-disposition"])
+        lines = response.text.splitlines()
+        self.assertEqual(lines[0], "n,s,f")
+        self.assertEqual(lines[2], "1,b,")
+        self.assertEqual(len(lines), 6)
+
+    def test_ndjson_export_with_gzip(self) -> None:
+        response = self.client.get(
+            f"/api/export/data-run/{self.artifact_id}",
+            params={"format": "ndjson", "gzip": "true"},
+        )
+        self.assertEqual(response.headers["content-type"], "application/gzip")
+        self.assertTrue(response.headers["content-disposition"].endswith('.gz"'))
+        rows = [
+            json.loads(line) for line in gzip.decompress(response.content).splitlines()
+        ]
+        self.assertEqual(rows[1], {"n": 1, "s": "b", "f": None})
+        self.assertEqual(len(rows), 5)
+
+    def test_ndjson_export_encodes_values_like_previews(self) -> None:
+        df = pd.DataFrame(
+            {
+                "id": [uuid.UUID(int=1)],
+                "day": [date(2024, 1, 2)],
+                "amount": [Decimal("1.50")],
+            }
+        )
+        artifact_id = get_artifact_store().store("data-run", df).id
+        response = self.client.get(
+            f"/api/export/data-run/{artifact_id}", params={"format": "ndjson"}
+        )
+        self.assertEqual(
+            json.loads(response.text),
+            {
+                "id": "00000000-0000-0000-0000-000000000001",
+                "day": "2024-01-02",
+                "amount": "1.50",
+            },
+        )
+        preview = self.client.get(f"/api/data/data-run/{artifact_id}").json()
+        self.assertEqual(preview["rows"], [json.loads(response.text)])
+
+    def test_export_of_missing_artifact_is_404(self) -> None:
+        response = self.client.get("/api/export/data-run/missing")
+        self.assertEqual(response.status_code, 404)
+
+    def test_chunks_concatenate_to_whole_table(self) -> None:
+        df = pd.DataFrame({"x": range(7), "y": list("abcdefg")})
+        for fmt in ("csv", "ndjson"):
+            chunks = list(iter_table_chunks(df, fmt, chunk_rows=3))
+            # Header (csv only) plus three row chunks.
+            self.assertEqual(len(chunks), 4 if fmt == "csv" else 3)
+            whole = b"".join(chunks).decode()
+            expected = (
+                df.to_csv(index=False)
+                if fmt == "csv"
+                else df.to_json(orient="records", lines=True)
+            )
+            self.assertEqual(whole.rstrip("\n"), expected.rstrip("\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
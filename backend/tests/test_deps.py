@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.deps import Deps, get_deps, use_deps  # noqa: E402
+from backend.store import InMemoryArtifactStore  # noqa: E402
+
+
+def _deps(run_id: str) -> Deps:
+    return Deps(pool=None, run_id=run_id, artifact_store=InMemoryArtifactStore())
+
+
+class DepsTests(unittest.TestCase):
+    def test_unbound_raises(self) -> None:
+        with self.assertRaises(RuntimeError):
+            get_deps()
+
+    def test_binding_is_scoped(self) -> None:
+        with use_deps(_deps("outer")):
+            with use_deps(_deps("inner")):
+                self.assertEqual(get_deps().run_id, "inner")
+            self.assertEqual(get_deps().run_id, "outer")
+        with self.assertRaises(RuntimeError):
+            get_deps()
+
+    def test_concurrent_runs_are_isolated(self) -> None:
+        async def run(run_id: str) -> list[str]:
+            with use_deps(_deps(run_id)):
+                seen = []
+                for _ in range(3):
+                    await asyncio.sleep(0)
+                    # Tasks spawned by the runner inherit the binding.
+                    seen.append(await asyncio.create_task(_current_run_id()))
+                return seen
+
+        async def _current_run_id() -> str:
+            return get_deps().run_id
+
+        async def main() -> list[list[str]]:
+            return await asyncio.gather(run("a"), run("b"))
+
+        self.assertEqual(asyncio.run(main()), [["a"] * 3, ["b"] * 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+from collections.abc import AsyncGenerator
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from google.adk.models.base_llm import BaseLlm  # noqa: E402
+from google.adk.models.llm_request import LlmRequest  # noqa: E402
+from google.adk.models.llm_response import LlmResponse  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from backend import main  # noqa: E402
+
+
+class ScriptedLlm(BaseLlm):
+    """Offline model: calls execute_sql once, then answers with text."""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        last = llm_request.contents[-1].parts[-1]
+        if last.function_response is None:
+            part = types.Part(
+                function_call=types.FunctionCall(
+                    id="call_sql", name="execute_sql", args={"query": "SELECT 1"}
+                )
+            )
+        else:
+            part = types.Part(text="Query was not run.")
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+def _chunks(body: str) -> list[dict]:
+    return [
+        json.loads(line[len("data: ") :])
+        for line in body.splitlines()
+        if line.startswith("data: {")
+    ]
+
+
+class DetachedHitlTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(main.runner.agent, "model", ScriptedLlm(model="x"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(main, "get_db_pool", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = TestClient(main.app)
+
+    def test_chat_stream_ends_when_run_is_parked(self) -> None:
+        response = self.client.post(
+            "/api/chat",
+            json={
+                "run_id": "detached-1",
+                "messages": [{"role": "user", "content": "run it"}],
+            },
+            headers={"X-Stream-Mode": "detached"},
+        )
+        chunks = _chunks(response.text)
+        self.assertEqual(response.headers["x-stream-mode"], "detached")
+        self.assertEqual(
+            [c["type"] for c in chunks[-2:]], ["approval-requested", "done"]
+        )
+        self.assertEqual(chunks[-1]["finishReason"], "tool_calls")
+        self.assertTrue(asyncio.run(main.store.has_pending("detached-1")))
+
+        resumed = self.client.post(
+            "/api/continuation",
+            json={"run_id": "detached-1", "approvals": {"call_sql": False}},
+            headers={"Accept": "text/event-stream"},
+        )
+        chunks = _chunks(resumed.text)
+        self.assertEqual(resumed.headers["content-type"], "text/event-stream")
+        self.assertIn(
+            "Query was not run.",
+            "".join(c["delta"] for c in chunks if c["type"] == "content"),
+        )
+        self.assertEqual(chunks[-1]["finishReason"], "stop")
+        self.assertFalse(asyncio.run(main.store.has_pending("detached-1")))
+
+    def test_continuation_rejected_while_run_streams_without_replay(self) -> None:
+        patcher = mock.patch.object(main, "run_streams", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # An in-stream chat for the run has been created and not finished.
+        stream = main._agent_chunks("busy-1", delta_only=False, detached=False)
+
+        resume = {"run_id": "busy-1", "approvals": {"call_sql": False}}
+        headers = {"Accept": "text/event-stream"}
+        response = self.client.post("/api/continuation", json=resume, headers=headers)
+        self.assertEqual(response.status_code, 409)
+
+        del stream
+        response = self.client.post("/api/continuation", json=resume, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("busy-1", main.active_runs)
+
+
+if __name__ == "__main__":
+    unittest.main()
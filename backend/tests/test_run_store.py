@@ -0,0 +1,297 @@
+import asyncio
+import importlib.util
+import os
+import sys
+import unittest
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.domain.models import PendingAction  # noqa: E402
+from backend.store.postgres_run_store import (  # noqa: E402
+    PostgresRunStore,
+    _row_to_action,
+)
+from backend.store.redis_run_store import RedisRunStore  # noqa: E402
+from backend.store.run_store import InMemoryRunStore  # noqa: E402
+
+HAS_FAKEREDIS = importlib.util.find_spec("fakeredis") is not None
+# A throwaway database; its run store tables are emptied before each test.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def _action(tool_call_id: str, kind: str = "approval") -> PendingAction:
+    return PendingAction(
+        kind=kind,
+        tool_call_id=tool_call_id,
+        tool_name="run_sql",
+        tool_input={"sql": "select 1"},
+        invocation_id="inv-1",
+        adk_confirmation_call_id="adk-1" if kind == "approval" else None,
+    )
+
+
+class RunStoreContract:
+    """Behaviour every RunStorePort implementation must share."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def run_with_store(self, body: Callable[[Any], Awaitable[None]]) -> None:
+        """Run ``body`` against a fresh store in its own event loop."""
+        asyncio.run(body(self.make_store()))
+
+    def test_get_or_create_and_invocation_id(self) -> None:
+        async def run(store) -> None:
+            self.assertIsNone(await store.get("run"))
+            state = await store.get_or_create("run")
+            self.assertEqual((state.run_id, state.session_id), ("run", "run"))
+            await store.set_invocation_id("run", "inv-2")
+            state = await store.get("run")
+            self.assertEqual(state.invocation_id, "inv-2")
+
+        self.run_with_store(run)
+
+    def test_pending_actions_round_trip_and_pop_once(self) -> None:
+        async def run(store) -> None:
+            approval = _action("t1")
+            await store.add_pending_approval("run", approval)
+            await store.add_pending_client_tool("run", _action("t2", "client_tool"))
+            self.assertTrue(await store.has_pending("run"))
+            self.assertEqual(await store.get_pending_approval("run", "t1"), approval)
+            state = await store.get("run")
+            self.assertEqual(list(state.pending_approvals), ["t1"])
+            self.assertEqual(list(state.pending_client_tools), ["t2"])
+
+            self.assertEqual(await store.pop_pending_approval("run", "t1"), approval)
+            self.assertIsNone(await store.pop_pending_approval("run", "t1"))
+            self.assertTrue(await store.has_pending("run"))
+            popped = await store.pop_pending_client_tool("run", "t2")
+            self.assertEqual(popped.kind, "client_tool")
+            self.assertFalse(await store.has_pending("run"))
+
+        self.run_with_store(run)
+
+    def test_concurrent_pops_hand_out_action_once(self) -> None:
+        async def run(store) -> None:
+            await store.add_pending_approval("run", _action("t1"))
+            results = await asyncio.gather(
+                *(store.pop_pending_approval("run", "t1") for _ in range(5))
+            )
+            self.assertEqual(sum(result is not None for result in results), 1)
+
+        self.run_with_store(run)
+
+    def test_unknown_run(self) -> None:
+        async def run(store) -> None:
+            self.assertFalse(await store.has_pending("missing"))
+            self.assertIsNone(await store.pop_pending_client_tool("missing", "t1"))
+            self.assertIsNone(await store.get_pending_approval("missing", "t1"))
+
+        self.run_with_store(run)
+
+
+class InMemoryRunStoreTests(RunStoreContract, unittest.TestCase):
+    def make_store(self) -> InMemoryRunStore:
+        return InMemoryRunStore()
+
+    def test_runs_expire_after_ttl_since_last_use(self) -> None:
+        now = [1000.0]
+        store = InMemoryRunStore(ttl_seconds=60, clock=lambda: now[0])
+
+        async def run() -> None:
+            await store.add_pending_approval("kept", _action("t1"))
+            await store.get_or_create("idle")
+            now[0] += 45
+            self.assertTrue(await store.has_pending("kept"))
+            now[0] += 30
+            self.assertIsNone(await store.get("idle"))
+            self.assertTrue(await store.has_pending("kept"))
+            now[0] += 61
+            await store.get_or_create("new")
+            self.assertEqual(len(store), 1)
+
+        asyncio.run(run())
+
+    def test_max_runs_evicts_least_recently_used(self) -> None:
+        store = InMemoryRunStore(max_runs=2)
+
+        async def run() -> None:
+            await store.get_or_create("a")
+            await store.get_or_create("b")
+            await store.get("a")
+            await store.get_or_create("c")
+            self.assertIsNotNone(await store.get("a"))
+            self.assertIsNone(await store.get("b"))
+            self.assertEqual(len(store), 2)
+
+        asyncio.run(run())
+
+
+@unittest.skipUnless(HAS_FAKEREDIS, "fakeredis is not installed")
+class RedisRunStoreTests(RunStoreContract, unittest.TestCase):
+    def setUp(self) -> None:
+        import fakeredis
+
+        self.server = fakeredis.FakeServer()
+        self.fakeredis = fakeredis
+
+    def make_store(self) -> RedisRunStore:
+        client = self.fakeredis.FakeAsyncRedis(server=self.server)
+        return RedisRunStore("redis://unused", ttl_seconds=60, client=client)
+
+    def test_state_is_shared_between_workers(self) -> None:
+        async def run() -> None:
+            stream_worker, api_worker = self.make_store(), self.make_store()
+            await stream_worker.add_pending_approval("run", _action("t1"))
+            results = await asyncio.gather(
+                stream_worker.pop_pending_approval("run", "t1"),
+                api_worker.pop_pending_approval("run", "t1"),
+            )
+            self.assertEqual(sum(result is not None for result in results), 1)
+
+        asyncio.run(run())
+
+    def test_writes_refresh_ttl(self) -> None:
+        async def run() -> None:
+            store = self.make_store()
+            client = store._redis
+            await store.add_pending_approval("run", _action("t1"))
+            for key in ("run:run", "run:run:approvals"):
+                ttl = await client.ttl(key)
+                self.assertTrue(0 < ttl <= 60, (key, ttl))
+
+        asyncio.run(run())
+
+
+class PostgresRunStoreTests(unittest.TestCase):
+    def test_requires_exactly_one_pool_source(self) -> None:
+        with self.assertRaises(ValueError):
+            PostgresRunStore()
+        with self.assertRaises(ValueError):
+            PostgresRunStore(pool_factory=lambda: None, dsn="postgresql://x/y")
+
+    def test_row_to_action_decodes_kind_input_and_time(self) -> None:
+        created_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+        action = _row_to_action(
+            {
+                "tool_call_id": "t1",
+                "kind": "c",
+                "tool_name": "export_csv",
+                "tool_input": '{"artifact_id": "a1"}',
+                "invocation_id": "inv-1",
+                "adk_confirmation_call_id": None,
+                "created_at": created_at,
+            }
+        )
+        self.assertEqual(action.kind, "client_tool")
+        self.assertEqual(action.tool_input, {"artifact_id": "a1"})
+        self.assertIsNone(action.created_at.tzinfo)
+        self.assertEqual(action.created_at.astimezone(UTC), created_at)
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "TEST_DATABASE_URL is not set")
+class PostgresRunStoreContractTests(RunStoreContract, unittest.TestCase):
+    def run_with_store(self, body: Callable[[Any], Awaitable[None]]) -> None:
+        async def run() -> None:
+            store = PostgresRunStore(
+                dsn=TEST_DATABASE_URL, ttl_seconds=60, sweep_interval_seconds=0
+            )
+            await store.start()
+            try:
+                await self._execute(store, "TRUNCATE run_states, run_pending_actions")
+                await body(store)
+            finally:
+                await store.close()
+
+        asyncio.run(run())
+
+    async def _execute(self, store: PostgresRunStore, sql: str, *args) -> None:
+        async with store._pool().acquire() as conn:
+            await conn.execute(sql, *args)
+
+    async def _age(self, store: PostgresRunStore, run_id: str, seconds: int) -> None:
+        """Backdate a run and its pending actions by ``seconds``."""
+        for table, column in (
+            ("run_states", "updated_at"),
+            ("run_pending_actions", "created_at"),
+        ):
+            await self._execute(
+                store,
+                f"UPDATE {table} SET {column} = {column}"
+                " - make_interval(secs => $2) WHERE run_id = $1",
+                run_id,
+                float(seconds),
+            )
+
+    def test_expired_rows_are_hidden_from_reads(self) -> None:
+        async def run(store: PostgresRunStore) -> None:
+            await store.add_pending_approval("old", _action("t1"))
+            await store.add_pending_approval("new", _action("t1"))
+            await self._age(store, "old", 120)
+            self.assertIsNone(await store.get("old"))
+            self.assertFalse(await store.has_pending("old"))
+            self.assertIsNone(await store.get_pending_approval("old", "t1"))
+            self.assertIsNone(await store.pop_pending_approval("old", "t1"))
+            self.assertTrue(await store.has_pending("new"))
+
+        self.run_with_store(run)
+
+    def test_pending_actions_live_as_long_as_their_run(self) -> None:
+        async def run(store: PostgresRunStore) -> None:
+            await store.add_pending_approval("run", _action("t1"))
+            await self._age(store, "run", 120)
+            # A later write to the run keeps its older pending actions, as
+            # in redis where every write refreshes all of the run's keys.
+            await self._execute(
+                store,
+                "UPDATE run_states SET updated_at = now() WHERE run_id = $1",
+                "run",
+            )
+            self.assertTrue(await store.has_pending("run"))
+            self.assertIsNotNone(await store.pop_pending_approval("run", "t1"))
+
+        self.run_with_store(run)
+
+    def test_write_to_expired_run_starts_it_over(self) -> None:
+        async def run(store: PostgresRunStore) -> None:
+            await store.add_pending_approval("run", _action("t1"))
+            await store.set_invocation_id("run", "inv-old")
+            await self._age(store, "run", 120)
+
+            state = await store.get_or_create("run")
+            self.assertIsNone(state.invocation_id)
+            self.assertEqual(state.pending_approvals, {})
+            self.assertIsNone(await store.get_pending_approval("run", "t1"))
+
+            await store.set_invocation_id("run", "inv-old")
+            await self._age(store, "run", 120)
+            await store.add_pending_approval("run", _action("t2"))
+            state = await store.get("run")
+            self.assertIsNone(state.invocation_id)
+            self.assertEqual(list(state.pending_approvals), ["t2"])
+
+        self.run_with_store(run)
+
+    def test_sweep_deletes_expired_rows_in_batches(self) -> None:
+        async def run(store: PostgresRunStore) -> None:
+            store._sweep_batch = 2
+            for run_id in ("a", "b", "c"):
+                await store.add_pending_approval(run_id, _action("t1"))
+            await store.add_pending_approval("kept", _action("t1"))
+            for run_id in ("a", "b", "c"):
+                await self._age(store, run_id, 120)
+            # Three pending rows and three run rows, two per statement.
+            self.assertEqual(await store.sweep(), 6)
+            self.assertEqual(await store.sweep(), 0)
+            self.assertIsNotNone(await store.get_pending_approval("kept", "t1"))
+
+        self.run_with_store(run)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import io
+import os
+import sys
+import unittest
+from datetime import UTC, datetime
+
+import pandas as pd
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.store.s3_artifact_store import S3ArtifactStore  # noqa: E402
+
+
+class _MemoryS3Client:
+    """The slice of the boto3 S3 client the store uses, kept in a dict."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def put_object(self, *, Bucket, Key, Body, ContentType) -> None:
+        self.objects[Key] = Body
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None) -> None:
+        self.objects[key] = fileobj.read()
+
+    def get_object(self, *, Bucket, Key) -> dict:
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+
+class _MemoryS3ArtifactStore(S3ArtifactStore):
+    @staticmethod
+    def _build_client(**_kwargs) -> _MemoryS3Client:
+        return _MemoryS3Client()
+
+
+class S3ArtifactStoreTests(unittest.TestCase):
+    def test_streamed_and_stored_tables_serialize_alike(self) -> None:
+        store = _MemoryS3ArtifactStore(
+            bucket="b", prefix="p", region=None, url_expires_in=60, preview_rows=10
+        )
+        columns = ["ts", "tags", "n"]
+        rows = [
+            (datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC), ["a", "b"], 1),
+            (None, [], None),
+        ]
+        writer = store.open_table("run", columns)
+        writer.write_rows(rows)
+        streamed = writer.close()
+        stored = store.store_table(
+            "run", pd.DataFrame([dict(zip(columns, row)) for row in rows])
+        )
+
+        def files(ref):
+            return [
+                store._client.objects[store._key("run", ref.id, name)]
+                for name in ("data.csv", "preview.json")
+            ]
+
+        self.assertEqual(files(streamed), files(stored))
+        preview = store.get_preview("run", streamed.id)
+        self.assertEqual(preview.rows[0]["ts"], "2026-01-02 03:04:05+00:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.tools.schema_cache import SchemaCache  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SchemaCacheTests(unittest.TestCase):
+    def test_hit_within_ttl(self) -> None:
+        clock = FakeClock()
+        cache = SchemaCache(ttl_seconds=10, clock=clock)
+        cache.set("db", "fp1", "schema")
+
+        clock.now = 9
+        self.assertEqual(cache.get("db"), "schema")
+        clock.now = 10
+        self.assertIsNone(cache.get("db"))
+
+    def test_revalidate_same_fingerprint_restarts_ttl(self) -> None:
+        clock = FakeClock()
+        cache = SchemaCache(ttl_seconds=10, clock=clock)
+        cache.set("db", "fp1", "schema")
+
+        clock.now = 15
+        self.assertEqual(cache.revalidate("db", "fp1"), "schema")
+        self.assertEqual(cache.get("db"), "schema")
+
+    def test_revalidate_changed_fingerprint_drops_entry(self) -> None:
+        cache = SchemaCache(ttl_seconds=10, clock=FakeClock())
+        cache.set("db", "fp1", "schema")
+
+        self.assertIsNone(cache.revalidate("db", "fp2"))
+        self.assertIsNone(cache.get("db"))
+
+    def test_invalidate(self) -> None:
+        cache = SchemaCache(ttl_seconds=10, clock=FakeClock())
+        cache.set("a", "fp", "schema a")
+        cache.set("b", "fp", "schema b")
+
+        cache.invalidate("a")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "schema b")
+
+        cache.invalidate()
+        self.assertIsNone(cache.get("b"))
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        cache = SchemaCache(ttl_seconds=0, clock=FakeClock())
+        cache.set("db", "fp", "schema")
+
+        self.assertIsNone(cache.get("db"))
+        self.assertIsNone(cache.revalidate("db", "fp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.seed import RECORD_COLUMNS, SeedConfig, generate_records  # noqa: E402
+
+
+class SeedTests(unittest.TestCase):
+    def test_generates_requested_row_count(self) -> None:
+        rows = list(generate_records(SeedConfig(rows=1234, seed=1)))
+
+        self.assertEqual(len(rows), 1234)
+        self.assertTrue(all(len(row) == len(RECORD_COLUMNS) for row in rows))
+
+    def test_parent_spans_belong_to_same_trace(self) -> None:
+        rows = list(generate_records(SeedConfig(rows=500, spans_per_trace=6, seed=2)))
+        trace_idx = RECORD_COLUMNS.index("trace_id")
+        span_idx = RECORD_COLUMNS.index("span_id")
+        parent_idx = RECORD_COLUMNS.index("parent_span_id")
+
+        spans_by_trace: dict[str, set[str]] = {}
+        for row in rows:
+            seen = spans_by_trace.setdefault(row[trace_idx], set())
+            if row[parent_idx] is not None:
+                self.assertIn(row[parent_idx], seen)
+            seen.add(row[span_idx])
+
+    def test_level_weights(self) -> None:
+        config = SeedConfig(rows=200, level_weights={"error": 1.0}, seed=3)
+        level_idx = RECORD_COLUMNS.index("level")
+
+        levels = {row[level_idx] for row in generate_records(config)}
+
+        self.assertEqual(levels, {"error"})
+
+
+if __name__ == "__main__":
+    unittest.main()
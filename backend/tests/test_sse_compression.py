@@ -0,0 +1,56 @@
+import asyncio
+import os
+import sys
+import unittest
+import zlib
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.adapters.sse_compression import (  # noqa: E402
+    compress_frames,
+    negotiate_encoding,
+)
+
+ALL = ("zstd", "br", "gzip")
+
+
+class NegotiateEncodingTests(unittest.TestCase):
+    def test_prefers_server_order_at_equal_q(self) -> None:
+        self.assertEqual(negotiate_encoding("gzip, deflate, br, zstd", ALL), "zstd")
+        self.assertEqual(negotiate_encoding("gzip, br", ("gzip",)), "gzip")
+
+    def test_q_values(self) -> None:
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip;q=0.9", ALL), "gzip")
+        self.assertEqual(negotiate_encoding("*;q=0.1, zstd;q=0", ALL), "br")
+        self.assertIsNone(negotiate_encoding("gzip;q=0", ALL))
+
+    def test_identity(self) -> None:
+        self.assertIsNone(negotiate_encoding(None, ALL))
+        self.assertIsNone(negotiate_encoding("identity", ALL))
+        self.assertIsNone(negotiate_encoding("deflate", ALL))
+
+
+class CompressFramesTests(unittest.TestCase):
+    def test_gzip_writes_decode_immediately(self) -> None:
+        frames = [f'data: {{"delta":"tok{i}"}}\n\n'.encode() for i in range(20)]
+
+        async def source():
+            for frame in frames:
+                yield frame
+
+        async def run() -> list[bytes]:
+            return [part async for part in compress_frames(source(), "gzip")]
+
+        parts = asyncio.run(run())
+        self.assertEqual(len(parts), len(frames) + 1)
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for frame, part in zip(frames, parts, strict=False):
+            self.assertEqual(decoder.decompress(part), frame)
+        self.assertEqual(decoder.decompress(parts[-1]), b"")
+        self.assertTrue(decoder.eof)
+
+
+if __name__ == "__main__":
+    unittest.main()
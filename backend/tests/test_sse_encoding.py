@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.adapters.tanstack_stream import (  # noqa: E402
+    ApprovalObj,
+    ApprovalRequestedStreamChunk,
+    ContentStreamChunk,
+    DoneStreamChunk,
+    ErrorObj,
+    ErrorStreamChunk,
+    ToolCall,
+    ToolCallFunction,
+    ToolCallStreamChunk,
+    ToolResultStreamChunk,
+    encode_chunk,
+    encode_done,
+    parse_stream_modes,
+)
+
+BASE = {"id": "run-1", "model": "gemini", "timestamp": 1700000000000}
+
+CHUNKS = [
+    ContentStreamChunk(
+        **BASE, content='He said "héllo"\n\t\\ 🙂', delta="🙂", role="assistant"
+    ),
+    ContentStreamChunk(**BASE, delta="x y"),
+    ToolCallStreamChunk(
+        **BASE,
+        index=0,
+        toolCall=ToolCall(
+            id="call_1",
+            function=ToolCallFunction(name="execute_sql", arguments='{"q": 1}'),
+        ),
+    ),
+    ToolResultStreamChunk(**BASE, toolCallId="call_1", content="ok"),
+    ApprovalRequestedStreamChunk(
+        **BASE,
+        toolCallId="call_2",
+        toolName="execute_sql",
+        input={"query": "SELECT 1", "limit": [1, 2.5, None, True]},
+        approval=ApprovalObj(id="a-1"),
+    ),
+    ErrorStreamChunk(**BASE, error=ErrorObj(message="boom")),
+    DoneStreamChunk(**BASE, finishReason="stop"),
+]
+
+
+class EncodeChunkTests(unittest.TestCase):
+    def test_frames_match_model_dump(self) -> None:
+        for chunk in CHUNKS:
+            with self.subTest(type=chunk.type):
+                frame = encode_chunk(chunk)
+                self.assertIsInstance(frame, bytes)
+                self.assertTrue(frame.startswith(b"data: "))
+                self.assertTrue(frame.endswith(b"\n\n"))
+                self.assertNotIn(b"\n", frame[:-2])
+                expected = chunk.model_dump(by_alias=True)
+                if expected.get("type") == "content" and expected["content"] is None:
+                    del expected["content"]
+                self.assertEqual(json.loads(frame[len(b"data: ") :]), expected)
+
+    def test_content_key_order_matches_model(self) -> None:
+        frame = encode_chunk(CHUNKS[0])
+        keys = list(json.loads(frame[len(b"data: ") :]))
+        self.assertEqual(keys, list(CHUNKS[0].model_dump(by_alias=True)))
+
+    def test_delta_only_content_chunk_omits_content(self) -> None:
+        payload = json.loads(encode_chunk(CHUNKS[1])[len(b"data: ") :])
+        self.assertNotIn("content", payload)
+        self.assertIsNone(payload["role"])
+
+    def test_exclude_constant_keys(self) -> None:
+        frame = encode_chunk(CHUNKS[1], exclude=frozenset({"id", "model"}))
+        payload = json.loads(frame[len(b"data: ") :])
+        self.assertEqual(set(payload), {"timestamp", "type", "delta", "role"})
+
+    def test_parse_stream_modes(self) -> None:
+        self.assertEqual(parse_stream_modes(None), frozenset())
+        self.assertEqual(
+            parse_stream_modes("Compact, delta, bogus"), {"compact", "delta"}
+        )
+
+    def test_done_sentinel(self) -> None:
+        self.assertEqual(encode_done(), b"data: [DONE]\n\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
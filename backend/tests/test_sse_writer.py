@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.adapters.sse_writer import SseWriteStats, sse_frames  # noqa: E402
+from backend.adapters.tanstack_stream import (  # noqa: E402
+    ContentStreamChunk,
+    DoneStreamChunk,
+    ToolResultStreamChunk,
+    encode_chunk,
+)
+
+BASE = {"id": "run-1", "model": "m", "timestamp": 0}
+
+
+def _content(delta: str) -> ContentStreamChunk:
+    return ContentStreamChunk(**BASE, delta=delta, role="assistant")
+
+
+async def _source(items, delays=None):
+    for i, item in enumerate(items):
+        if delays:
+            await asyncio.sleep(delays[i])
+        yield None, item
+
+
+def _collect(chunks, **kwargs) -> list[bytes]:
+    async def run() -> list[bytes]:
+        return [frame async for frame in sse_frames(chunks, **kwargs)]
+
+    return asyncio.run(run())
+
+
+class SseFramesTests(unittest.TestCase):
+    def test_passthrough_writes_every_frame(self) -> None:
+        items = [
+            _content("a"),
+            _content("b"),
+            DoneStreamChunk(**BASE, finishReason="stop"),
+        ]
+        stats = SseWriteStats()
+        frames = _collect(_source(items), stats=stats)
+        self.assertEqual(frames, [encode_chunk(item) for item in items])
+        self.assertEqual((stats.chunks, stats.writes), (3, 3))
+
+    def test_coalesces_within_window(self) -> None:
+        items = [_content(str(i)) for i in range(50)]
+        stats = SseWriteStats()
+        frames = _collect(_source(items), window_seconds=10, stats=stats)
+        self.assertEqual(len(frames), 1)
+        self.assertEqual(frames[0], b"".join(encode_chunk(item) for item in items))
+        self.assertEqual((stats.chunks, stats.writes), (50, 1))
+
+    def test_tool_and_done_chunks_flush_immediately(self) -> None:
+        tool = ToolResultStreamChunk(**BASE, toolCallId="c1", content="ok")
+        done = DoneStreamChunk(**BASE, finishReason="stop")
+        items = [_content("a"), tool, _content("b"), done]
+        frames = _collect(_source(items), window_seconds=10)
+        self.assertEqual(
+            frames,
+            [
+                encode_chunk(items[0]) + encode_chunk(tool),
+                encode_chunk(items[2]) + encode_chunk(done),
+            ],
+        )
+
+    def test_byte_budget_flushes(self) -> None:
+        items = [_content("x" * 100) for _ in range(10)]
+        frame_size = len(encode_chunk(items[0]))
+        frames = _collect(_source(items), window_seconds=10, max_bytes=frame_size * 3)
+        self.assertEqual([len(f) // frame_size for f in frames], [3, 3, 3, 1])
+
+    def test_window_elapses_while_source_stalls(self) -> None:
+        items = [_content("a"), _content("b")]
+        frames = _collect(_source(items, delays=[0, 0.2]), window_seconds=0.02)
+        self.assertEqual(frames, [encode_chunk(item) for item in items])
+
+    def test_source_error_flushes_then_raises(self) -> None:
+        async def failing():
+            yield None, _content("a")
+            raise RuntimeError("boom")
+
+        async def run() -> list[bytes]:
+            frames = []
+            with self.assertRaises(RuntimeError):
+                async for frame in sse_frames(failing(), window_seconds=10):
+                    frames.append(frame)
+            return frames
+
+        self.assertEqual(asyncio.run(run()), [encode_chunk(_content("a"))])
+
+    def test_omit_constant_keys_after_first_frame(self) -> None:
+        items = [_content("a"), _content("b")]
+        frames = _collect(_source(items), omit_constant_keys=True)
+        self.assertIn(b'"id":"run-1"', frames[0])
+        self.assertNotIn(b'"id"', frames[1])
+        self.assertNotIn(b'"model"', frames[1])
+
+    def test_event_ids_are_written(self) -> None:
+        async def source():
+            yield 7, _content("a")
+            yield 8, _content("b")
+
+        frames = _collect(source(), window_seconds=10)
+        self.assertEqual(
+            frames,
+            [
+                encode_chunk(_content("a"), event_id=7)
+                + encode_chunk(_content("b"), event_id=8)
+            ],
+        )
+        self.assertTrue(frames[0].startswith(b"id: 7\ndata: {"))
+
+    def test_latency_counts_time_held_in_window(self) -> None:
+        items = [_content("a"), _content("b")]
+        stats = SseWriteStats()
+        _collect(_source(items, delays=[0, 0.05]), window_seconds=0.2, stats=stats)
+        self.assertEqual(stats.writes, 1)
+        held_first, held_second = stats.chunk_latencies
+        # "a" is held until "b" arrives ~50 ms later; "b" goes out at once.
+        self.assertGreaterEqual(held_first, 0.04)
+        self.assertLess(held_second, held_first)
+
+    def test_producer_is_finished_when_client_disconnects(self) -> None:
+        finished = []
+
+        async def endless():
+            try:
+                while True:
+                    yield None, _content("a")
+                    await asyncio.sleep(0)
+            finally:
+                finished.append(True)
+
+        async def run() -> None:
+            frames = sse_frames(endless(), window_seconds=10, max_bytes=1)
+            await anext(frames)
+            await frames.aclose()
+            self.assertEqual(finished, [True])
+
+        asyncio.run(run())
+
+    def test_latency_percentiles(self) -> None:
+        stats = SseWriteStats(chunk_latencies=[0.001 * i for i in range(1, 101)])
+        self.assertAlmostEqual(stats.latency_percentile(50), 0.050)
+        self.assertAlmostEqual(stats.latency_percentile(99), 0.099)
+        self.assertEqual(SseWriteStats().latency_percentile(99), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.adapters.tanstack_stream import ContentStreamChunk  # noqa: E402
+from backend.stream_buffer import (  # noqa: E402
+    ReplayGapError,
+    RunStreamBuffer,
+    RunStreamRegistry,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _content(delta: str) -> ContentStreamChunk:
+    return ContentStreamChunk(id="run-1", model="m", timestamp=0, delta=delta)
+
+
+async def _read(stream: RunStreamBuffer, after: int = 0) -> list[tuple[int, str]]:
+    return [(event_id, chunk.delta) async for event_id, chunk in stream.follow(after)]
+
+
+class RunStreamBufferTests(unittest.TestCase):
+    def test_replay_after_event_id(self) -> None:
+        stream = RunStreamBuffer(capacity=10)
+        for delta in "abc":
+            stream.append(_content(delta))
+        stream.close(now=0)
+
+        self.assertEqual(asyncio.run(_read(stream)), [(1, "a"), (2, "b"), (3, "c")])
+        self.assertEqual(asyncio.run(_read(stream, after=2)), [(3, "c")])
+        self.assertEqual(asyncio.run(_read(stream, after=3)), [])
+
+    def test_follow_waits_for_live_chunks(self) -> None:
+        async def run() -> list[tuple[int, str]]:
+            stream = RunStreamBuffer(capacity=10)
+            reader = asyncio.create_task(_read(stream))
+            for delta in "ab":
+                await asyncio.sleep(0)
+                stream.append(_content(delta))
+            await asyncio.sleep(0)
+            stream.close(now=0)
+            return await reader
+
+        self.assertEqual(asyncio.run(run()), [(1, "a"), (2, "b")])
+
+    def test_evicted_events_raise_gap(self) -> None:
+        stream = RunStreamBuffer(capacity=2)
+        for delta in "abcd":
+            stream.append(_content(delta))
+        stream.close(now=0)
+
+        self.assertEqual(asyncio.run(_read(stream, after=2)), [(3, "c"), (4, "d")])
+        with self.assertRaises(ReplayGapError):
+            asyncio.run(_read(stream, after=1))
+
+
+class RunStreamRegistryTests(unittest.TestCase):
+    def test_start_drains_source_without_a_reader(self) -> None:
+        async def source():
+            for delta in "xyz":
+                yield _content(delta)
+
+        async def run() -> RunStreamBuffer:
+            registry = RunStreamRegistry(capacity=10, retention_seconds=60)
+            stream = registry.start("run-1", source())
+            await stream.task
+            self.assertIs(registry.get("run-1"), stream)
+            return stream
+
+        stream = asyncio.run(run())
+        self.assertTrue(stream.closed)
+        self.assertEqual(stream.last_id, 3)
+
+    def test_new_turn_continues_event_ids(self) -> None:
+        registry = RunStreamRegistry(capacity=10, retention_seconds=60)
+        first = registry.create("run-1")
+        first.append(_content("a"))
+        first.append(_content("b"))
+        registry.close(first)
+
+        second = registry.create("run-1")
+        second.append(_content("c"))
+        registry.close(second)
+        self.assertEqual(asyncio.run(_read(second, after=2)), [(3, "c")])
+        with self.assertRaises(ReplayGapError):
+            asyncio.run(_read(second, after=1))
+
+    def test_closed_streams_expire_after_retention(self) -> None:
+        clock = FakeClock()
+        registry = RunStreamRegistry(capacity=10, retention_seconds=60, clock=clock)
+        open_stream = registry.create("open")
+        registry.close(registry.create("done"))
+
+        clock.now = 59
+        self.assertIsNotNone(registry.get("done"))
+        clock.now = 60
+        self.assertEqual(registry.prune(), 1)
+        self.assertIsNone(registry.get("done"))
+        self.assertIs(registry.get("open"), open_stream)
+
+    def test_failed_run_ends_with_error_and_done(self) -> None:
+        async def source():
+            yield _content("a")
+            raise RuntimeError("model went away")
+
+        async def run() -> RunStreamBuffer:
+            registry = RunStreamRegistry(capacity=10, retention_seconds=60)
+            stream = registry.start("run-1", source())
+            await stream.task
+            return stream
+
+        stream = asyncio.run(run())
+        chunks = [chunk for _, chunk in _drain(stream)]
+        self.assertEqual([c.type for c in chunks], ["content", "error", "done"])
+        self.assertEqual(chunks[1].error.code, "run_failed")
+        self.assertTrue(stream.closed)
+
+    def test_new_turn_stops_previous_pump(self) -> None:
+        async def endless():
+            while True:
+                yield _content("x")
+                await asyncio.sleep(0.01)
+
+        async def run() -> None:
+            registry = RunStreamRegistry(capacity=10, retention_seconds=60)
+            first = registry.start("run-1", endless())
+            await asyncio.sleep(0.02)
+            second = registry.create("run-1")
+            await asyncio.sleep(0)
+            self.assertTrue(first.task.cancelled() or first.task.done())
+            self.assertTrue(first.closed)
+            events = [event async for event in first.follow()]
+            self.assertEqual([c.type for _, c in events][-2:], ["error", "done"])
+            self.assertEqual(second.first_id, first.last_id + 1)
+
+        asyncio.run(run())
+
+    def test_max_runs_drops_closed_buffers_before_stopping_runs(self) -> None:
+        registry = RunStreamRegistry(capacity=10, retention_seconds=60, max_runs=2)
+        oldest_open = registry.create("open-1")
+        registry.close(registry.create("done"))
+        registry.create("open-2")
+        self.assertIsNone(registry.get("done"))
+        self.assertIs(registry.get("open-1"), oldest_open)
+        self.assertFalse(oldest_open.closed)
+
+        registry.create("open-3")
+        self.assertIsNone(registry.get("open-1"))
+        self.assertTrue(oldest_open.closed)
+        self.assertEqual(len(registry), 2)
+
+
+def _drain(stream: RunStreamBuffer) -> list:
+    async def run() -> list:
+        return [event async for event in stream.follow()]
+
+    return asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
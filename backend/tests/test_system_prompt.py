@@ -0,0 +1,45 @@
+import os
+import sys
+import unittest
+from datetime import date
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from backend.agents.sql_agent.prompt import SystemPromptCache  # noqa: E402
+
+
+class SystemPromptCacheTests(unittest.TestCase):
+    def test_rerenders_on_date_rollover_only(self) -> None:
+        today = date(2024, 1, 1)
+        cache = SystemPromptCache(today=lambda: today)
+
+        first = cache.render()
+        self.assertIs(cache.render(), first)
+        self.assertIn("2024-01-01", first)
+
+        today = date(2024, 1, 2)
+        second = cache.render()
+        self.assertIn("2024-01-02", second)
+        self.assertTrue(second.startswith(cache.prefix))
+
+    def test_prefix_hash_is_date_independent(self) -> None:
+        a = SystemPromptCache(today=lambda: date(2024, 1, 1))
+        b = SystemPromptCache(today=lambda: date(2030, 6, 1))
+
+        self.assertEqual(a.prefix_hash, b.prefix_hash)
+        self.assertNotIn("2024-01-01", a.prefix)
+
+    def test_update_invalidates(self) -> None:
+        cache = SystemPromptCache(today=lambda: date(2024, 1, 1))
+        old_hash = cache.prefix_hash
+
+        cache.update(examples=[{"request": "r", "response": "SELECT 1"}])
+
+        self.assertNotEqual(cache.prefix_hash, old_hash)
+        self.assertIn("<request>r</request>", cache.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
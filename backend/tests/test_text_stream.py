@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+)
+
+from google.adk.events.event import Event  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from backend.adapters.adk_to_tanstack import (  # noqa: E402
+    TanStackAdkAdapter,
+    TextAccumulator,
+)
+from backend.adapters.tanstack_stream import encode_chunk  # noqa: E402
+from backend.store.run_store import InMemoryRunStore  # noqa: E402
+
+
+def _event(text: str, *, partial: bool | None) -> Event:
+    return Event(
+        author="sql_agent",
+        partial=partial,
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+    )
+
+
+def _collect(adapter: TanStackAdkAdapter, events: list[Event]) -> list:
+    async def run() -> list:
+        chunks = []
+        for event in events:
+            async for chunk in adapter._event_to_chunks(event):
+                chunks.append(chunk)
+        return chunks
+
+    return asyncio.run(run())
+
+
+def _adapter(*, delta_only: bool = False) -> TanStackAdkAdapter:
+    return TanStackAdkAdapter(
+        run_id="run-1",
+        model="test-model",
+        runner=None,
+        run_store=InMemoryRunStore(),
+        user_id="user",
+        delta_only=delta_only,
+    )
+
+
+class TextAccumulatorTests(unittest.TestCase):
+    def test_append_and_prefix(self) -> None:
+        acc = TextAccumulator()
+        self.assertTrue(acc.is_prefix_of("anything"))
+        acc.append("Hel")
+        acc.append("")
+        acc.append("lo")
+        self.assertEqual(len(acc), 5)
+        self.assertTrue(acc.is_prefix_of("Hello, world"))
+        self.assertFalse(acc.is_prefix_of("Help"))
+        self.assertFalse(acc.is_prefix_of("Hell"))
+        self.assertEqual(acc.text(), "Hello")
+        acc.append("!")
+        self.assertEqual(acc.text(), "Hello!")
+
+
+class AdapterTextTests(unittest.TestCase):
+    events = [
+        _event("Hello", partial=True),
+        _event(", wor", partial=True),
+        _event("Hello, world", partial=False),
+    ]
+
+    def test_full_content_mode(self) -> None:
+        chunks = _collect(_adapter(), self.events)
+        self.assertEqual([c.delta for c in chunks], ["Hello", ", wor", "ld"])
+        self.assertEqual(
+            [c.content for c in chunks], ["Hello", "Hello, wor", "Hello, world"]
+        )
+
+    def test_delta_only_mode_omits_content(self) -> None:
+        chunks = _collect(_adapter(delta_only=True), self.events)
+        self.assertEqual("".join(c.delta for c in chunks), "Hello, world")
+        payload = json.loads(encode_chunk(chunks[-1])[len("data: ") :])
+        self.assertNotIn("content", payload)
+        self.assertEqual(payload["delta"], "ld")
+        self.assertEqual(payload["role"], "assistant")
+
+    def test_final_text_not_matching_prefix_is_appended(self) -> None:
+        chunks = _collect(
+            _adapter(),
+            [_event("Hi", partial=True), _event("Other", partial=False)],
+        )
+        self.assertEqual(chunks[-1].delta, "Other")
+        self.assertEqual(chunks[-1].content, "HiOther")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark result decoding for execute_sql: row dicts vs columnar arrays.
+
+- ``rows``: the default path, ``pd.DataFrame([dict(r) for r in rows])``
+- ``columnar``: ``ColumnarBuilder`` typed column arrays -> zero-copy DataFrame
+
+Input rows are synthetic ``records`` rows (jsonb attributes, text[] tags) from
+``backend.seed``. Each mode runs in its own subprocess so peak RSS is isolated.
+
+    uv run --project backend python scripts/bench_columnar.py --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+# asyncpg type names of the records columns, in RECORD_COLUMNS order
+RECORD_TYPES = [
+    "timestamptz",
+    "timestamptz",
+    "timestamptz",
+    "text",
+    "text",
+    "text",
+    "log_level",
+    "text",
+    "text",
+    "text",
+    "jsonb",
+    "_text",
+    "bool",
+    "text",
+    "text",
+]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_mode(mode: str, row_count: int, batch_size: int) -> dict[str, float]:
+    import pandas as pd
+
+    from backend.columnar import ColumnarBuilder
+    from backend.seed import RECORD_COLUMNS, SeedConfig, generate_records
+
+    rows = list(generate_records(SeedConfig(rows=row_count, seed=0)))
+    columns = list(RECORD_COLUMNS)
+    baseline_rss = _peak_rss_mb()
+
+    start = time.perf_counter()
+    if mode == "rows":
+        df = pd.DataFrame([dict(zip(columns, row, strict=True)) for row in rows])
+    else:
+        builder = ColumnarBuilder(columns, RECORD_TYPES)
+        for offset in range(0, len(rows), batch_size):
+            builder.append(rows[offset : offset + batch_size])
+        df = builder.build().to_dataframe()
+    seconds = time.perf_counter() - start
+
+    return {
+        "rows": len(df),
+        "seconds": seconds,
+        "rows_per_second": len(df) / seconds if seconds else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "peak_rss_delta_mb": _peak_rss_mb() - baseline_rss,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Columnar decoding benchmark")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--mode", choices=("rows", "columnar"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_run_mode(args.mode, args.rows, args.batch_size)))
+        return 0
+
+    for mode in ("rows", "columnar"):
+        out = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--mode",
+                mode,
+                "--rows",
+                str(args.rows),
+                "--batch-size",
+                str(args.batch_size),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        result = json.loads(out.stdout)
+        print(
+            f"{mode:<9} rows={result['rows']:<9,} "
+            f"{result['rows_per_second']:>12,.0f} rows/s "
+            f"peak_rss={result['peak_rss_mb']:8.1f} MiB "
+            f"(+{result['peak_rss_delta_mb']:.1f} MiB during decode)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
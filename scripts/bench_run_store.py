@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark RunStorePort backends on a HITL round-trip per run:
+``get_or_create``, ``set_invocation_id``, ``add_pending_approval``,
+``has_pending``, ``pop_pending_approval``.
+
+``memory`` is the in-process store. ``redis`` uses ``--redis-url`` when
+given, else an in-process fakeredis server (measures client and encoding
+overhead, not network latency). ``postgres`` runs only with
+``--database-url`` (its tables are created on start).
+
+    uv run --project backend python scripts/bench_run_store.py --runs 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from backend.domain.models import PendingAction
+from backend.ports import RunStorePort
+from backend.store.postgres_run_store import PostgresRunStore
+from backend.store.redis_run_store import RedisRunStore
+from backend.store.run_store import InMemoryRunStore
+
+
+def _redis_store(url: str | None) -> RedisRunStore:
+    if url:
+        return RedisRunStore(url)
+    import fakeredis
+
+    return RedisRunStore("redis://fakeredis", client=fakeredis.FakeAsyncRedis())
+
+
+async def _round_trips(store: RunStorePort, runs: int, concurrency: int) -> float:
+    async def one(index: int) -> None:
+        run_id = f"bench-{index}"
+        await store.get_or_create(run_id)
+        await store.set_invocation_id(run_id, "inv")
+        await store.add_pending_approval(
+            run_id,
+            PendingAction(
+                kind="approval",
+                tool_call_id="t1",
+                tool_name="run_sql",
+                tool_input={"sql": "select 1"},
+                invocation_id="inv",
+                adk_confirmation_call_id="adk",
+            ),
+        )
+        assert await store.has_pending(run_id)
+        assert await store.pop_pending_approval(run_id, "t1") is not None
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(index: int) -> None:
+        async with semaphore:
+            await one(index)
+
+    await store.start()
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(limited(i) for i in range(runs)))
+        return time.perf_counter() - start
+    finally:
+        await store.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run store benchmark")
+    parser.add_argument("--runs", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    backends = {
+        "memory": InMemoryRunStore,
+        "redis": lambda: _redis_store(args.redis_url),
+    }
+    if args.database_url:
+        backends["postgres"] = lambda: PostgresRunStore(
+            dsn=args.database_url, sweep_interval_seconds=0
+        )
+    for label, factory in backends.items():
+        elapsed = asyncio.run(_round_trips(factory(), args.runs, args.concurrency))
+        print(
+            f"{label:<7} {args.runs / elapsed:10.0f} round-trips/s "
+            f"{elapsed / args.runs * 1e6:8.1f} us/round-trip (5 ops)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
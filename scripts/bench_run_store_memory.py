@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Measure memory held by ``InMemoryRunStore`` after creating many runs, as
+happens when every anonymous chat gets a fresh ``run_id``.
+
+- ``legacy``: plain dict of ``RunState`` without ``__slots__`` or
+  ``updated_at`` (the old layout, rebuilt here for comparison)
+- ``unbounded``: the current store with no TTL or cap
+- ``capped``: the current store with ``--max-runs``
+
+Reports runs kept and bytes allocated (tracemalloc) in total and per kept
+run.
+
+    uv run --project backend python scripts/bench_run_store_memory.py --runs 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from backend.domain.models import PendingAction
+from backend.store.run_store import InMemoryRunStore
+
+
+@dataclass
+class _LegacyRunState:
+    run_id: str
+    session_id: str
+    invocation_id: str | None = None
+    pending_approvals: dict[str, PendingAction] = field(default_factory=dict)
+    pending_client_tools: dict[str, PendingAction] = field(default_factory=dict)
+
+
+def _legacy(run_ids: list[str]) -> dict[str, _LegacyRunState]:
+    runs: dict[str, _LegacyRunState] = {}
+    for run_id in run_ids:
+        runs[run_id] = _LegacyRunState(run_id=run_id, session_id=run_id)
+    return runs
+
+
+def _store(run_ids: list[str], max_runs: int | None) -> InMemoryRunStore:
+    store = InMemoryRunStore(ttl_seconds=86400, max_runs=max_runs)
+
+    async def fill() -> None:
+        for run_id in run_ids:
+            await store.get_or_create(run_id)
+
+    asyncio.run(fill())
+    return store
+
+
+def _measure(label: str, fn) -> None:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = fn()
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    kept = len(held)
+    print(
+        f"{label:<10} {kept:>8} runs kept {current / 1e6:8.1f} MB "
+        f"{current / kept:6.1f} B/kept run {elapsed:6.2f} s"
+    )
+    del held
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run store memory benchmark")
+    parser.add_argument("--runs", type=int, default=1_000_000)
+    parser.add_argument("--max-runs", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Created up front so the run ids themselves are not counted.
+    run_ids = [f"{i:032x}" for i in range(args.runs)]
+    _measure("legacy", lambda: _legacy(run_ids))
+    _measure("unbounded", lambda: _store(run_ids, None))
+    _measure("capped", lambda: _store(run_ids, args.max_runs))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
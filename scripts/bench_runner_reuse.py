@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark per-request setup cost of the chat endpoint's agent runner.
+
+- ``rebuild``: build tools, LlmAgent, App and Runner (and render the system
+  prompt) for every request, as /api/chat used to
+- ``reuse``: share one runner and bind the request's Deps with ``use_deps``
+
+No database or LLM is needed; only the setup path is timed.
+
+    uv run --project backend python scripts/bench_runner_reuse.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+
+from backend.agents.sql_agent.agent import create_runner
+from backend.deps import Deps, use_deps
+from backend.settings import get_settings
+from backend.store import InMemoryArtifactStore
+
+
+def _bench(label: str, iterations: int, fn) -> float:
+    # Warm up imports and caches before timing.
+    for _ in range(min(iterations, 10)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_request_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"{label:<8} {per_request_us:10.1f} us/request")
+    return per_request_us
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Runner reuse microbenchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    session_service = InMemorySessionService()
+    artifact_store = InMemoryArtifactStore()
+    shared_runner = create_runner(settings=settings, session_service=session_service)
+
+    def rebuild() -> None:
+        deps = Deps(pool=None, run_id="bench", artifact_store=artifact_store)
+        with use_deps(deps):
+            create_runner(settings=settings, session_service=session_service)
+
+    def reuse() -> None:
+        deps = Deps(pool=None, run_id="bench", artifact_store=artifact_store)
+        with use_deps(deps):
+            assert shared_runner is not None
+
+    rebuild_us = _bench("rebuild", args.iterations, rebuild)
+    reuse_us = _bench("reuse", args.iterations, reuse)
+    print(
+        f"saved    {rebuild_us - reuse_us:10.1f} us/request "
+        f"({rebuild_us / reuse_us:.0f}x less setup)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark SSE write coalescing for a fast-streaming model.
+
+A synthetic source emits ``--tokens`` content chunks in bursts (as model
+streams typically arrive) with a tool result in the middle, and each
+coalescing window is reported as writes/response plus p50/p99 latency from
+a chunk leaving the source to its write (what the window costs). No LLM or
+server is needed.
+
+    uv run --project backend python scripts/bench_sse_coalesce.py --windows 0,10,30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import random
+from collections.abc import AsyncIterator
+
+from backend.adapters.sse_writer import SseWriteStats, StreamEvent, sse_frames
+from backend.adapters.tanstack_stream import (
+    ContentStreamChunk,
+    DoneStreamChunk,
+    ToolResultStreamChunk,
+)
+
+BASE = {"id": "bench", "model": "bench", "timestamp": 0}
+
+
+async def _source(
+    tokens: int, burst: int, gap_ms: float, seed: int
+) -> AsyncIterator[StreamEvent]:
+    rng = random.Random(seed)
+    event_ids = itertools.count(1)
+    for i in range(tokens):
+        if i == tokens // 2:
+            tool = ToolResultStreamChunk(**BASE, toolCallId="call_1", content="ok")
+            yield next(event_ids), tool
+        content = ContentStreamChunk(**BASE, delta=f" tok{i}", role="assistant")
+        yield next(event_ids), content
+        if i % burst == burst - 1:
+            await asyncio.sleep(rng.expovariate(1 / (gap_ms / 1000)))
+    yield next(event_ids), DoneStreamChunk(**BASE, finishReason="stop")
+
+
+async def _run(window_ms: float, args) -> SseWriteStats:
+    stats = SseWriteStats()
+    chunks = _source(args.tokens, args.burst, args.gap_ms, args.seed)
+    async for _ in sse_frames(
+        chunks, window_seconds=window_ms / 1000, max_bytes=args.max_bytes, stats=stats
+    ):
+        pass
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SSE coalescing benchmark")
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--burst", type=int, default=4, help="Chunks per burst")
+    parser.add_argument("--gap-ms", type=float, default=2.0, help="Mean burst gap")
+    parser.add_argument("--windows", default="0,10,20,30", help="Windows in ms")
+    parser.add_argument("--max-bytes", type=int, default=16384)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'window':>8} {'chunks':>7} {'writes':>7} {'p50 lat':>10} {'p99 lat':>10}")
+    for window in (float(w) for w in args.windows.split(",")):
+        summary = asyncio.run(_run(window, args)).summary()
+        print(
+            f"{window:6.0f}ms {summary['chunks']:7d} {summary['writes']:7d} "
+            f"{summary['latency_p50_ms']:8.2f}ms {summary['latency_p99_ms']:8.2f}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Byte-count benchmark for chat stream modes and SSE compression.
+
+Replays recorded /api/chat sessions (raw SSE bodies, e.g. captured with
+``curl -N ... > session.sse``) or, without ``--session``, a synthetic
+analysis session, and reports bytes on the wire per stream mode
+(``X-Stream-Mode``) and Content-Encoding, compressing with a sync flush
+per chunk as the server does.
+
+    uv run --project backend python scripts/bench_sse_compression.py --session a.sse
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import typing
+from pathlib import Path
+
+from backend.adapters.adk_to_tanstack import TextAccumulator
+from backend.adapters.sse_compression import available_encodings, create_compressor
+from backend.adapters.tanstack_stream import (
+    STREAM_CONSTANT_KEYS,
+    ContentStreamChunk,
+    DoneStreamChunk,
+    StreamChunk,
+    ToolCall,
+    ToolCallFunction,
+    ToolCallStreamChunk,
+    ToolResultStreamChunk,
+    encode_chunk,
+    encode_done,
+)
+
+CHUNK_TYPES = {
+    typing.get_args(cls.model_fields["type"].annotation)[0]: cls
+    for cls in typing.get_args(StreamChunk)
+}
+
+
+def _load_session(path: Path) -> list[StreamChunk]:
+    chunks = []
+    for event in path.read_text(encoding="utf-8").split("\n\n"):
+        for line in event.splitlines():
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            payload = json.loads(line[len("data: ") :])
+            chunks.append(CHUNK_TYPES[payload["type"]].model_validate(payload))
+    return chunks
+
+
+def _synthetic_session(tokens: int) -> list[StreamChunk]:
+    base = {"id": "0f6c3f4ad1b94e0c9b1f2d6e8a7c5b31", "model": "gemini-2.5-flash"}
+    chunks: list[StreamChunk] = []
+    text = TextAccumulator()
+    timestamp = 1_760_000_000_000
+    for i in range(tokens):
+        if i == tokens // 3:
+            chunks.append(
+                ToolCallStreamChunk(
+                    **base,
+                    timestamp=timestamp,
+                    index=0,
+                    toolCall=ToolCall(
+                        id="call_1",
+                        function=ToolCallFunction(
+                            name="execute_sql",
+                            arguments='{"query": "SELECT level, count(*) FROM records GROUP BY 1"}',
+                        ),
+                    ),
+                )
+            )
+            chunks.append(
+                ToolResultStreamChunk(
+                    **base,
+                    timestamp=timestamp,
+                    toolCallId="call_1",
+                    content='{"row_count": 5, "artifact_id": "a1"}',
+                )
+            )
+        delta = f" word{i % 211}"
+        text.append(delta)
+        timestamp += 17
+        chunks.append(
+            ContentStreamChunk(
+                **base,
+                timestamp=timestamp,
+                content=text.text(),
+                delta=delta,
+                role="assistant",
+            )
+        )
+    chunks.append(DoneStreamChunk(**base, timestamp=timestamp, finishReason="stop"))
+    return chunks
+
+
+def _frames(chunks: list[StreamChunk], *, delta: bool, compact: bool) -> list[bytes]:
+    frames = []
+    for i, chunk in enumerate(chunks):
+        if delta and isinstance(chunk, ContentStreamChunk):
+            chunk = chunk.model_copy(update={"content": None})
+        exclude = STREAM_CONSTANT_KEYS if compact and i > 0 else None
+        frames.append(encode_chunk(chunk, exclude=exclude))
+    frames.append(encode_done())
+    return frames
+
+
+def _wire_bytes(frames: list[bytes], encoding: str | None) -> int:
+    if encoding is None:
+        return sum(len(frame) for frame in frames)
+    compressor = create_compressor(encoding)
+    total = sum(len(compressor.compress(frame)) for frame in frames)
+    return total + len(compressor.finish())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SSE byte-count benchmark")
+    parser.add_argument("--session", type=Path, action="append", default=[])
+    parser.add_argument("--tokens", type=int, default=2000)
+    args = parser.parse_args()
+
+    sessions = [_load_session(path) for path in args.session] or [
+        _synthetic_session(args.tokens)
+    ]
+    encodings: list[str | None] = [None, *available_encodings()]
+    modes = {
+        "full": (False, False),
+        "compact": (False, True),
+        "delta": (True, False),
+        "delta,compact": (True, True),
+    }
+
+    header = "".join(f"{enc or 'identity':>12}" for enc in encodings)
+    print(f"{'mode':<14}{header}")
+    for label, (delta, compact) in modes.items():
+        totals = [0] * len(encodings)
+        for chunks in sessions:
+            frames = _frames(chunks, delta=delta, compact=compact)
+            for i, encoding in enumerate(encodings):
+                totals[i] += _wire_bytes(frames, encoding)
+        print(f"{label:<14}" + "".join(f"{total:12,d}" for total in totals))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark SSE chunk encoding throughput per chunk type on one core.
+
+- ``legacy``: ``model_dump`` + ``json.dumps`` + ``str.encode``, as
+  ``encode_chunk`` used to do
+- ``fast``: the current ``encode_chunk`` (pydantic-core ``to_json``),
+  emitting bytes directly
+
+    uv run --project backend python scripts/bench_sse_encoder.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from backend.adapters.tanstack_stream import (
+    ApprovalObj,
+    ApprovalRequestedStreamChunk,
+    ContentStreamChunk,
+    DoneStreamChunk,
+    ErrorObj,
+    ErrorStreamChunk,
+    StreamChunk,
+    ToolCall,
+    ToolCallFunction,
+    ToolCallStreamChunk,
+    ToolResultStreamChunk,
+    encode_chunk,
+)
+
+BASE = {"id": "3f2b9c1e-run", "model": "gemini-2.5-flash", "timestamp": 1700000000000}
+
+
+def _legacy(chunk: StreamChunk) -> bytes:
+    exclude = None
+    if isinstance(chunk, ContentStreamChunk) and chunk.content is None:
+        exclude = {"content"}
+    payload = json.dumps(
+        chunk.model_dump(by_alias=True, exclude=exclude), ensure_ascii=False
+    )
+    return f"data: {payload}\n\n".encode()
+
+
+def _samples() -> dict[str, StreamChunk]:
+    return {
+        "content(delta)": ContentStreamChunk(**BASE, delta=" rows", role="assistant"),
+        "content(full)": ContentStreamChunk(
+            **BASE, content="The query returned " * 20, delta=" rows", role="assistant"
+        ),
+        "tool_call": ToolCallStreamChunk(
+            **BASE,
+            index=0,
+            toolCall=ToolCall(
+                id="call_1",
+                function=ToolCallFunction(
+                    name="execute_sql",
+                    arguments='{"query": "SELECT level, count(*) FROM records GROUP BY 1"}',
+                ),
+            ),
+        ),
+        "tool_result": ToolResultStreamChunk(
+            **BASE, toolCallId="call_1", content='{"rows": 5, "artifact": "a1"}'
+        ),
+        "approval": ApprovalRequestedStreamChunk(
+            **BASE,
+            toolCallId="call_2",
+            toolName="execute_sql",
+            input={"query": "DELETE FROM records", "limit": 100},
+            approval=ApprovalObj(id="approval-1"),
+        ),
+        "error": ErrorStreamChunk(**BASE, error=ErrorObj(message="timeout")),
+        "done": DoneStreamChunk(**BASE, finishReason="stop"),
+    }
+
+
+def _rate(fn, chunk: StreamChunk, iterations: int) -> float:
+    for _ in range(min(iterations, 1000)):
+        fn(chunk)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(chunk)
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SSE encoder microbenchmark")
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'chunk':<16} {'legacy/s':>12} {'fast/s':>12} {'speedup':>8}")
+    for label, chunk in _samples().items():
+        legacy = _rate(_legacy, chunk, args.iterations)
+        fast = _rate(encode_chunk, chunk, args.iterations)
+        print(f"{label:<16} {legacy:12,.0f} {fast:12,.0f} {fast / legacy:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark text streaming through ``TanStackAdkAdapter`` for a long reply.
+
+- ``legacy``: grow one ``str`` with ``+=`` and send the full text every chunk,
+  as the adapter used to
+- ``full``: ``TextAccumulator`` with the full ``content`` on every chunk
+  (the default wire format)
+- ``delta``: delta-only stream mode (``X-Stream-Mode: delta``)
+
+Reports CPU time per response and bytes on the wire after SSE encoding.
+No LLM is needed; ADK events are synthesised.
+
+    uv run --project backend python scripts/bench_text_stream.py --tokens 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from google.adk.events.event import Event
+from google.genai import types
+
+from backend.adapters.adk_to_tanstack import TanStackAdkAdapter
+from backend.adapters.tanstack_stream import ContentStreamChunk, encode_chunk, now_ms
+from backend.store.run_store import InMemoryRunStore
+
+
+def _events(tokens: int) -> list[Event]:
+    words = [f"tok{i % 97} " for i in range(tokens)]
+    events = [
+        Event(
+            author="sql_agent",
+            partial=True,
+            content=types.Content(role="model", parts=[types.Part(text=word)]),
+        )
+        for word in words
+    ]
+    events.append(
+        Event(
+            author="sql_agent",
+            partial=False,
+            content=types.Content(
+                role="model", parts=[types.Part(text="".join(words))]
+            ),
+        )
+    )
+    return events
+
+
+def _legacy(events: list[Event]) -> int:
+    accumulated = ""
+    wire = 0
+    for event in events:
+        for part in event.content.parts:
+            delta = part.text
+            if not event.partial and delta.startswith(accumulated):
+                delta = delta[len(accumulated) :]
+            accumulated += delta
+            chunk = ContentStreamChunk(
+                id="bench",
+                model="bench",
+                timestamp=now_ms(),
+                content=accumulated,
+                delta=delta,
+                role="assistant",
+            )
+            wire += len(encode_chunk(chunk))
+    return wire
+
+
+def _adapter(events: list[Event], *, delta_only: bool) -> int:
+    adapter = TanStackAdkAdapter(
+        run_id="bench",
+        model="bench",
+        runner=None,
+        run_store=InMemoryRunStore(),
+        user_id="bench",
+        delta_only=delta_only,
+    )
+
+    async def run() -> int:
+        wire = 0
+        for event in events:
+            async for chunk in adapter._event_to_chunks(event):
+                wire += len(encode_chunk(chunk))
+        return wire
+
+    return asyncio.run(run())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Text streaming microbenchmark")
+    parser.add_argument("--tokens", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    events = _events(args.tokens)
+    modes = {
+        "legacy": lambda: _legacy(events),
+        "full": lambda: _adapter(events, delta_only=False),
+        "delta": lambda: _adapter(events, delta_only=True),
+    }
+    for label, fn in modes.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            wire = fn()
+            best = min(best, time.perf_counter() - start)
+        print(
+            f"{label:<7} {best * 1e3:9.1f} ms/response {wire / 1e6:9.2f} MB on the wire"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())